@@ -0,0 +1,169 @@
+"""
+A microbenchmark runner that measures until a target precision is reached.
+
+timeit.autorange() stops after 0.2 seconds and timeit.timeit(number=...)
+runs a fixed number of loops, regardless of how noisy the result is. This
+runner instead:
+  1. Calibrates the loop count so each sample takes at least min_sample_time.
+  2. Measures the cost of timeit's empty loop and subtracts it from every sample.
+  3. Drops the samples taken before the timings settle (warmup) using the
+     Marginal Standard Error Rule (MSER).
+  4. Keeps taking samples until the confidence interval of the median is
+     within target_precision of the median, or the time budget runs out.
+
+A cheap statement, like a set lookup, converges in a fraction of a second
+while an expensive or noisy one keeps collecting samples.
+"""
+
+import math
+import statistics
+import time
+import timeit
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping
+
+import numpy as np
+
+from examples.scaling import calibrate_number
+from examples.types import TimeInNS, TimeInSec
+
+
+@dataclass
+class AdaptiveResult:
+    number: int  # The calls per sample.
+    samples: np.ndarray  # Steady state nanoseconds per call, overhead removed.
+    warmup_samples: int  # The number of samples dropped as warmup.
+    overhead: float  # The empty loop cost per call, in nanoseconds.
+    median: float
+    ci_low: float
+    ci_high: float
+    converged: bool  # True when the target precision was reached.
+    elapsed: TimeInSec
+
+    @property
+    def relative_precision(self) -> float:
+        """
+        Half the width of the median's confidence interval relative to the median.
+        """
+        return (self.ci_high - self.ci_low) / 2 / self.median if self.median else math.inf
+
+
+def mser_truncation(samples: np.ndarray, batch_size: int = 5) -> int:
+    """
+    Find the number of leading samples to drop as warmup.
+
+    MSER picks the truncation point d that minimizes the standard error of the
+    mean of the remaining samples, sum((x - mean)^2) / (n - d)^2. Samples are
+    first averaged in batches (MSER-5) to smooth out noise. Only the first half
+    of the samples is considered for truncation.
+    """
+    batches = len(samples) // batch_size
+    if batches < 4:
+        return 0
+    means = samples[: batches * batch_size].reshape(batches, batch_size).mean(axis=1)
+
+    # The sum and sum of squares of every suffix of the batch means.
+    suffix_sum = np.cumsum(means[::-1])[::-1]
+    suffix_squares = np.cumsum((means**2)[::-1])[::-1]
+    remaining = np.arange(batches, 0, -1)
+    squared_errors = suffix_squares - suffix_sum**2 / remaining
+    statistic = squared_errors / remaining**2
+
+    best = int(np.argmin(statistic[: batches // 2 + 1]))
+    return best * batch_size
+
+
+def median_confidence_interval(
+    samples: np.ndarray, confidence: float = 0.95
+) -> tuple[float, float, float]:
+    """
+    A distribution free confidence interval of the median from order statistics.
+
+    Returns
+    The (median, low, high) of the samples.
+    """
+    if not 0 < confidence < 1:
+        raise ValueError(f"The confidence level must be between 0 and 1, not {confidence}.")
+    ordered = np.sort(samples)
+    n = len(ordered)
+    # The two sided z score, e.g. 1.96 for 95%.
+    z = statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+    half_width = z * math.sqrt(n) / 2
+    low = max(int(math.floor(n / 2 - half_width)), 0)
+    high = min(int(math.ceil(n / 2 + half_width)), n - 1)
+    return float(np.median(ordered)), float(ordered[low]), float(ordered[high])
+
+
+def run_adaptive(
+    stmt: str | Callable[[], Any] = "pass",
+    setup: str | Callable[[], Any] = "pass",
+    globals: Mapping[str, Any] | None = None,
+    target_precision: float = 0.01,
+    confidence: float = 0.95,
+    min_sample_time: TimeInSec = 0.002,
+    min_samples: int = 20,
+    max_samples: int = 10_000,
+    max_time: TimeInSec = 10.0,
+    batch: int = 10,
+) -> AdaptiveResult:
+    """
+    Time a statement until the median is known to within target_precision.
+
+    Parameters
+    stmt, setup, globals: As for timeit.Timer.
+    target_precision: The acceptable CI half width relative to the median, e.g. 0.01 for 1%.
+    confidence: The confidence level of the interval, e.g. 0.95.
+    min_sample_time: The minimum duration of a single sample.
+    min_samples: The minimum number of steady state samples.
+    max_samples: Stop after this many samples even if the target isn't met.
+    max_time: Stop after this many seconds even if the target isn't met.
+    batch: The number of samples taken between convergence checks.
+    """
+    scope = dict(globals or {})
+    timer = timeit.Timer(stmt, setup, timer=time.perf_counter_ns, globals=scope)
+    empty_timer = timeit.Timer("pass", setup, timer=time.perf_counter_ns, globals=scope)
+
+    start: TimeInNS = time.perf_counter_ns()
+    deadline = start + max_time * 1e9
+
+    # 1. Calibrate the number of calls per sample.
+    number = calibrate_number(timer, min_sample_time)
+
+    # 2. Measure the cost of the empty timeit loop with the same number of calls.
+    overhead = float(np.median(empty_timer.repeat(repeat=15, number=number))) / number
+
+    # 3. Sample until the median's confidence interval is narrow enough.
+    raw: list[float] = []
+    warmup = 0
+    steady = np.empty(0)
+    summarized: np.ndarray | None = None  # The samples the interval was computed from.
+    median = ci_low = ci_high = 0.0
+    converged = False
+    while len(raw) < max_samples and time.perf_counter_ns() < deadline:
+        raw.extend(timer.repeat(repeat=batch, number=number))
+        samples = np.asarray(raw) / number - overhead
+        warmup = mser_truncation(samples)
+        steady = samples[warmup:]
+        if len(steady) < min_samples:
+            continue
+        median, ci_low, ci_high = median_confidence_interval(steady, confidence)
+        summarized = steady
+        if median > 0 and (ci_high - ci_low) / 2 / median <= target_precision:
+            converged = True
+            break
+
+    # The last batch may have moved the warmup cut and left too few samples to check.
+    if len(steady) and steady is not summarized:
+        median, ci_low, ci_high = median_confidence_interval(steady, confidence)
+
+    return AdaptiveResult(
+        number,
+        steady,
+        warmup,
+        overhead,
+        median,
+        ci_low,
+        ci_high,
+        converged,
+        (time.perf_counter_ns() - start) / 1e9,
+    )
@@ -0,0 +1,166 @@
+"""
+Measure how much memory a benchmarked callable allocates per call.
+
+Allocation rate often decides between two implementations that time about the
+same, e.g. a list vs a tuple or a Decimal vs a Fraction. record_allocations()
+measures a callable in a separate pass after pytest-benchmark's timed rounds,
+so tracing never slows the rounds down, and stores the results in the
+benchmark's extra_info:
+  - alloc_bytes_per_call: Bytes still allocated after each call, i.e. the result.
+  - allocs_per_call: Memory blocks still allocated after each call.
+  - alloc_peak_per_call: The peak memory of a single call, including temporaries.
+
+    benchmark(list, init_values)
+    record_allocations(benchmark, list, init_values)
+
+Loaded as a plugin, the allocations are printed as a table per benchmark group:
+    python -m pytest -p examples.allocation_metrics tests/benchmarks_test.py
+"""
+
+import functools
+import gc
+import sys
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Callable
+
+import pytest
+
+DEFAULT_CALLS: int = 1_000
+
+
+@dataclass
+class AllocationMetrics:
+    alloc_bytes_per_call: float
+    allocs_per_call: float
+    alloc_peak_per_call: int
+
+
+def _noop() -> None:
+    return None
+
+
+def _trace(call: Callable[[], Any], calls: int) -> tuple[int, int]:
+    """
+    Returns the bytes allocated by calls calls and the peak of a single call.
+    Assumes tracemalloc is tracing.
+    """
+    results: list[Any] = [None] * calls
+    bytes_before, _ = tracemalloc.get_traced_memory()
+    for index in range(calls):
+        results[index] = call()
+    bytes_after, _ = tracemalloc.get_traced_memory()
+    results = [None] * calls
+
+    single_before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    result = call()
+    _, single_peak = tracemalloc.get_traced_memory()
+    del result
+    return bytes_after - bytes_before, single_peak - single_before
+
+
+def measure_allocations(
+    func: Callable[..., Any], *args: Any, calls: int = DEFAULT_CALLS, **kwargs: Any
+) -> AllocationMetrics:
+    """
+    Measure the memory allocated by func(*args, **kwargs).
+
+    Each call's result is kept alive until the end of a pass, so the memory the
+    calls allocate can be read from the difference in allocated memory. Objects
+    the interpreter caches, like small ints, cost nothing. The measurements of
+    an empty call are subtracted, which removes the loop's own allocations.
+    """
+    # Bind the arguments up front so the calls don't allocate an argument tuple.
+    call = functools.partial(func, *args, **kwargs)
+    results: list[Any] = [None] * calls
+    call()  # Warm up any caches the first call fills.
+    gc_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        # 1. Count the blocks allocated by the calls without tracing.
+        blocks_before = sys.getallocatedblocks()
+        for index in range(calls):
+            results[index] = call()
+        blocks = sys.getallocatedblocks() - blocks_before
+        results = [None] * calls
+        blocks_before = sys.getallocatedblocks()
+        for index in range(calls):
+            results[index] = _noop()
+        blocks -= sys.getallocatedblocks() - blocks_before
+        del results
+
+        # 2. Trace the bytes allocated by the calls and the peak of a single call.
+        tracemalloc.start()
+        try:
+            _trace(_noop, calls)
+            empty_bytes, empty_peak = _trace(_noop, calls)
+            allocated, peak = _trace(call, calls)
+        finally:
+            tracemalloc.stop()
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    return AllocationMetrics(
+        alloc_bytes_per_call=max(allocated - empty_bytes, 0) / calls,
+        allocs_per_call=max(blocks, 0) / calls,
+        alloc_peak_per_call=max(peak - empty_peak, 0),
+    )
+
+
+def record_allocations(
+    benchmark, func: Callable[..., Any], *args: Any, calls: int = DEFAULT_CALLS, **kwargs: Any
+) -> AllocationMetrics:
+    """
+    Measure func's allocations and add them to the benchmark's extra_info.
+    Call it after benchmark(...) so the timed rounds are unaffected.
+    """
+    metrics = measure_allocations(func, *args, calls=calls, **kwargs)
+    benchmark.extra_info.update(asdict(metrics))
+    return metrics
+
+
+def format_allocation_table(benchmarks) -> list[str]:
+    """
+    One table of timings and allocations per benchmark group.
+    """
+    header_fmt = "{:<32} {:>14} {:>16} {:>14} {:>16}"
+    row_fmt = "{:<32} {:>14,.1f} {:>16,.1f} {:>14,.2f} {:>16,}"
+    groups: dict[str | None, list] = {}
+    for benchmark in benchmarks:
+        if "alloc_bytes_per_call" in benchmark.extra_info:
+            groups.setdefault(benchmark.group, []).append(benchmark)
+
+    lines: list[str] = []
+    for group, members in groups.items():
+        lines.append(f"{group}:")
+        lines.append(
+            header_fmt.format("Name", "Median (ns)", "Bytes / Call", "Allocs / Call", "Peak / Call (B)")
+        )
+        for benchmark in sorted(members, key=lambda b: b.stats.median):
+            info = benchmark.extra_info
+            lines.append(
+                row_fmt.format(
+                    benchmark.name,
+                    benchmark.stats.median * 1e9,
+                    info["alloc_bytes_per_call"],
+                    info["allocs_per_call"],
+                    info["alloc_peak_per_call"],
+                )
+            )
+        lines.append("")
+    return lines
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus: int, config: pytest.Config) -> None:
+    benchmark_session = getattr(config, "_benchmarksession", None)
+    if benchmark_session is None:
+        return
+    lines = format_allocation_table(benchmark for benchmark in benchmark_session.benchmarks if benchmark)
+    if not lines:
+        return
+    terminalreporter.section("benchmark allocations")
+    for line in lines:
+        terminalreporter.write_line(line)
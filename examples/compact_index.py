@@ -0,0 +1,378 @@
+"""
+A compact, memory-mappable membership index for very large sets of names.
+
+A Python set of 100M names costs tens of GB, because every entry is a full
+str object (about 50 bytes of overhead plus the text) and a hash table slot.
+CompactNameIndex stores the unique names as one packed UTF-8 blob with an
+offsets array and looks them up through an open-addressed hash table of
+uint32 ids:
+  - blob: uint8, every unique name's UTF-8 bytes back to back.
+  - offsets: int64, name i is blob[offsets[i]:offsets[i + 1]].
+  - hashes: uint64, each name's 64-bit hash. Probes compare these before the bytes.
+  - table: uint32, a linear probing table of name id + 1, 0 marks an empty slot.
+  - bloom: uint8, an optional Bloom filter that rejects most misses before the table.
+
+That's roughly the UTF-8 length plus 16 bytes per name, plus 4 bytes per table
+slot. Everything is built and queried with vectorized NumPy operations, and
+the arrays can be saved and memory-mapped, so an index can be opened without
+loading it.
+
+    index = CompactNameIndex.build(names, bloom_bits_per_name=10)
+    "John Doe" in index
+    index.contains_batch(queries)  # A boolean array.
+    index.save(directory)
+    index = CompactNameIndex.load(directory)
+"""
+
+import json
+import math
+from pathlib import Path
+from typing import Iterable, Sequence
+
+import numpy as np
+
+DEFAULT_CHUNK_SIZE: int = 1_000_000
+DEFAULT_LOAD_FACTOR: float = 0.7
+
+# 64-bit FNV-1a, finished with MurmurHash3's fmix64 to spread the bits.
+FNV_OFFSET: int = 0xCBF29CE484222325
+FNV_PRIME: int = 0x100000001B3
+MASK_64: int = 0xFFFFFFFFFFFFFFFF
+FMIX_1: int = 0xFF51AFD7ED558CCD
+FMIX_2: int = 0xC4CEB9FE1A85EC53
+
+ARRAYS: tuple[str, ...] = ("blob", "offsets", "hashes", "table", "bloom")
+
+
+def hash_name(data: bytes) -> int:
+    """
+    The 64-bit hash of one UTF-8 encoded name. Matches hash_names().
+    """
+    value = FNV_OFFSET
+    for byte in data:
+        value = ((value ^ byte) * FNV_PRIME) & MASK_64
+    value ^= value >> 33
+    value = (value * FMIX_1) & MASK_64
+    value ^= value >> 33
+    value = (value * FMIX_2) & MASK_64
+    value ^= value >> 33
+    return value
+
+
+def hash_names(blob: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    The 64-bit hashes of many names at once. Every name advances one byte per
+    step, so the number of steps is the length of the longest name.
+    """
+    hashes = np.full(len(starts), FNV_OFFSET, dtype=np.uint64)
+    active = np.arange(len(starts))
+    for position in range(int(lengths.max(initial=0))):
+        active = active[lengths[active] > position]
+        byte = blob[starts[active] + position].astype(np.uint64)
+        hashes[active] = (hashes[active] ^ byte) * np.uint64(FNV_PRIME)
+    hashes ^= hashes >> np.uint64(33)
+    hashes *= np.uint64(FMIX_1)
+    hashes ^= hashes >> np.uint64(33)
+    hashes *= np.uint64(FMIX_2)
+    hashes ^= hashes >> np.uint64(33)
+    return hashes
+
+
+def encode_names(names: Sequence[str]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Encode names into a blob of back to back UTF-8. Each name's position comes
+    from the encoded lengths, so a name may contain any character, even a newline.
+
+    Returns
+    The (blob, starts, lengths) of the names in the blob.
+    """
+    encoded = [name.encode() for name in names]
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    starts = np.zeros(len(encoded), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=starts[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), starts, lengths
+
+
+def names_equal(
+    blob_a: np.ndarray,
+    starts_a: np.ndarray,
+    lengths_a: np.ndarray,
+    blob_b: np.ndarray,
+    starts_b: np.ndarray,
+    lengths_b: np.ndarray,
+) -> np.ndarray:
+    """
+    Compare pairs of names byte by byte.
+    """
+    equal = lengths_a == lengths_b
+    active = np.flatnonzero(equal)
+    for position in range(int(lengths_a[active].max(initial=0))):
+        active = active[lengths_a[active] > position]
+        same = blob_a[starts_a[active] + position] == blob_b[starts_b[active] + position]
+        equal[active[~same]] = False
+        active = active[same]
+    return equal
+
+
+def _gather(
+    blob: np.ndarray, starts: np.ndarray, lengths: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Copy the selected names into a new packed blob, chunk by chunk.
+
+    Returns
+    The (blob, offsets) of the packed names.
+    """
+    offsets = np.zeros(len(starts) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    packed = np.empty(int(offsets[-1]), dtype=np.uint8)
+    for first in range(0, len(starts), DEFAULT_CHUNK_SIZE):
+        last = min(first + DEFAULT_CHUNK_SIZE, len(starts))
+        begin, end = int(offsets[first]), int(offsets[last])
+        # Destination byte p of name i comes from source byte p + starts[i] - offsets[i].
+        shift = np.repeat(starts[first:last] - offsets[first:last], lengths[first:last])
+        packed[begin:end] = blob[np.arange(begin, end) + shift]
+    return packed, offsets
+
+
+def _build_table(hashes: np.ndarray, load_factor: float) -> np.ndarray:
+    """
+    Insert every name id into a linear probing table. Each round, every pending
+    name tries its current slot, one name wins each empty slot and the rest move
+    on to the next slot.
+    """
+    if len(hashes) >= np.iinfo(np.uint32).max:
+        raise ValueError("A CompactNameIndex holds fewer than 2^32 - 1 names.")
+    capacity = 1 << max(3, math.ceil(math.log2(max(len(hashes), 1) / load_factor)))
+    mask = np.uint64(capacity - 1)
+    table = np.zeros(capacity, dtype=np.uint32)
+    pending = np.arange(len(hashes), dtype=np.int64)
+    slots = (hashes & mask).astype(np.int64)
+    while len(pending):
+        tried = slots[pending]
+        free = np.flatnonzero(table[tried] == 0)
+        claimed, first = np.unique(tried[free], return_index=True)
+        winners = free[first]
+        table[claimed] = pending[winners] + 1
+        won = np.zeros(len(pending), dtype=np.bool_)
+        won[winners] = True
+        pending = pending[~won]
+        slots[pending] = (slots[pending] + 1) & (capacity - 1)
+    return table
+
+
+def _bloom_positions(hashes: np.ndarray, bits: int, count: int) -> np.ndarray:
+    """
+    The count bit positions of each hash, by double hashing. Shape (count, len(hashes)).
+    """
+    h1 = hashes & np.uint64(0xFFFFFFFF)
+    h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+    steps = np.arange(count, dtype=np.uint64)[:, np.newaxis]
+    return ((h1 + steps * h2) % np.uint64(bits)).astype(np.int64)
+
+
+class CompactNameIndex:
+    """
+    A set of names packed into NumPy arrays. Build it with CompactNameIndex.build().
+    """
+
+    def __init__(
+        self,
+        blob: np.ndarray,
+        offsets: np.ndarray,
+        hashes: np.ndarray,
+        table: np.ndarray,
+        bloom: np.ndarray,
+        bloom_hashes: int,
+    ) -> None:
+        self.blob = blob
+        self.offsets = offsets
+        self.hashes = hashes
+        self.table = table
+        self.bloom = bloom
+        self.bloom_hashes = bloom_hashes
+        self._mask = len(table) - 1
+
+    @classmethod
+    def build(
+        cls,
+        names: Sequence[str],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        load_factor: float = DEFAULT_LOAD_FACTOR,
+        bloom_bits_per_name: float | None = None,
+    ) -> "CompactNameIndex":
+        """
+        Build an index of the unique names in a sequence.
+        """
+        return cls.from_chunks(
+            (names[start : start + chunk_size] for start in range(0, len(names), chunk_size)),
+            load_factor,
+            bloom_bits_per_name,
+        )
+
+    @classmethod
+    def from_chunks(
+        cls,
+        chunks: Iterable[Sequence[str]],
+        load_factor: float = DEFAULT_LOAD_FACTOR,
+        bloom_bits_per_name: float | None = None,
+    ) -> "CompactNameIndex":
+        """
+        Build an index from chunks of names, e.g. from stream_random_names().
+
+        Parameters
+        load_factor: The fraction of the hash table's slots that are used.
+        bloom_bits_per_name: The size of the Bloom filter. 10 bits per name gives
+            about a 1% false positive rate. None disables the filter.
+        """
+        # 1. Encode and hash the names a chunk at a time.
+        blobs, starts, lengths, hashes = [], [], [], []
+        base = 0
+        for chunk in chunks:
+            blob, chunk_starts, chunk_lengths = encode_names(chunk) if len(chunk) else (
+                np.empty(0, dtype=np.uint8),
+                np.empty(0, dtype=np.int64),
+                np.empty(0, dtype=np.int64),
+            )
+            blobs.append(blob)
+            starts.append(chunk_starts + base)
+            lengths.append(chunk_lengths)
+            hashes.append(hash_names(blob, chunk_starts, chunk_lengths))
+            base += len(blob)
+        all_blob = np.concatenate(blobs) if blobs else np.empty(0, dtype=np.uint8)
+        all_starts = np.concatenate(starts) if starts else np.empty(0, dtype=np.int64)
+        all_lengths = np.concatenate(lengths) if lengths else np.empty(0, dtype=np.int64)
+        all_hashes = np.concatenate(hashes) if hashes else np.empty(0, dtype=np.uint64)
+        del blobs
+
+        # 2. Drop the duplicates. Equal names have equal hashes, so they're
+        # neighbours once sorted by hash.
+        order = np.argsort(all_hashes, kind="stable")
+        sorted_hashes = all_hashes[order]
+        later = np.flatnonzero(sorted_hashes[1:] == sorted_hashes[:-1]) + 1
+        first, second = order[later - 1], order[later]
+        duplicate = names_equal(
+            all_blob, all_starts[first], all_lengths[first],
+            all_blob, all_starts[second], all_lengths[second],
+        )
+        keep = np.ones(len(all_hashes), dtype=np.bool_)
+        keep[second[duplicate]] = False
+        unique = np.flatnonzero(keep)
+
+        # 3. Pack the unique names and index them.
+        blob, offsets = _gather(all_blob, all_starts[unique], all_lengths[unique])
+        unique_hashes = all_hashes[unique]
+        table = _build_table(unique_hashes, load_factor)
+
+        bloom_hashes = 0
+        bloom = np.zeros(0, dtype=np.uint8)
+        if bloom_bits_per_name:
+            bits = max(64, math.ceil(len(unique) * bloom_bits_per_name / 8) * 8)
+            bloom_hashes = max(1, round(bloom_bits_per_name * math.log(2)))
+            bloom = np.zeros(bits // 8, dtype=np.uint8)
+            positions = _bloom_positions(unique_hashes, bits, bloom_hashes).ravel()
+            np.bitwise_or.at(bloom, positions >> 3, (1 << (positions & 7)).astype(np.uint8))
+
+        return cls(blob, offsets, unique_hashes, table, bloom, bloom_hashes)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The memory used by the index's arrays.
+        """
+        return sum(getattr(self, name).nbytes for name in ARRAYS)
+
+    def __getitem__(self, position: int) -> str:
+        start, end = int(self.offsets[position]), int(self.offsets[position + 1])
+        return self.blob[start:end].tobytes().decode()
+
+    def __contains__(self, name: object) -> bool:
+        if not isinstance(name, str):
+            return False
+        data = name.encode()
+        value = hash_name(data)
+
+        if self.bloom_hashes:
+            bits = len(self.bloom) * 8
+            h1, h2 = value & 0xFFFFFFFF, (value >> 32) | 1
+            for step in range(self.bloom_hashes):
+                position = (h1 + step * h2) % bits
+                if not self.bloom[position >> 3] & (1 << (position & 7)):
+                    return False
+
+        slot = value & self._mask
+        while entry := int(self.table[slot]):
+            if int(self.hashes[entry - 1]) == value:
+                start, end = int(self.offsets[entry - 1]), int(self.offsets[entry])
+                if self.blob[start:end].tobytes() == data:
+                    return True
+            slot = (slot + 1) & self._mask
+        return False
+
+    def contains_batch(self, names: Sequence[str]) -> np.ndarray:
+        """
+        Look up many names at once.
+
+        Returns
+        A boolean array, True where the name is in the index.
+        """
+        found = np.zeros(len(names), dtype=np.bool_)
+        if not len(names) or not len(self):
+            return found
+        blob, starts, lengths = encode_names(names)
+        hashes = hash_names(blob, starts, lengths)
+        pending = np.arange(len(names))
+
+        if self.bloom_hashes:
+            bits = len(self.bloom) * 8
+            positions = _bloom_positions(hashes, bits, self.bloom_hashes)
+            maybe = np.all(self.bloom[positions >> 3] & (1 << (positions & 7)), axis=0)
+            pending = pending[maybe]
+
+        slots = (hashes[pending] & np.uint64(self._mask)).astype(np.int64)
+        while len(pending):
+            entries = self.table[slots].astype(np.int64)
+            occupied = entries > 0
+            pending, slots, entries = pending[occupied], slots[occupied], entries[occupied] - 1
+
+            candidates = np.flatnonzero(self.hashes[entries] == hashes[pending])
+            queried, stored = pending[candidates], entries[candidates]
+            stored_starts = self.offsets[stored]
+            matched = names_equal(
+                blob, starts[queried], lengths[queried],
+                self.blob, stored_starts, self.offsets[stored + 1] - stored_starts,
+            )
+            hits = candidates[matched]
+            found[pending[hits]] = True
+
+            unresolved = np.ones(len(pending), dtype=np.bool_)
+            unresolved[hits] = False
+            pending = pending[unresolved]
+            slots = (slots[unresolved] + 1) & self._mask
+        return found
+
+    def save(self, directory: Path | str) -> None:
+        """
+        Save the arrays as .npy files that load() can memory-map.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in ARRAYS:
+            np.save(directory / f"{name}.npy", getattr(self, name))
+        (directory / "index.json").write_text(json.dumps({"bloom_hashes": self.bloom_hashes}))
+
+    @classmethod
+    def load(cls, directory: Path | str, mmap: bool = True) -> "CompactNameIndex":
+        """
+        Open a saved index. With mmap the arrays are paged in from disk on demand.
+        """
+        directory = Path(directory)
+        metadata = json.loads((directory / "index.json").read_text())
+        arrays = [
+            np.load(directory / f"{name}.npy", mmap_mode="r" if mmap else None)
+            for name in ARRAYS
+        ]
+        return cls(*arrays, metadata["bloom_hashes"])
@@ -0,0 +1,207 @@
+"""
+Execution strategies for an I/O-bound workload.
+
+numeric_process() calls perform_calculation() fan_out times. Each call sleeps
+for 50 to 100 ms, the same mostly idle shape as a request handler waiting on
+a database or a remote service. The calls can be run:
+  - sequentially,
+  - on a ThreadPoolExecutor, or
+  - as coroutines on an asyncio event loop with asyncio.gather().
+
+compare_strategies() measures the wall time and the CPU time of each strategy
+as the fan-out grows, which is a reference for choosing a concurrency model.
+
+Usage:
+    python -m examples.concurrency --fan-outs 10 100 1000 10000
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from random import uniform
+from typing import Callable, Iterable, Sequence
+
+import numpy as np
+
+from examples.types import TimeInNS, TimeInSec
+
+type WaitRange = tuple[TimeInSec, TimeInSec]
+type Strategy = Callable[[int, WaitRange], list[float]]
+
+WAIT_RANGE: WaitRange = (0.05, 0.1)
+
+
+def perform_calculation(wait_range: WaitRange = WAIT_RANGE) -> TimeInSec:
+    wait_time: TimeInSec = uniform(*wait_range)
+    time.sleep(wait_time)
+    return wait_time
+
+
+async def perform_calculation_async(wait_range: WaitRange = WAIT_RANGE) -> TimeInSec:
+    wait_time: TimeInSec = uniform(*wait_range)
+    await asyncio.sleep(wait_time)
+    return wait_time
+
+
+def run_sequential(fan_out: int, wait_range: WaitRange = WAIT_RANGE) -> list[float]:
+    """
+    Make the calls one after another. The wall time grows with the sum of the waits.
+    """
+    return [perform_calculation(wait_range) for _ in range(fan_out)]
+
+
+def run_threaded(
+    fan_out: int, wait_range: WaitRange = WAIT_RANGE, max_workers: int | None = None
+) -> list[float]:
+    """
+    Make the calls on a thread pool. Sleeping releases the GIL, so up to
+    max_workers calls wait at once. max_workers defaults to ThreadPoolExecutor's
+    min(32, os.cpu_count() + 4).
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(perform_calculation, [wait_range] * fan_out))
+
+
+def run_async(fan_out: int, wait_range: WaitRange = WAIT_RANGE) -> list[float]:
+    """
+    Make the calls as coroutines that all wait at once on a single thread.
+    """
+
+    async def gather() -> list[float]:
+        return await asyncio.gather(
+            *(perform_calculation_async(wait_range) for _ in range(fan_out))
+        )
+
+    return asyncio.run(gather())
+
+
+STRATEGIES: dict[str, Strategy] = {
+    "sequential": run_sequential,
+    "threads": run_threaded,
+    "asyncio": run_async,
+}
+
+
+def numeric_process(
+    strategy: str = "sequential", fan_out: int = 10, wait_range: WaitRange = WAIT_RANGE
+) -> list[float]:
+    initial_data = STRATEGIES[strategy](fan_out, wait_range)
+    doubled_values = [2 * value for value in initial_data]
+    return doubled_values
+
+
+@dataclass
+class StrategyMeasurement:
+    """
+    The wall and CPU time of running one strategy at one fan-out, in nanoseconds.
+
+    The CPU time is of the whole process, so it includes every worker thread.
+    """
+
+    strategy: str
+    fan_out: int
+    wall_times: np.ndarray
+    cpu_times: np.ndarray
+
+    @property
+    def wall_time(self) -> float:
+        return float(np.median(self.wall_times))
+
+    @property
+    def cpu_time(self) -> float:
+        return float(np.median(self.cpu_times))
+
+    @property
+    def calls_per_second(self) -> float:
+        return self.fan_out / self.wall_time * 1e9
+
+
+def measure_strategy(
+    strategy: str, fan_out: int, wait_range: WaitRange = WAIT_RANGE, repeat: int = 3
+) -> StrategyMeasurement:
+    run = STRATEGIES[strategy]
+    wall_times: list[TimeInNS] = []
+    cpu_times: list[TimeInNS] = []
+    for _ in range(repeat):
+        wall_start: TimeInNS = time.perf_counter_ns()
+        cpu_start: TimeInNS = time.process_time_ns()
+        run(fan_out, wait_range)
+        cpu_times.append(time.process_time_ns() - cpu_start)
+        wall_times.append(time.perf_counter_ns() - wall_start)
+    return StrategyMeasurement(strategy, fan_out, np.array(wall_times), np.array(cpu_times))
+
+
+def compare_strategies(
+    fan_outs: Iterable[int] = (10, 100, 1_000, 10_000),
+    strategies: Iterable[str] = STRATEGIES,
+    wait_range: WaitRange = WAIT_RANGE,
+    repeat: int = 3,
+    time_budget: TimeInSec | None = 30.0,
+) -> list[StrategyMeasurement]:
+    """
+    Measure every strategy at every fan-out.
+
+    Parameters
+    fan_outs: The number of calls per run, smallest first.
+    strategies: The STRATEGIES names to measure.
+    wait_range: The range each call's sleep is drawn from.
+    repeat: The number of runs per strategy and fan-out.
+    time_budget: Skip a strategy's larger fan-outs once a single run is predicted
+        to take longer than time_budget, assuming the wall time grows linearly.
+        Without this 10,000 sequential calls would take over 12 minutes.
+
+    Returns
+    The measurements in the order they were taken.
+    """
+    measurements: list[StrategyMeasurement] = []
+    for strategy in strategies:
+        previous: StrategyMeasurement | None = None
+        for fan_out in fan_outs:
+            if previous is not None and time_budget is not None:
+                predicted = previous.wall_time / previous.fan_out * fan_out
+                if predicted > time_budget * 1e9:
+                    break
+            previous = measure_strategy(strategy, fan_out, wait_range, repeat)
+            measurements.append(previous)
+    return measurements
+
+
+def strategy_report(measurements: Sequence[StrategyMeasurement]) -> str:
+    header_fmt = "{:<12} {:>8} {:>14} {:>14} {:>12} {:>14}"
+    row_fmt = "{:<12} {:>8,} {:>14,.1f} {:>14,.1f} {:>12.1%} {:>14,.1f}"
+    lines = [
+        header_fmt.format("Strategy", "Fan-out", "Wall (ms)", "CPU (ms)", "CPU / Wall", "Calls / sec")
+    ]
+    for measurement in measurements:
+        lines.append(
+            row_fmt.format(
+                measurement.strategy,
+                measurement.fan_out,
+                measurement.wall_time / 1e6,
+                measurement.cpu_time / 1e6,
+                measurement.cpu_time / measurement.wall_time,
+                measurement.calls_per_second,
+            )
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--fan-outs", type=int, nargs="+", default=[10, 100, 1_000, 10_000])
+    parser.add_argument("--strategies", nargs="+", choices=list(STRATEGIES), default=list(STRATEGIES))
+    parser.add_argument("--wait-range", type=float, nargs=2, default=list(WAIT_RANGE))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--time-budget", type=float, default=30.0)
+    args = parser.parse_args(argv)
+
+    measurements = compare_strategies(
+        args.fan_outs, args.strategies, tuple(args.wait_range), args.repeat, args.time_budget
+    )
+    print(strategy_report(measurements))
+
+
+if __name__ == "__main__":
+    main()
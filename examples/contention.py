@@ -0,0 +1,319 @@
+"""
+Run a benchmark callable from N threads or N processes at once.
+
+A single threaded benchmark says nothing about a workload under concurrent
+load. run_contended() starts N workers, lines them up on a barrier and has
+each call the workload the same number of times, timing every call. The
+measurement reports:
+  - throughput: Total calls per second across all the workers.
+  - latency: The 50th, 90th and 99th percentile time per call.
+  - efficiency: Throughput relative to N times the single worker throughput.
+    Processes scale close to 100% on a CPU-bound workload. Threads on a
+    standard build serialize on the GIL and their efficiency falls as 1/N.
+
+The report names the interpreter build. On a free-threaded (no-GIL) build,
+threads can scale like processes. Use --compare-with to run the same harness
+under a second interpreter, e.g. python3.13t, and print both reports.
+
+Workloads run in processes must be picklable, i.e. module level functions.
+
+Usage:
+    python -m examples.contention --workers 1 2 4 8 --modes thread process
+    python -m examples.contention --compare-with python3.13t
+"""
+
+import argparse
+import functools
+import json
+import multiprocessing
+import subprocess
+import sys
+import sysconfig
+import tempfile
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable, Sequence
+
+import numpy as np
+
+from examples.parallel_sweep import available_cpus
+from examples.types import TimeInNS
+
+MODES: tuple[str, ...] = ("thread", "process")
+INIT_VALUES = (0, 1, 2, 3, 4, 5, 6, 7, 8, 9)
+MISSING_PERSON: str = "John Doe"
+SAMPLE_SIZE: int = 1_000
+
+# Per process state, populated by _init_worker.
+_worker_barrier: Any = None
+
+
+def free_threaded_build() -> bool:
+    """
+    Is this interpreter built with the GIL disabled (e.g. python3.13t)?
+    """
+    return bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
+
+
+def gil_enabled() -> bool:
+    """
+    Is the GIL enabled right now? A free-threaded build can re-enable it,
+    e.g. with PYTHON_GIL=1 or when importing an extension that needs it.
+    """
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled() if is_gil_enabled is not None else True
+
+
+def interpreter_description() -> str:
+    version = ".".join(map(str, sys.version_info[:3]))
+    build = "free-threaded" if free_threaded_build() else "standard"
+    gil = "GIL enabled" if gil_enabled() else "GIL disabled"
+    return f"{sys.implementation.name} {version} ({build}, {gil})"
+
+
+@functools.cache
+def _sample() -> tuple[list[str], set[str]]:
+    from examples.name_generator import create_random_names
+
+    names, _ = create_random_names(SAMPLE_SIZE, 2024)
+    return names, set(names)
+
+
+def list_init() -> list[int]:
+    return list(INIT_VALUES)
+
+
+def tuple_init() -> tuple[int, ...]:
+    return tuple(INIT_VALUES)
+
+
+def list_search() -> bool:
+    return MISSING_PERSON in _sample()[0]
+
+
+def set_search() -> bool:
+    return MISSING_PERSON in _sample()[1]
+
+
+WORKLOADS: dict[str, Callable[[], Any]] = {
+    "list_init": list_init,
+    "tuple_init": tuple_init,
+    "list_search": list_search,
+    "set_search": set_search,
+}
+
+
+def _init_worker(barrier: Any) -> None:
+    global _worker_barrier
+    _worker_barrier = barrier
+
+
+def _run_worker(workload: Callable[[], Any], calls: int, barrier: Any = None) -> np.ndarray:
+    """
+    Call the workload calls times once every worker is ready.
+
+    Returns
+    The time of each call in nanoseconds, followed by the worker's start and end
+    times. perf_counter() is a system wide clock, so these compare across processes.
+    """
+    barrier = barrier if barrier is not None else _worker_barrier
+    # Warm up, e.g. build the sample, before the clock starts.
+    workload()
+    latencies = np.empty(calls + 2, dtype=np.int64)
+    clock = time.perf_counter_ns
+    barrier.wait()
+    latencies[calls] = clock()
+    for call in range(calls):
+        call_start = clock()
+        workload()
+        latencies[call] = clock() - call_start
+    latencies[calls + 1] = clock()
+    return latencies
+
+
+@dataclass
+class ContentionMeasurement:
+    """
+    A workload run by several workers at once. Times are in nanoseconds.
+    """
+
+    workload: str
+    mode: str  # "thread" or "process"
+    workers: int
+    calls: int  # Across all the workers.
+    wall_time: TimeInNS  # From the first worker's start to the last worker's end.
+    p50: float
+    p90: float
+    p99: float
+    interpreter: str
+    efficiency: float = 1.0  # Throughput / (workers * single worker throughput).
+
+    @property
+    def throughput(self) -> float:
+        return self.calls / self.wall_time * 1e9
+
+
+def run_contended(
+    workload: Callable[[], Any],
+    workers: int,
+    mode: str = "thread",
+    calls: int = 10_000,
+    name: str | None = None,
+) -> ContentionMeasurement:
+    """
+    Call the workload calls times from each of workers threads or processes.
+
+    Parameters
+    workload: A callable that takes no arguments. Picklable for processes.
+    mode: "thread" or "process". Processes are spawned, not forked.
+    calls: The number of calls per worker.
+    """
+    executor: Executor
+    if mode == "thread":
+        barrier: Any = threading.Barrier(workers)
+        executor = ThreadPoolExecutor(max_workers=workers)
+        arguments: tuple = (barrier,)
+    elif mode == "process":
+        context = multiprocessing.get_context("spawn")
+        barrier = context.Barrier(workers)
+        executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=context, initializer=_init_worker, initargs=(barrier,)
+        )
+        arguments = ()
+    else:
+        raise ValueError(f"Unknown mode {mode}. Expected one of {MODES}.")
+
+    with executor:
+        futures = [
+            executor.submit(_run_worker, workload, calls, *arguments) for _ in range(workers)
+        ]
+        results = [future.result() for future in futures]
+
+    latencies = np.concatenate([result[:-2] for result in results])
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+    return ContentionMeasurement(
+        name or getattr(workload, "__name__", repr(workload)),
+        mode,
+        workers,
+        len(latencies),
+        int(max(result[-1] for result in results) - min(result[-2] for result in results)),
+        float(p50),
+        float(p90),
+        float(p99),
+        interpreter_description(),
+    )
+
+
+def default_worker_counts() -> list[int]:
+    """
+    Powers of two up to the number of available CPUs, and that number.
+    """
+    cpus = len(available_cpus())
+    counts = [1 << power for power in range(cpus.bit_length()) if 1 << power <= cpus]
+    return sorted({*counts, cpus})
+
+
+def measure_contention(
+    workloads: Iterable[str] = WORKLOADS,
+    worker_counts: Iterable[int] | None = None,
+    modes: Iterable[str] = MODES,
+    calls: int = 10_000,
+) -> list[ContentionMeasurement]:
+    """
+    Run every workload in every mode with every number of workers.
+    Efficiency is relative to the smallest worker count of the same workload and mode.
+    """
+    worker_counts = sorted(worker_counts or default_worker_counts())
+    measurements: list[ContentionMeasurement] = []
+    for name in workloads:
+        for mode in modes:
+            baseline: ContentionMeasurement | None = None
+            for workers in worker_counts:
+                measurement = run_contended(WORKLOADS[name], workers, mode, calls, name)
+                if baseline is None:
+                    baseline = measurement
+                measurement.efficiency = (
+                    measurement.throughput
+                    / (baseline.throughput / baseline.workers * measurement.workers)
+                )
+                measurements.append(measurement)
+    return measurements
+
+
+def contention_report(measurements: Sequence[ContentionMeasurement]) -> str:
+    header_fmt = "{:<12} {:<8} {:>8} {:>14} {:>10} {:>10} {:>10} {:>11}"
+    row_fmt = "{:<12} {:<8} {:>8,} {:>14,.0f} {:>10,.0f} {:>10,.0f} {:>10,.0f} {:>11.1%}"
+    interpreters = sorted({measurement.interpreter for measurement in measurements})
+    lines = [f"Interpreter: {interpreter}" for interpreter in interpreters]
+    lines.append(
+        header_fmt.format(
+            "Workload", "Mode", "Workers", "Calls / sec", "P50 (ns)", "P90 (ns)", "P99 (ns)", "Efficiency"
+        )
+    )
+    for measurement in measurements:
+        lines.append(
+            row_fmt.format(
+                measurement.workload,
+                measurement.mode,
+                measurement.workers,
+                measurement.throughput,
+                measurement.p50,
+                measurement.p90,
+                measurement.p99,
+                measurement.efficiency,
+            )
+        )
+    return "\n".join(lines)
+
+
+def save_measurements(measurements: Sequence[ContentionMeasurement], path: Path | str) -> None:
+    Path(path).write_text(json.dumps([asdict(measurement) for measurement in measurements]))
+
+
+def load_measurements(path: Path | str) -> list[ContentionMeasurement]:
+    return [ContentionMeasurement(**fields) for fields in json.loads(Path(path).read_text())]
+
+
+def run_under(python: str, argv: Sequence[str]) -> list[ContentionMeasurement]:
+    """
+    Run the harness under another interpreter, e.g. a free-threaded build.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "contention.json"
+        subprocess.run(
+            [python, "-m", "examples.contention", *argv, "--json", str(path)],
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        return load_measurements(path)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workloads", nargs="+", choices=list(WORKLOADS), default=list(WORKLOADS))
+    parser.add_argument("--workers", type=int, nargs="+", default=None)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--calls", type=int, default=10_000, help="The calls per worker.")
+    parser.add_argument("--json", help="Also save the measurements to this file.")
+    parser.add_argument("--compare-with", help="A second interpreter to run the harness under.")
+    args = parser.parse_args(argv)
+
+    measurements = measure_contention(args.workloads, args.workers, args.modes, args.calls)
+    print(contention_report(measurements))
+    if args.json:
+        save_measurements(measurements, args.json)
+
+    if args.compare_with:
+        harness_argv = ["--workloads", *args.workloads, "--modes", *args.modes]
+        harness_argv += ["--calls", str(args.calls)]
+        if args.workers:
+            harness_argv += ["--workers", *map(str, args.workers)]
+        print()
+        print(contention_report(run_under(args.compare_with, harness_argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+Measure and track the import cost of modules with python -X importtime.
+
+Every process pays for its imports before it does any work: each pytest
+collection, CLI invocation and spawned worker. measure_import_time() imports a
+module in fresh interpreters, parses the -X importtime report and keeps the
+median self and cumulative cost of every module it pulled in.
+
+The measurements can be saved to the result store as a pytest-benchmark style
+report, one benchmark per module, so the import costs get the same history
+and regression detection as the other benchmarks.
+
+Usage:
+    python -m examples.import_time tests.timeit_test --runs 7 --top 15
+    python -m examples.import_time tests.timeit_test --store
+    python -m examples.result_store history "import tests.timeit_test"
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Sequence
+
+import numpy as np
+
+from examples.result_store import DEFAULT_STORE_PATH, ResultStore
+from examples.types import TimeInSec
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$")
+
+
+@dataclass
+class ImportRecord:
+    """
+    One line of a -X importtime report. Times are in microseconds.
+    """
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int  # 0 for a module imported directly by the measured import.
+
+
+@dataclass
+class ModuleImportTime:
+    """
+    The import times of one module across several interpreter runs, in microseconds.
+    """
+
+    module: str
+    depth: int
+    self_us: np.ndarray
+    cumulative_us: np.ndarray
+
+    @property
+    def self_median(self) -> float:
+        return float(np.median(self.self_us))
+
+    @property
+    def cumulative_median(self) -> float:
+        return float(np.median(self.cumulative_us))
+
+
+def parse_importtime(report: str) -> list[ImportRecord]:
+    """
+    Parse the -X importtime report a Python process writes to stderr.
+    Lines that aren't part of the report are ignored.
+    """
+    records: list[ImportRecord] = []
+    for line in report.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        depth = (len(indent) - 1) // 2
+        records.append(ImportRecord(module, int(self_us), int(cumulative_us), depth))
+    return records
+
+
+def import_report(module: str, python: str = sys.executable) -> str:
+    """
+    Import module in a fresh interpreter and return its -X importtime report.
+    """
+    process = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{process.stderr}")
+    return process.stderr
+
+
+def measure_import_time(
+    module: str, runs: int = 5, python: str = sys.executable
+) -> dict[str, ModuleImportTime]:
+    """
+    Import module in runs fresh interpreters.
+
+    Returns
+    The import times of every module that was imported, keyed by module name.
+    A module missing from some runs, e.g. one imported conditionally, only has
+    the runs it appeared in.
+    """
+    self_times: dict[str, list[int]] = {}
+    cumulative_times: dict[str, list[int]] = {}
+    depths: dict[str, int] = {}
+    for _ in range(runs):
+        # A module can be reported more than once per run, e.g. when an optional
+        # import fails and is retried, so sum its times within each run.
+        run_self: dict[str, int] = {}
+        run_cumulative: dict[str, int] = {}
+        for record in parse_importtime(import_report(module, python)):
+            run_self[record.module] = run_self.get(record.module, 0) + record.self_us
+            run_cumulative[record.module] = (
+                run_cumulative.get(record.module, 0) + record.cumulative_us
+            )
+            depths.setdefault(record.module, record.depth)
+        for name in run_self:
+            self_times.setdefault(name, []).append(run_self[name])
+            cumulative_times.setdefault(name, []).append(run_cumulative[name])
+    return {
+        name: ModuleImportTime(
+            name, depths[name], np.array(self_times[name]), np.array(cumulative_times[name])
+        )
+        for name in self_times
+    }
+
+
+def import_time_report(module: str, measurements: dict[str, ModuleImportTime]) -> dict[str, Any]:
+    """
+    Convert import time measurements into a pytest-benchmark style JSON report.
+
+    Each module becomes a benchmark named "import <module>" whose rounds are its
+    cumulative import time in seconds, grouped under "Import Time: <module>".
+    """
+    from pytest_benchmark.plugin import pytest_benchmark_generate_machine_info
+    from pytest_benchmark.utils import get_commit_info
+
+    benchmarks = []
+    for name, measurement in measurements.items():
+        data: np.ndarray = measurement.cumulative_us / 1e6
+        q1, q3 = np.quantile(data, [0.25, 0.75])
+        benchmarks.append(
+            {
+                "name": f"import {name}",
+                "fullname": f"import {module}::{name}",
+                "group": f"Import Time: {module}",
+                "stats": {
+                    "min": float(data.min()),
+                    "max": float(data.max()),
+                    "mean": float(data.mean()),
+                    "median": float(np.median(data)),
+                    "stddev": float(data.std(ddof=1)) if len(data) > 1 else 0.0,
+                    "iqr": float(q3 - q1),
+                    "ops": float(1 / data.mean()) if data.mean() else 0.0,
+                    "rounds": len(data),
+                    "iterations": 1,
+                    "data": data.tolist(),
+                },
+            }
+        )
+    return {
+        "machine_info": pytest_benchmark_generate_machine_info(),
+        "commit_info": get_commit_info(),
+        "datetime": datetime.now(timezone.utc).isoformat(),
+        "benchmarks": benchmarks,
+    }
+
+
+def format_import_times(measurements: dict[str, ModuleImportTime], top: int = 20) -> str:
+    """
+    The modules with the largest cumulative import times, largest first.
+    """
+    header_fmt = "{:<48} {:>6} {:>16} {:>16}"
+    row_fmt = "{:<48} {:>6} {:>16,.1f} {:>16,.1f}"
+    lines = [header_fmt.format("Module", "Depth", "Self (ms)", "Cumulative (ms)")]
+    ranked = sorted(measurements.values(), key=lambda m: m.cumulative_median, reverse=True)
+    for measurement in ranked[:top]:
+        lines.append(
+            row_fmt.format(
+                measurement.module,
+                measurement.depth,
+                measurement.self_median / 1e3,
+                measurement.cumulative_median / 1e3,
+            )
+        )
+    return "\n".join(lines)
+
+
+def total_import_time(module: str, measurements: dict[str, ModuleImportTime]) -> TimeInSec:
+    """
+    The median cumulative time to import module, in seconds.
+    """
+    return measurements[module].cumulative_median / 1e6
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("modules", nargs="+", help="The modules to import.")
+    parser.add_argument("--runs", type=int, default=5, help="The interpreters per module.")
+    parser.add_argument("--top", type=int, default=20, help="The number of modules to list.")
+    parser.add_argument("--store", action="store_true", help="Append the results to the store.")
+    parser.add_argument("--store-path", default=DEFAULT_STORE_PATH, help="The SQLite database.")
+    args = parser.parse_args(argv)
+
+    for module in args.modules:
+        measurements = measure_import_time(module, args.runs)
+        print(f"import {module}: {total_import_time(module, measurements) * 1e3:,.1f} ms")
+        print(format_import_times(measurements, args.top))
+        if args.store:
+            with ResultStore(args.store_path) as store:
+                run_id = store.ingest(import_time_report(module, measurements))
+            print(f"Stored as run {run_id}.")
+
+
+if __name__ == "__main__":
+    main()
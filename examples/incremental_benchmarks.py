@@ -0,0 +1,483 @@
+"""
+A pytest plugin that reuses cached results for benchmarks whose code hasn't changed.
+
+Most commits don't touch anything a given benchmark runs, so re-timing it
+only adds noise and minutes. With this plugin, each benchmark gets a
+fingerprint of everything its result depends on:
+  - the test function, its parameters, its benchmark marker and the fixtures
+    it requests,
+  - the source of every project function, method and class they reference,
+    followed transitively through globals, closures and module attributes,
+  - the values of the module level constants they read, e.g. sample sizes,
+  - the interpreter version, the versions of the third party packages they
+    reference, e.g. numpy, and the pytest-benchmark options.
+
+A benchmark whose fingerprint matches the cache is skipped and its cached
+result is merged into the run, so the pytest-benchmark table, --benchmark-json
+and --benchmark-save still cover every benchmark. The rest run as usual and
+their results replace the cached ones.
+
+    python -m pytest -p examples.incremental_benchmarks tests/benchmarks_test.py \\
+        --incremental-cache=.benchmarks/incremental.json
+
+Pass --incremental-refresh to re-run every benchmark and rebuild the cache.
+Reused results are marked with extra_info["incremental"]["reused"].
+"""
+
+import builtins
+import dataclasses
+import functools
+import hashlib
+import inspect
+import json
+import sys
+import textwrap
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from importlib import metadata
+from pathlib import Path
+from types import CodeType, FunctionType, MethodType, ModuleType
+from typing import Any, Iterator, Mapping
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+from pytest_benchmark.stats import Metadata, Stats
+from pytest_benchmark.utils import funcname
+
+CACHE_VERSION: int = 1
+
+# Values of these types are fingerprinted by their repr.
+PLAIN_TYPES: tuple[type, ...] = (int, float, complex, str, bytes, bool, type(None))
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _code_objects(code: CodeType) -> Iterator[CodeType]:
+    """
+    The code object and those nested in it, e.g. lambdas and comprehensions.
+    """
+    yield code
+    for constant in code.co_consts:
+        if isinstance(constant, CodeType):
+            yield from _code_objects(constant)
+
+
+@functools.cache
+def _distributions() -> Mapping[str, list[str]]:
+    return metadata.packages_distributions()
+
+
+def package_version(package: str) -> str:
+    """
+    The installed version of the distribution that provides a top level package.
+    """
+    for distribution in _distributions().get(package, []):
+        try:
+            return f"{distribution}=={metadata.version(distribution)}"
+        except metadata.PackageNotFoundError:
+            continue
+    module = sys.modules.get(package)
+    return str(getattr(module, "__version__", "unknown"))
+
+
+class SourceClosure:
+    """
+    The source and constants that a set of functions transitively depend on.
+
+    Objects defined under the project root are followed, anything else is
+    recorded by the package it comes from. The standard library is covered
+    by the interpreter version.
+    """
+
+    def __init__(self, root: Path | str) -> None:
+        self.root = Path(root).resolve()
+        self.excluded = {Path(sys.prefix).resolve(), Path(sys.base_prefix).resolve()}
+        self.components: dict[str, str] = {}
+        self.packages: set[str] = set()
+        self._seen: set[int] = set()
+
+    def is_project_file(self, filename: str | None) -> bool:
+        if not filename:
+            return False
+        path = Path(filename).resolve()
+        return (
+            path.is_file()
+            and path.is_relative_to(self.root)
+            and "site-packages" not in path.parts
+            and not any(path.is_relative_to(excluded) for excluded in self.excluded)
+        )
+
+    def _is_project(self, value: Any) -> bool:
+        try:
+            return self.is_project_file(inspect.getsourcefile(value))
+        except TypeError:
+            return False
+
+    def _add_package(self, value: Any) -> None:
+        module = value.__name__ if isinstance(value, ModuleType) else getattr(value, "__module__", None)
+        if not isinstance(module, str):
+            module = type(value).__module__
+        if self._is_project(sys.modules.get(module)):
+            # Generated code in a project module, e.g. a dataclass's __init__.
+            return
+        package = module.partition(".")[0]
+        if package not in sys.stdlib_module_names and package not in ("builtins", "__main__"):
+            self.packages.add(package)
+
+    def add(self, value: Any, name: str = "") -> None:
+        """
+        Add a value and everything it references.
+
+        Parameters
+        value: A function, class, module, container or constant.
+        name: Where the value was found, used to label constants.
+        """
+        if isinstance(value, PLAIN_TYPES):
+            self.components[f"value:{name}"] = _digest(repr(value))
+            return
+        if id(value) in self._seen:
+            return
+        self._seen.add(id(value))
+
+        if isinstance(value, functools.partial):
+            self.add(value.func, name)
+            self.add(value.args, f"{name}.args")
+            self.add(value.keywords, f"{name}.keywords")
+        elif isinstance(value, MethodType):
+            self.add(value.__func__, name)
+            self.add(value.__self__, f"{name}.__self__")
+        elif isinstance(value, (staticmethod, classmethod)):
+            self.add(value.__func__, name)
+        elif isinstance(value, property):
+            for accessor in (value.fget, value.fset, value.fdel):
+                if accessor is not None:
+                    self.add(accessor, name)
+        elif callable(value) and hasattr(value, "__wrapped__"):
+            # e.g. functools.cache. The wrapper itself comes from the standard library.
+            self.add(inspect.unwrap(value), name)
+        elif isinstance(value, FunctionType):
+            self._add_function(value)
+        elif isinstance(value, type):
+            self._add_class(value)
+        elif isinstance(value, ModuleType):
+            if not self._is_project(value):
+                self._add_package(value)
+        elif isinstance(value, (tuple, list)):
+            if all(isinstance(item, PLAIN_TYPES) for item in value):
+                self.components[f"value:{name}"] = _digest(repr(value))
+            else:
+                for index, item in enumerate(value):
+                    self.add(item, f"{name}[{index}]")
+        elif isinstance(value, (set, frozenset)):
+            # Sets of strings iterate in a different order with every hash seed.
+            plain = sorted(repr(item) for item in value if isinstance(item, PLAIN_TYPES))
+            self.components[f"value:{name}"] = _digest(repr(plain))
+            for item in value:
+                if not isinstance(item, PLAIN_TYPES):
+                    self.add(item, f"{name}[]")
+        elif isinstance(value, dict):
+            for key, item in value.items():
+                if not isinstance(key, PLAIN_TYPES):
+                    self.add(key, f"{name}.keys()")
+                self.add(item, f"{name}[{key!r}]")
+        elif self._is_project(type(value)):
+            self._add_class(type(value))
+            if dataclasses.is_dataclass(value):
+                for dataclass_field in dataclasses.fields(value):
+                    self.add(getattr(value, dataclass_field.name), f"{name}.{dataclass_field.name}")
+            else:
+                for attribute, item in getattr(value, "__dict__", {}).items():
+                    self.add(item, f"{name}.{attribute}")
+        else:
+            self._add_package(value)
+
+    def _add_source(self, qualified: str, source: str) -> None:
+        key = f"source:{qualified}"
+        # Lambdas in the same scope share a qualified name.
+        duplicates = 1
+        while key in self.components:
+            duplicates += 1
+            key = f"source:{qualified}#{duplicates}"
+        self.components[key] = _digest(source)
+
+    def _add_function(self, function: FunctionType) -> None:
+        if not self._is_project(function):
+            self._add_package(function)
+            return
+        qualified = f"{function.__module__}.{function.__qualname__}"
+        try:
+            source = inspect.getsource(function)
+        except OSError:
+            source = repr(function.__code__.co_code)
+        self._add_source(qualified, source)
+        for index, default in enumerate(function.__defaults__ or ()):
+            self.add(default, f"{qualified}.__defaults__[{index}]")
+        for key, default in (function.__kwdefaults__ or {}).items():
+            self.add(default, f"{qualified}.{key}")
+        for variable, cell in zip(function.__code__.co_freevars, function.__closure__ or ()):
+            try:
+                self.add(cell.cell_contents, f"{qualified}.{variable}")
+            except ValueError:  # An empty cell.
+                continue
+        self._add_names(function.__code__, function.__globals__, function.__module__)
+
+    def _add_names(self, code: CodeType, namespace: dict[str, Any], module: str) -> None:
+        """
+        Add the globals a code object reads. Attribute names, e.g. fibonacci in
+        memory_example.fibonacci, are looked up on the project modules it reads.
+        """
+        names = {name for nested in _code_objects(code) for name in nested.co_names}
+        modules = [
+            namespace[name]
+            for name in sorted(names)
+            if isinstance(namespace.get(name), ModuleType) and self._is_project(namespace[name])
+        ]
+        for name in sorted(names):
+            if name in namespace:
+                self.add(namespace[name], f"{module}.{name}")
+            elif not hasattr(builtins, name):
+                for project_module in modules:
+                    if hasattr(project_module, name):
+                        self.add(getattr(project_module, name), f"{project_module.__name__}.{name}")
+
+    def _add_class(self, cls: type) -> None:
+        if not self._is_project(cls):
+            self._add_package(cls)
+            return
+        qualified = f"{cls.__module__}.{cls.__qualname__}"
+        try:
+            source = inspect.getsource(cls)
+        except (OSError, TypeError):
+            source = repr(sorted(vars(cls)))
+        self._add_source(qualified, source)
+        for base in cls.__mro__[1:]:
+            self.add(base)
+        for attribute, value in vars(cls).items():
+            if isinstance(value, (FunctionType, staticmethod, classmethod, property)):
+                self.add(value, f"{qualified}.{attribute}")
+        module = sys.modules.get(cls.__module__)
+        if module is not None:
+            # Names the class body reads, e.g. class level defaults.
+            try:
+                code = compile(textwrap.dedent(source), qualified, "exec")
+            except SyntaxError:
+                return
+            self._add_names(code, vars(module), cls.__module__)
+
+
+def fingerprint_components(item: pytest.Item, root: Path | str, options: Mapping[str, Any]) -> dict[str, str]:
+    """
+    Digest everything a benchmark's result depends on.
+
+    Parameters
+    item: The benchmark's test item.
+    root: The project root. Code outside it is identified by its package version.
+    options: The pytest-benchmark options the benchmark runs with.
+
+    Returns
+    The digest of each component, e.g. "source:examples.memory_example.fibonacci".
+    """
+    closure = SourceClosure(root)
+    closure.add(item.obj, item.name)
+    callspec = getattr(item, "callspec", None)
+    if callspec is not None:
+        closure.add(callspec.params, f"{item.name}.params")
+    for name, definitions in item._fixtureinfo.name2fixturedefs.items():
+        for definition in definitions:
+            closure.add(definition.func, f"fixture:{name}")
+
+    marker = item.get_closest_marker("benchmark")
+    marker_options = dict(marker.kwargs) if marker else {}
+    closure.add(marker_options, "marker")
+    components = dict(closure.components)
+    components["node"] = _digest(item.nodeid)
+    components["python"] = _digest(f"{sys.implementation.name} {sys.version}")
+    components["options"] = _digest(
+        json.dumps(
+            {key: funcname(value) if callable(value) else str(value) for key, value in options.items()},
+            sort_keys=True,
+        )
+    )
+    for package in sorted(closure.packages):
+        components[f"package:{package}"] = _digest(package_version(package))
+    return components
+
+
+def fingerprint(components: Mapping[str, str]) -> str:
+    return _digest(json.dumps(components, sort_keys=True))
+
+
+def changed_components(old: Mapping[str, str], new: Mapping[str, str]) -> list[str]:
+    """
+    The components that were added, removed or changed since the old fingerprint.
+    """
+    return sorted(key for key in old.keys() | new.keys() if old.get(key) != new.get(key))
+
+
+class CachedMetadata(Metadata):
+    """
+    A benchmark result loaded from the cache, in place of one timed in this run.
+    """
+
+    def __init__(self, benchmark: Mapping[str, Any]) -> None:
+        self.name = benchmark["name"]
+        self.fullname = benchmark["fullname"]
+        self.group = benchmark["group"]
+        self.param = benchmark["param"]
+        self.params = benchmark["params"]
+        self.extra_info = dict(benchmark["extra_info"])
+        self.cprofile_stats = None
+        self.iterations = benchmark["stats"]["iterations"]
+        self.stats = Stats()
+        for duration in benchmark["stats"]["data"]:
+            self.stats.update(duration)
+        self.options = benchmark["options"]
+        self.fixture = None
+
+    @property
+    def has_error(self) -> bool:
+        return False
+
+
+def load_cache(path: Path | str) -> dict[str, dict[str, Any]]:
+    """
+    Load the cached benchmarks, keyed by full name. A missing or outdated cache is empty.
+    """
+    try:
+        cache = json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return {}
+    if cache.get("version") != CACHE_VERSION:
+        return {}
+    return cache["benchmarks"]
+
+
+def save_cache(path: Path | str, benchmarks: Mapping[str, Mapping[str, Any]]) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"version": CACHE_VERSION, "benchmarks": benchmarks}, indent=2))
+
+
+@dataclass
+class IncrementalState:
+    path: Path
+    refresh: bool
+    root: Path
+    cache: dict[str, dict[str, Any]]
+    components: dict[str, dict[str, str]] = field(default_factory=dict)
+    reused: list[str] = field(default_factory=list)
+    changed: dict[str, list[str]] = field(default_factory=dict)  # Full name: changed components.
+
+
+_state_key = pytest.StashKey[IncrementalState]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("incremental", "incremental benchmark runs")
+    group.addoption(
+        "--incremental-cache",
+        metavar="PATH",
+        help="Reuse the results in this cache for benchmarks whose code hasn't changed, "
+        "and save the new results to it.",
+    )
+    group.addoption(
+        "--incremental-refresh",
+        action="store_true",
+        default=False,
+        help="Re-run every benchmark and rebuild the cache.",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    path = config.getoption("incremental_cache", None)
+    if path is None:
+        return
+    path = Path(path)
+    refresh = config.getoption("incremental_refresh")
+    config.stash[_state_key] = IncrementalState(
+        path, refresh, config.rootpath, {} if refresh else load_cache(path)
+    )
+
+
+def _benchmark_session(config: pytest.Config) -> Any:
+    benchmark_session = getattr(config, "_benchmarksession", None)
+    if benchmark_session is None or benchmark_session.disabled or benchmark_session.skip:
+        return None
+    return benchmark_session
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item: pytest.Item) -> None:
+    state = item.config.stash.get(_state_key, None)
+    benchmark_session = _benchmark_session(item.config)
+    if state is None or benchmark_session is None or "benchmark" not in getattr(item, "fixturenames", ()):
+        return
+
+    components = fingerprint_components(item, state.root, benchmark_session.options)
+    state.components[item.nodeid] = components
+    cached = state.cache.get(item.nodeid)
+    if cached is None:
+        state.changed[item.nodeid] = []
+        return
+    if cached["fingerprint"] != fingerprint(components):
+        state.changed[item.nodeid] = changed_components(cached["components"], components)
+        return
+
+    benchmark = CachedMetadata(cached["benchmark"])
+    benchmark.extra_info["incremental"] = {"reused": True, "cached_at": cached["cached_at"]}
+    benchmark_session.benchmarks.append(benchmark)
+    state.reused.append(item.nodeid)
+    pytest.skip("Unchanged since the cached benchmark result.")
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_makereport(item: pytest.Item, call: pytest.CallInfo) -> pytest.TestReport:
+    report = yield
+    state = item.config.stash.get(_state_key, None)
+    benchmark_session = _benchmark_session(item.config)
+    if state is None or benchmark_session is None or call.when != "call" or not report.passed:
+        return report
+    fixture = getattr(item, "funcargs", {}).get("benchmark")
+    if not isinstance(fixture, BenchmarkFixture) or item.nodeid not in state.components:
+        return report
+
+    components = state.components[item.nodeid]
+    for benchmark in benchmark_session.benchmarks:
+        if getattr(benchmark, "fixture", None) is fixture and benchmark and not benchmark.has_error:
+            benchmark.extra_info["incremental"] = {"reused": False}
+            state.cache[item.nodeid] = {
+                "fingerprint": fingerprint(components),
+                "components": components,
+                "cached_at": datetime.now(timezone.utc).isoformat(),
+                "benchmark": benchmark.as_dict(include_data=True),
+            }
+    return report
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    state = session.config.stash.get(_state_key, None)
+    if state is not None and _benchmark_session(session.config) is not None:
+        # Benchmarks that weren't collected this run keep their cached results.
+        save_cache(state.path, state.cache)
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus: int, config: pytest.Config) -> None:
+    state = config.stash.get(_state_key, None)
+    if state is None:
+        return
+    terminalreporter.section("incremental benchmarks")
+    terminalreporter.write_line(
+        f"Reused {len(state.reused)} cached result(s) and ran {len(state.changed)} "
+        f"benchmark(s). Cache: {state.path}"
+    )
+    for fullname, components in state.changed.items():
+        if state.refresh:
+            reason = "refreshed"
+        elif not components:
+            reason = "not cached"
+        else:
+            shown = ", ".join(components[:3])
+            reason = f"changed: {shown}" + (f" and {len(components) - 3} more" if len(components) > 3 else "")
+        terminalreporter.write_line(f"  {fullname} ({reason})")
@@ -0,0 +1,397 @@
+"""
+A pytest plugin that runs each benchmark's rounds in fresh worker processes.
+
+pytest-benchmark times its rounds inside the long lived pytest process, next
+to everything the other tests imported and allocated, so heap layout and GC
+history vary between runs. With this plugin each benchmark is calibrated in
+pytest as usual, then its rounds are split across fresh Python processes,
+started one after another. Each worker:
+  - starts with a controlled environment: a fixed PYTHONHASHSEED and only a
+    few variables, e.g. PATH and HOME, from the parent,
+  - is optionally pinned to a CPU,
+  - runs explicit warmup rounds before the timed rounds, and
+  - applies an explicit gc policy to every round.
+
+The workers' rounds go back into the benchmark's stats, so they appear in the
+usual pytest-benchmark table, histograms and JSON. A check of the machine's
+noise (load average, CPU frequency governors, turbo boost) is stored in each
+benchmark's extra_info and summarized at the end of the run.
+
+    python -m pytest -p examples.isolated_benchmarks tests/benchmarks_test.py \\
+        --isolated-workers=3 --isolated-cpus=2,3 --isolated-gc=collect
+
+The benchmarked function and its arguments must be picklable, e.g. module
+level functions and builtins. Benchmarks that aren't fall back to running in
+pytest with a warning. benchmark.pedantic() always runs in pytest.
+"""
+
+import argparse
+import gc
+import glob
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import warnings
+from collections import Counter
+from dataclasses import asdict, dataclass, field, replace
+from math import ceil
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture, PauseInstrumentation
+
+from examples.parallel_sweep import available_cpus
+
+GC_POLICIES: tuple[str, ...] = ("inherit", "enabled", "disabled", "collect")
+DEFAULT_WARMUP_ROUNDS: int = 1
+HASH_SEED: int = 0
+
+# The only variables a worker inherits from the parent.
+KEPT_VARIABLES: tuple[str, ...] = (
+    "PATH",
+    "HOME",
+    "LANG",
+    "TMPDIR",
+    "TEMP",
+    "TMP",
+    "SYSTEMROOT",
+    "VIRTUAL_ENV",
+)
+
+# A load average above this per CPU suggests something else is competing for the CPUs.
+MAX_LOAD_PER_CPU: float = 0.5
+
+
+@dataclass
+class EnvironmentNoise:
+    """
+    The state of the machine that makes benchmarks noisy.
+    """
+
+    cpus: int
+    load_average: float | None  # Over the last minute.
+    governors: dict[str, int]  # The number of CPUs using each frequency governor.
+    turbo_boost: bool | None  # None when unknown.
+    warnings: list[str] = field(default_factory=list)
+
+    @property
+    def noisy(self) -> bool:
+        return bool(self.warnings)
+
+
+def _read(path: str) -> str | None:
+    try:
+        return Path(path).read_text().strip()
+    except OSError:
+        return None
+
+
+def check_environment() -> EnvironmentNoise:
+    """
+    Look for the usual sources of benchmark noise. Only Linux exposes the
+    frequency settings, elsewhere they're reported as unknown.
+    """
+    cpus = len(available_cpus())
+    load_average = os.getloadavg()[0] if hasattr(os, "getloadavg") else None
+    governors = Counter(
+        governor
+        for path in glob.glob("/sys/devices/system/cpu/cpu[0-9]*/cpufreq/scaling_governor")
+        if (governor := _read(path)) is not None
+    )
+    turbo_boost: bool | None = None
+    if (no_turbo := _read("/sys/devices/system/cpu/intel_pstate/no_turbo")) is not None:
+        turbo_boost = no_turbo == "0"
+    elif (boost := _read("/sys/devices/system/cpu/cpufreq/boost")) is not None:
+        turbo_boost = boost == "1"
+
+    noise = EnvironmentNoise(cpus, load_average, dict(governors), turbo_boost)
+    if load_average is not None and load_average / cpus > MAX_LOAD_PER_CPU:
+        noise.warnings.append(
+            f"The load average is {load_average:.2f} on {cpus} CPU(s). "
+            "Other processes are competing for the CPUs."
+        )
+    scaling = sorted(governor for governor in governors if governor != "performance")
+    if scaling:
+        noise.warnings.append(
+            f"CPU frequency governors {', '.join(scaling)} change the clock speed with load. "
+            "Use the performance governor."
+        )
+    if turbo_boost:
+        noise.warnings.append("Turbo boost is on, so the clock speed depends on temperature.")
+    return noise
+
+
+@dataclass
+class WorkerTask:
+    function: Callable[..., Any]
+    args: tuple
+    kwargs: dict[str, Any]
+    iterations: int  # Calls per round.
+    rounds: int
+    warmup_rounds: int
+    gc_policy: str  # "enabled", "disabled" or "collect".
+    timer: Callable[[], float]
+    cpu: int | None = None
+
+
+@dataclass
+class WorkerResult:
+    durations: list[float]  # One per round, for all of the round's iterations.
+    pid: int
+    cpus: list[int]
+    hash_seed: str | None
+
+
+def run_worker(task: WorkerTask) -> WorkerResult:
+    """
+    Run a task's rounds in this process.
+    """
+    if task.cpu is not None:
+        os.sched_setaffinity(0, {task.cpu})
+    function, args, kwargs, timer = task.function, task.args, task.kwargs, task.timer
+    loops = range(task.iterations)
+
+    def run_round() -> float:
+        gc_enabled = gc.isenabled()
+        if task.gc_policy != "enabled":
+            gc.disable()
+        try:
+            start = timer()
+            for _ in loops:
+                function(*args, **kwargs)
+            return timer() - start
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    for _ in range(task.warmup_rounds):
+        run_round()
+    if task.gc_policy == "collect":
+        # Start the timed rounds from a clean heap, with nothing left for gc to find.
+        gc.collect()
+    durations = [run_round() for _ in range(task.rounds)]
+    return WorkerResult(
+        durations, os.getpid(), available_cpus(), os.environ.get("PYTHONHASHSEED")
+    )
+
+
+def worker_environment(root: Path | str) -> dict[str, str]:
+    """
+    The environment of a worker process. Everything the parent can import,
+    including the test modules, stays importable.
+    """
+    environment = {name: os.environ[name] for name in KEPT_VARIABLES if name in os.environ}
+    environment["PYTHONHASHSEED"] = str(HASH_SEED)
+    environment["PYTHONDONTWRITEBYTECODE"] = "1"
+    environment["PYTHONPATH"] = os.pathsep.join([str(root), *filter(None, sys.path)])
+    return environment
+
+
+def spawn_worker(task: WorkerTask, root: Path | str) -> WorkerResult:
+    """
+    Run a task in a fresh Python process.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        task_path = Path(directory) / "task.pickle"
+        result_path = Path(directory) / "result.pickle"
+        task_path.write_bytes(pickle.dumps(task))
+        process = subprocess.run(
+            [sys.executable, "-m", "examples.isolated_benchmarks", str(task_path), str(result_path)],
+            cwd=root,
+            env=worker_environment(root),
+            capture_output=True,
+            text=True,
+        )
+        if process.returncode != 0:
+            raise RuntimeError(f"The benchmark worker failed:\n{process.stderr}")
+        return pickle.loads(result_path.read_bytes())
+
+
+def run_isolated(
+    task: WorkerTask, workers: int, root: Path | str, cpus: Sequence[int] = ()
+) -> list[WorkerResult]:
+    """
+    Split the task's rounds across workers fresh processes, run one at a time.
+
+    Parameters
+    cpus: Pin worker i to cpus[i % len(cpus)]. Not pinned when empty.
+    """
+    rounds = ceil(task.rounds / workers)
+    results: list[WorkerResult] = []
+    for worker in range(workers):
+        cpu = cpus[worker % len(cpus)] if cpus else None
+        results.append(spawn_worker(replace(task, rounds=rounds, cpu=cpu), root))
+    return results
+
+
+@dataclass
+class IsolationSettings:
+    workers: int
+    cpus: list[int]
+    warmup_rounds: int
+    gc_policy: str
+    root: Path
+    environment: EnvironmentNoise
+
+
+# Set by pytest_configure when the plugin is enabled. BenchmarkFixture has no
+# reference to the config, so the patched _raw reads the settings from here.
+_settings: IsolationSettings | None = None
+_original_raw: Callable[..., Any] = BenchmarkFixture._raw
+
+
+def _isolated_raw(self: BenchmarkFixture, function_to_benchmark, *args, **kwargs):
+    """
+    A replacement for BenchmarkFixture._raw that times the rounds in workers.
+    """
+    settings = _settings
+    if settings is None or not self.enabled or self.cprofile:
+        return _original_raw(self, function_to_benchmark, *args, **kwargs)
+
+    # Calibrate the iterations per round in pytest. Only the workers' rounds are kept.
+    runner = self._make_runner(function_to_benchmark, args, kwargs)
+    with PauseInstrumentation():
+        duration, iterations, _ = self._calibrate_timer(runner)
+    rounds = max(ceil(self._max_time / duration), self._min_rounds)
+
+    gc_policy = settings.gc_policy
+    if gc_policy == "inherit":
+        gc_policy = "disabled" if self._disable_gc else "enabled"
+    task = WorkerTask(
+        function_to_benchmark,
+        args,
+        kwargs,
+        iterations,
+        rounds,
+        settings.warmup_rounds,
+        gc_policy,
+        self._timer,
+    )
+    try:
+        pickle.dumps(task)
+    except Exception as error:
+        warnings.warn(
+            pytest.PytestWarning(
+                f"{self.fullname} can't run in a worker process ({error}). "
+                "It ran in the pytest process."
+            )
+        )
+        self.extra_info["isolated"] = False
+        return _original_raw(self, function_to_benchmark, *args, **kwargs)
+
+    results = run_isolated(task, settings.workers, settings.root, settings.cpus)
+    stats = self._make_stats(iterations)
+    for result in results:
+        for round_duration in result.durations:
+            stats.update(round_duration)
+    self.extra_info["isolated"] = {
+        "workers": len(results),
+        "pids": [result.pid for result in results],
+        "cpus": [result.cpus for result in results],
+        "warmup_rounds": settings.warmup_rounds,
+        "gc": gc_policy,
+        "hash_seed": results[0].hash_seed,
+        "environment": asdict(settings.environment),
+    }
+    return function_to_benchmark(*args, **kwargs)
+
+
+def parse_cpus(value: str) -> list[int]:
+    try:
+        return [int(cpu) for cpu in value.split(",") if cpu.strip()]
+    except ValueError:
+        raise pytest.UsageError(f"Expected a comma separated list of CPUs but received {value!r}.")
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("isolated", "isolated benchmark workers")
+    group.addoption(
+        "--isolated-workers",
+        type=int,
+        default=0,
+        help="Run each benchmark's rounds across this many fresh processes. Default: off",
+    )
+    group.addoption(
+        "--isolated-cpus",
+        metavar="CPU,CPU",
+        default="",
+        help="Pin the workers to these CPUs, round robin. Linux only.",
+    )
+    group.addoption(
+        "--isolated-warmup",
+        type=int,
+        default=DEFAULT_WARMUP_ROUNDS,
+        help="The untimed rounds each worker runs first. Default: %(default)s",
+    )
+    group.addoption(
+        "--isolated-gc",
+        choices=GC_POLICIES,
+        default="inherit",
+        help="The gc policy during rounds. collect runs gc.collect() after the warmup "
+        "and disables gc during the rounds. Default: the benchmark's disable_gc setting.",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    global _settings
+    workers = config.getoption("isolated_workers", 0)
+    if not workers:
+        return
+    cpus = parse_cpus(config.getoption("isolated_cpus"))
+    if cpus and not hasattr(os, "sched_setaffinity"):
+        raise pytest.UsageError("CPU pinning is not supported on this platform.")
+    if unavailable := set(cpus) - set(available_cpus()):
+        raise pytest.UsageError(f"CPUs {sorted(unavailable)} aren't available to this process.")
+    _settings = IsolationSettings(
+        workers,
+        cpus,
+        config.getoption("isolated_warmup"),
+        config.getoption("isolated_gc"),
+        config.rootpath,
+        check_environment(),
+    )
+    BenchmarkFixture._raw = _isolated_raw
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    global _settings
+    if _settings is not None:
+        BenchmarkFixture._raw = _original_raw
+        _settings = None
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus: int, config: pytest.Config) -> None:
+    settings = _settings
+    if settings is None:
+        return
+    terminalreporter.section("isolated benchmarks")
+    pinned = f", pinned to CPUs {settings.cpus}" if settings.cpus else ""
+    terminalreporter.write_line(
+        f"Each benchmark ran in {settings.workers} fresh worker process(es){pinned} "
+        f"with {settings.warmup_rounds} warmup round(s) and gc policy {settings.gc_policy}."
+    )
+    if not settings.environment.noisy:
+        terminalreporter.write_line("No environment noise detected.", green=True)
+    for warning in settings.environment.warnings:
+        terminalreporter.write_line(warning, yellow=True)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Run a pickled WorkerTask.")
+    parser.add_argument("task", help="The pickled WorkerTask to run.")
+    parser.add_argument("result", help="Where to write the pickled WorkerResult.")
+    args = parser.parse_args(argv)
+
+    task = pickle.loads(Path(args.task).read_bytes())
+    Path(args.result).write_bytes(pickle.dumps(run_worker(task)))
+
+
+if __name__ == "__main__":
+    # Run the imported module's main, so the pickled WorkerResult's class is
+    # examples.isolated_benchmarks.WorkerResult rather than __main__.WorkerResult.
+    from examples.isolated_benchmarks import main as worker_main
+
+    worker_main()
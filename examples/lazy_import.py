@@ -0,0 +1,41 @@
+"""
+Defer importing a module until one of its attributes is used.
+
+    pd = lazy_import("pandas")
+
+    def report():
+        return pd.DataFrame(...)  # pandas is imported here, on first use.
+
+Modules like pandas, great_tables and matplotlib.pyplot each take hundreds of
+milliseconds to import. Importing them lazily means test collection, CLIs and
+worker processes only pay for them when they are actually used.
+"""
+
+import importlib
+import sys
+from types import ModuleType
+from typing import Any
+
+
+class LazyModule(ModuleType):
+    """
+    A placeholder that imports the named module on the first attribute access.
+    The module's attributes are then copied onto the placeholder, so later
+    accesses are plain attribute lookups.
+    """
+
+    def __getattr__(self, attribute: str) -> Any:
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attribute)
+
+    @property
+    def loaded(self) -> bool:
+        return self.__name__ in sys.modules
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Returns the module if it's already imported, otherwise a LazyModule for it.
+    """
+    return sys.modules.get(name) or LazyModule(name)
@@ -0,0 +1,352 @@
+"""
+A pytest plugin that line profiles functions named by their dotted path.
+
+Line profiling normally means decorating a function with @profile and running
+kernprof, i.e. editing the code under test. With this plugin the functions are
+named on the command line, or in the LINE_PROFILE_FUNCTIONS environment
+variable, and wrapped with line_profiler as their module is imported:
+
+    python -m pytest -p examples.line_profiling tests/profile_with_line_profiler_test.py \\
+        --line-profile=tests.profile_with_line_profiler_test.numeric_process
+
+    LINE_PROFILE_FUNCTIONS=examples.memory_example.fibonacci,examples.memory_example.Class.method \\
+        python -m pytest -p examples.line_profiling tests/memory_test.py
+
+The timings of every call, e.g. every round of a benchmark, accumulate in one
+profiler. At the end of the run they're saved as a .lprof file, which
+`python -m line_profiler --rich pytest.lprof` displays, and the slowest lines
+are ranked in the terminal summary.
+
+Only the named functions are wrapped. Everything else runs untouched, except
+that the profiler's line events stay on while a named function is running, so
+the functions it calls run slower during that call.
+
+Usage:
+    python -m examples.line_profiling pytest.lprof --top 20
+"""
+
+import argparse
+import importlib.util
+import inspect
+import linecache
+import os
+import sys
+from dataclasses import dataclass
+from importlib.abc import Loader, MetaPathFinder
+from importlib.machinery import ModuleSpec
+from pathlib import Path
+from types import CellType, CodeType, FunctionType, ModuleType
+from typing import Any, Iterator, Sequence
+
+import pytest
+from line_profiler import LineProfiler
+from line_profiler.line_profiler import LineStats
+
+from examples.types import TimeInSec
+
+ENVIRONMENT_VARIABLE: str = "LINE_PROFILE_FUNCTIONS"
+DEFAULT_OUTPUT: str = "pytest.lprof"
+DEFAULT_TOP: int = 10
+
+
+@dataclass
+class ProfileTarget:
+    """
+    A function to profile, e.g. tests.profile_with_line_profiler_test.numeric_process.
+    """
+
+    name: str  # The dotted name it was given as.
+    module: str
+    attributes: list[str]  # The path to the function within the module, e.g. [Class, method].
+    filename: Path  # The module's source file.
+    instrumented: bool = False
+    error: str | None = None
+
+
+def parse_names(values: Sequence[str]) -> list[str]:
+    """
+    Split comma separated dotted names, dropping blanks and duplicates.
+    """
+    names = [name.strip() for value in values for name in value.split(",")]
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def resolve_target(name: str) -> ProfileTarget:
+    """
+    Find the module that defines a dotted name, without importing the module.
+
+    The module is the longest prefix of the name that can be found, so both
+    package.module.function and package.module.Class.method resolve. Only
+    packages are searched for submodules, since finding module.Class would
+    import the module.
+    """
+    parts = name.split(".")
+    target = None
+    for split in range(1, len(parts)):
+        module = ".".join(parts[:split])
+        try:
+            spec = importlib.util.find_spec(module)
+        except (ImportError, ValueError):
+            break
+        if spec is None:
+            break
+        if spec.origin is not None and spec.has_location:
+            target = ProfileTarget(name, module, parts[split:], Path(spec.origin).resolve())
+        if spec.submodule_search_locations is None:
+            break
+    if target is None:
+        raise pytest.UsageError(f"Can't find the module that defines {name!r} to line profile it.")
+    return target
+
+
+def _code_objects(code: CodeType) -> Iterator[CodeType]:
+    yield code
+    for constant in code.co_consts:
+        if isinstance(constant, CodeType):
+            yield from _code_objects(constant)
+
+
+class LineProfilingSession:
+    """
+    Wraps the target functions with one profiler as their modules are imported.
+
+    Modules are matched by file rather than name, because pytest may import a
+    test module under a different name, e.g. profile_with_line_profiler_test
+    rather than tests.profile_with_line_profiler_test.
+    """
+
+    def __init__(self, targets: Sequence[ProfileTarget]) -> None:
+        self.targets = list(targets)
+        self.profiler = LineProfiler()
+
+    def instrument(self, module: ModuleType) -> None:
+        filename = getattr(module, "__file__", None)
+        if filename is None:
+            return
+        path = Path(filename).resolve()
+        for target in self.targets:
+            if target.filename != path or target.instrumented:
+                continue
+            owner: Any = module
+            try:
+                for attribute in target.attributes[:-1]:
+                    owner = getattr(owner, attribute)
+                # The raw attribute, so static and class methods keep their type.
+                function = inspect.getattr_static(owner, target.attributes[-1])
+            except AttributeError:
+                target.error = f"{module.__name__} has no attribute {'.'.join(target.attributes)}."
+                continue
+            setattr(owner, target.attributes[-1], self.profiler(function))
+            target.instrumented = True
+            target.error = None
+
+    def instrument_code(self, code: CodeType) -> None:
+        """
+        Profile the target functions defined in code that runs without being
+        imported, e.g. a script run as __main__. Enable the profiler, e.g. with
+        profiler.enable_by_count(), while the code runs.
+        """
+        path = Path(code.co_filename).resolve()
+        for target in self.targets:
+            if target.filename != path or target.instrumented:
+                continue
+            qualified = ".".join(target.attributes)
+            for nested in _code_objects(code):
+                if nested.co_qualname == qualified:
+                    # Only the code object is profiled, so empty cells stand in for
+                    # the free variables, e.g. the __class__ of a method calling super().
+                    closure = tuple(CellType() for _ in nested.co_freevars)
+                    self.profiler.add_function(FunctionType(nested, {}, closure=closure))
+                    target.instrumented = True
+
+    def install(self) -> None:
+        """
+        Instrument the target modules that are already imported and watch for the rest.
+        """
+        for module in list(sys.modules.values()):
+            if isinstance(module, ModuleType):
+                self.instrument(module)
+        sys.meta_path.insert(0, _InstrumentingFinder(self))
+
+    def uninstall(self) -> None:
+        sys.meta_path[:] = [
+            finder
+            for finder in sys.meta_path
+            if not (isinstance(finder, _InstrumentingFinder) and finder.session is self)
+        ]
+
+
+class _InstrumentingLoader(Loader):
+    """
+    Runs the module's own loader, e.g. pytest's assertion rewriter, then instruments it.
+    """
+
+    def __init__(self, loader: Loader, session: LineProfilingSession) -> None:
+        self.loader = loader
+        self.session = session
+
+    def create_module(self, spec: ModuleSpec) -> ModuleType | None:
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module: ModuleType) -> None:
+        self.loader.exec_module(module)
+        self.session.instrument(module)
+
+
+class _InstrumentingFinder(MetaPathFinder):
+    def __init__(self, session: LineProfilingSession) -> None:
+        self.session = session
+        self.filenames = {target.filename for target in session.targets}
+
+    def find_spec(self, fullname: str, path: Any, target: Any = None) -> ModuleSpec | None:
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if (
+                spec.origin is not None
+                and spec.loader is not None
+                and Path(spec.origin).resolve() in self.filenames
+            ):
+                spec.loader = _InstrumentingLoader(spec.loader, self.session)
+            return spec
+        return None
+
+
+@dataclass
+class LineHotspot:
+    function: str
+    filename: str
+    line: int
+    hits: int
+    time: TimeInSec  # Includes the time spent in the functions the line calls.
+    share: float  # Of the function's total time.
+    source: str = ""
+
+
+def hotspots(stats: LineStats, top: int | None = DEFAULT_TOP) -> list[LineHotspot]:
+    """
+    Rank the profiled lines of every function by their total time.
+
+    Parameters
+    stats: The profiler's stats, e.g. LineStats.from_files("pytest.lprof").
+    top: The number of lines to return, or None for all of them.
+    """
+    lines: list[LineHotspot] = []
+    for (filename, _, function), timings in stats.timings.items():
+        total = sum(time for _, _, time in timings)
+        for line, hits, time in timings:
+            lines.append(
+                LineHotspot(
+                    function,
+                    filename,
+                    line,
+                    hits,
+                    time * stats.unit,
+                    time / total if total else 0.0,
+                    linecache.getline(filename, line).strip(),
+                )
+            )
+    lines.sort(key=lambda hotspot: hotspot.time, reverse=True)
+    return lines[:top] if top is not None else lines
+
+
+def hotspot_report(lines: Sequence[LineHotspot]) -> str:
+    header_fmt = "{:>5} {:<48} {:>12} {:>12} {:>9}  {}"
+    row_fmt = "{:>5} {:<48} {:>12,} {:>12,.6f} {:>9.1%}  {}"
+    report = [
+        header_fmt.format("Rank", "Module.Function:Line", "Hits", "Time (s)", "% Func", "Source")
+    ]
+    for rank, hotspot in enumerate(lines, start=1):
+        report.append(
+            row_fmt.format(
+                rank,
+                f"{Path(hotspot.filename).stem}.{hotspot.function}:{hotspot.line}",
+                hotspot.hits,
+                hotspot.time,
+                hotspot.share,
+                hotspot.source,
+            )
+        )
+    return "\n".join(report)
+
+
+_session_key = pytest.StashKey[LineProfilingSession]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("line profiling", "line profiling by function name")
+    group.addoption(
+        "--line-profile",
+        metavar="DOTTED.NAME",
+        action="append",
+        default=[],
+        help="Line profile this function, e.g. package.module.function or "
+        f"package.module.Class.method. May be repeated. Also read from ${ENVIRONMENT_VARIABLE}.",
+    )
+    group.addoption(
+        "--line-profile-output",
+        metavar="PATH",
+        default=DEFAULT_OUTPUT,
+        help="Where to save the line profile. Default: %(default)s",
+    )
+    group.addoption(
+        "--line-profile-top",
+        type=int,
+        default=DEFAULT_TOP,
+        help="The number of hotspot lines to show. Default: %(default)s",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    names = parse_names(
+        [*config.getoption("line_profile", []), os.environ.get(ENVIRONMENT_VARIABLE, "")]
+    )
+    if not names:
+        return
+    session = LineProfilingSession([resolve_target(name) for name in names])
+    session.install()
+    config.stash[_session_key] = session
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    session = config.stash.get(_session_key, None)
+    if session is not None:
+        session.uninstall()
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    profiling = session.config.stash.get(_session_key, None)
+    if profiling is not None:
+        profiling.profiler.dump_stats(session.config.getoption("line_profile_output"))
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus: int, config: pytest.Config) -> None:
+    session = config.stash.get(_session_key, None)
+    if session is None:
+        return
+    terminalreporter.section("line profile")
+    for target in session.targets:
+        if not target.instrumented:
+            reason = target.error or f"{target.module} was never imported."
+            terminalreporter.write_line(f"{target.name} wasn't profiled: {reason}", yellow=True)
+    lines = hotspots(session.profiler.get_stats(), config.getoption("line_profile_top"))
+    if lines:
+        terminalreporter.write_line(hotspot_report(lines))
+    output = config.getoption("line_profile_output")
+    terminalreporter.write_line(f"View every line with: python -m line_profiler --rich {output}")
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Rank the hotspot lines of a saved line profile.")
+    parser.add_argument("lprof", nargs="+", help="The .lprof files to combine.")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP)
+    args = parser.parse_args(argv)
+
+    print(hotspot_report(hotspots(LineStats.from_files(*args.lprof), args.top)))
+
+
+if __name__ == "__main__":
+    main()
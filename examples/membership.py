@@ -0,0 +1,288 @@
+"""
+A benchmark suite of data structures for string membership lookups.
+
+Each structure in STRUCTURES is built from a sequence of names and answers
+single and batch membership queries:
+  - set, frozenset and dict: Hash tables of the str objects.
+  - bisect: A sorted list of the unique names searched with bisect.
+  - searchsorted: A sorted NumPy array of fixed width UTF-8 bytes searched
+    with np.searchsorted. Batches are searched in a single vectorized call.
+  - pandas_index: A pandas Index of the unique names. Batches use get_indexer().
+  - compact_index: A CompactNameIndex, packed UTF-8 behind an open-addressed
+    table of uint32 ids. Batches are hashed and probed with NumPy.
+
+measure_membership() records the build time, the memory footprint and the
+latency of hit, miss and batch lookups for each structure at each size.
+
+Usage:
+    python -m examples.membership --sizes 1000 100000 10000000 --batch 1000000
+"""
+
+import argparse
+import bisect
+import gc
+import operator
+import time
+import timeit
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Sequence
+
+import numpy as np
+
+from examples.compact_index import CompactNameIndex
+from examples.lazy_import import lazy_import
+from examples.types import TimeInNS
+
+pd = lazy_import("pandas")
+
+
+@dataclass
+class Structure:
+    name: str
+    build: Callable[[Sequence[str]], Any]
+    contains: Callable[[Any, str], bool]
+    contains_batch: Callable[[Any, Sequence[str]], np.ndarray]
+
+
+def _contains_each(structure: Any, queries: Sequence[str]) -> np.ndarray:
+    return np.fromiter(
+        map(structure.__contains__, queries), dtype=np.bool_, count=len(queries)
+    )
+
+
+def build_sorted_list(names: Sequence[str]) -> list[str]:
+    return sorted(set(names))
+
+
+def sorted_list_contains(names: list[str], query: str) -> bool:
+    index = bisect.bisect_left(names, query)
+    return index < len(names) and names[index] == query
+
+
+def sorted_list_contains_batch(names: list[str], queries: Sequence[str]) -> np.ndarray:
+    return np.fromiter(
+        (sorted_list_contains(names, query) for query in queries),
+        dtype=np.bool_,
+        count=len(queries),
+    )
+
+
+def build_byte_array(names: Sequence[str]) -> np.ndarray:
+    """
+    A sorted array of the unique names as fixed width UTF-8 bytes.
+    Every element is as wide as the longest name.
+    """
+    encoded = np.array([name.encode() for name in names], dtype=np.bytes_)
+    return np.unique(encoded)
+
+
+def byte_array_contains(array: np.ndarray, query: str) -> bool:
+    encoded = query.encode()
+    if len(encoded) > array.dtype.itemsize:
+        return False
+    index = int(np.searchsorted(array, encoded))
+    return index < len(array) and array[index] == encoded
+
+
+def byte_array_contains_batch(array: np.ndarray, queries: Sequence[str]) -> np.ndarray:
+    if len(array) == 0:
+        return np.zeros(len(queries), dtype=np.bool_)
+    encoded = [query.encode() for query in queries]
+    # Queries longer than the array's width would be truncated, and can't be present.
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    fits = lengths <= array.dtype.itemsize
+    keys = np.array(encoded, dtype=array.dtype)
+    indices = np.minimum(np.searchsorted(array, keys), len(array) - 1)
+    return fits & (array[indices] == keys)
+
+
+def build_pandas_index(names: Sequence[str]) -> "pd.Index":
+    index = pd.Index(pd.unique(np.asarray(names, dtype=object)))
+    # The hash table behind an Index is built lazily on the first lookup.
+    if len(index):
+        index.get_loc(index[0])
+    return index
+
+
+def pandas_index_contains_batch(index: "pd.Index", queries: Sequence[str]) -> np.ndarray:
+    return index.get_indexer(queries) >= 0
+
+
+STRUCTURES: dict[str, Structure] = {
+    "set": Structure("set", set, operator.contains, _contains_each),
+    "frozenset": Structure("frozenset", frozenset, operator.contains, _contains_each),
+    "dict": Structure("dict", dict.fromkeys, operator.contains, _contains_each),
+    "bisect": Structure(
+        "bisect", build_sorted_list, sorted_list_contains, sorted_list_contains_batch
+    ),
+    "searchsorted": Structure(
+        "searchsorted", build_byte_array, byte_array_contains, byte_array_contains_batch
+    ),
+    "pandas_index": Structure(
+        "pandas_index", build_pandas_index, operator.contains, pandas_index_contains_batch
+    ),
+    "compact_index": Structure(
+        "compact_index",
+        CompactNameIndex.build,
+        operator.contains,
+        CompactNameIndex.contains_batch,
+    ),
+}
+
+
+def miss_queries(names: Sequence[str], count: int, seed: int) -> list[str]:
+    """
+    Names that look like the data set's names but aren't in it.
+    """
+    rng = np.random.default_rng(seed)
+    return [f"{names[index]}!" for index in rng.integers(0, len(names), size=count)]
+
+
+def hit_queries(names: Sequence[str], count: int, seed: int) -> list[str]:
+    rng = np.random.default_rng(seed)
+    return [names[index] for index in rng.integers(0, len(names), size=count)]
+
+
+@dataclass
+class MembershipMeasurement:
+    """
+    How one structure performed at one size. Times are in nanoseconds.
+    """
+
+    structure: str
+    size: int
+    build_time: TimeInNS
+    memory: int  # Bytes allocated by the structure, excluding the shared str objects.
+    hit_time: float  # Per lookup.
+    miss_time: float  # Per lookup.
+    batch_time: float  # Per query in a batch.
+
+
+def _lookup_time(structure: Structure, built: Any, queries: list[str], repeat: int) -> float:
+    contains = structure.contains
+    timer = timeit.Timer(
+        "for query in queries: contains(built, query)",
+        globals={"queries": queries, "contains": contains, "built": built},
+        timer=time.perf_counter_ns,
+    )
+    return min(timer.repeat(repeat=repeat, number=1)) / len(queries)
+
+
+def _footprint(structure: Structure, names: Sequence[str]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        built = structure.build(names)
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del built
+    return after - before
+
+
+def measure_membership(
+    names: Sequence[str],
+    sizes: Iterable[int],
+    structures: Iterable[str] = STRUCTURES,
+    lookups: int = 1_000,
+    batch: int = 1_000_000,
+    repeat: int = 5,
+    seed: int = 0,
+) -> list[MembershipMeasurement]:
+    """
+    Measure every structure at every size.
+
+    Parameters
+    names: The master data set. Each size uses its first size names.
+    lookups: The number of hit and miss queries timed per repeat.
+    batch: The number of queries, half hits and half misses, in a batch lookup.
+    repeat: Lookups are timed repeat times and the fastest is kept.
+    """
+    measurements: list[MembershipMeasurement] = []
+    for size in sizes:
+        sample = names[:size]
+        hits = hit_queries(sample, lookups, seed)
+        misses = miss_queries(sample, lookups, seed)
+        batch_queries = hit_queries(sample, batch // 2, seed) + miss_queries(
+            sample, batch - batch // 2, seed
+        )
+        for name in structures:
+            structure = STRUCTURES[name]
+            # Warm up, e.g. import pandas, so the build time is only the build.
+            structure.contains_batch(structure.build(sample[:10]), hits[:10])
+
+            start: TimeInNS = time.perf_counter_ns()
+            built = structure.build(sample)
+            build_time: TimeInNS = time.perf_counter_ns() - start
+
+            batch_start: TimeInNS = time.perf_counter_ns()
+            structure.contains_batch(built, batch_queries)
+            batch_time: TimeInNS = time.perf_counter_ns() - batch_start
+
+            measurements.append(
+                MembershipMeasurement(
+                    name,
+                    size,
+                    build_time,
+                    _footprint(structure, sample),
+                    _lookup_time(structure, built, hits, repeat),
+                    _lookup_time(structure, built, misses, repeat),
+                    batch_time / len(batch_queries),
+                )
+            )
+            del built
+    return measurements
+
+
+def membership_report(measurements: Sequence[MembershipMeasurement]) -> str:
+    header_fmt = "{:<14} {:>12} {:>14} {:>14} {:>10} {:>10} {:>12}"
+    row_fmt = "{:<14} {:>12,} {:>14,.1f} {:>14,.1f} {:>10,.1f} {:>10,.1f} {:>12,.1f}"
+    lines = [
+        header_fmt.format(
+            "Structure",
+            "Size",
+            "Build (ms)",
+            "Memory (KB)",
+            "Hit (ns)",
+            "Miss (ns)",
+            "Batch (ns)",
+        )
+    ]
+    for measurement in measurements:
+        lines.append(
+            row_fmt.format(
+                measurement.structure,
+                measurement.size,
+                measurement.build_time / 1e6,
+                measurement.memory / 1024,
+                measurement.hit_time,
+                measurement.miss_time,
+                measurement.batch_time,
+            )
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    from examples.name_generator import create_random_names
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 10_000_000])
+    parser.add_argument(
+        "--structures", nargs="+", choices=list(STRUCTURES), default=list(STRUCTURES)
+    )
+    parser.add_argument("--batch", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=2024)
+    args = parser.parse_args(argv)
+
+    names, _ = create_random_names(max(args.sizes), args.seed)
+    measurements = measure_membership(
+        names, args.sizes, args.structures, batch=args.batch, seed=args.seed
+    )
+    print(membership_report(measurements))
+
+
+if __name__ == "__main__":
+    main()
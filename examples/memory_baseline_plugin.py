@@ -0,0 +1,210 @@
+"""
+A pytest plugin that records each test's peak memory under memray as a
+baseline and fails later runs that exceed it.
+
+Record a baseline:
+    python -m pytest --memray -p examples.memory_baseline_plugin tests/memory_test.py \\
+        --memory-baseline=memory_baseline.json --memory-baseline-save
+
+Then check later runs against it:
+    python -m pytest --memray -p examples.memory_baseline_plugin tests/memory_test.py \\
+        --memory-baseline=memory_baseline.json --memory-tolerance=10%
+
+The peak is the memory that was allocated at the test's high watermark, the
+same measure pytest-memray's limit_memory marker uses. A test fails when its
+peak exceeds the baseline by more than the tolerance and the minimum growth.
+The failure lists the allocation sites whose memory grew the most, so the
+line responsible for the regression is in the report.
+"""
+
+import json
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Mapping
+
+import pytest
+from memray import FileReader
+from pytest_memray.utils import parse_memory_string, sizeof_fmt
+
+from examples.regression_plugin import parse_percent
+
+DEFAULT_TOLERANCE: float = 0.1
+DEFAULT_MIN_GROWTH: str = "64 KB"
+
+# The number of allocation sites saved per test and listed in a failure.
+MAX_SITES: int = 10
+
+_baselines_key = pytest.StashKey[dict[str, dict[str, Any]]]()
+_peaks_key = pytest.StashKey[dict[str, dict[str, Any]]]()
+_exceeded_key = pytest.StashKey[list[str]]()
+
+
+@dataclass
+class MemoryPeak:
+    """
+    The memory allocated at a test's high watermark, in bytes, and where it was allocated.
+    """
+
+    peak_memory: int
+    sites: Counter[str]  # Bytes keyed by "function:file:line".
+
+    def to_json(self) -> dict[str, Any]:
+        return {"peak_memory": self.peak_memory, "sites": dict(self.sites.most_common(MAX_SITES))}
+
+    @staticmethod
+    def from_json(data: Mapping[str, Any]) -> "MemoryPeak":
+        return MemoryPeak(data["peak_memory"], Counter(data["sites"]))
+
+
+def read_peak(result_file: Path | str, root: Path | None = None) -> MemoryPeak:
+    """
+    Sum the allocations alive at the high watermark of a memray capture by site.
+    Files under root are named relative to it so baselines can be shared between machines.
+    """
+    sites: Counter[str] = Counter()
+    for record in FileReader(result_file).get_high_watermark_allocation_records(
+        merge_threads=True
+    ):
+        stack = record.stack_trace(max_stacks=1)
+        if not stack:
+            sites["???"] += record.size
+            continue
+        function, filename, line = stack[0]
+        if root is not None and Path(filename).is_relative_to(root):
+            filename = Path(filename).relative_to(root).as_posix()
+        sites[f"{function}:{filename}:{line}"] += record.size
+    return MemoryPeak(sites.total(), sites)
+
+
+def grown_sites(baseline: MemoryPeak, current: MemoryPeak) -> list[tuple[str, int]]:
+    """
+    Returns the (site, growth in bytes) of the sites that allocate more than in the
+    baseline, largest growth first.
+    """
+    growth = current.sites.copy()
+    growth.subtract(baseline.sites)
+    return [(site, size) for site, size in growth.most_common(MAX_SITES) if size > 0]
+
+
+def exceeds_budget(
+    baseline: MemoryPeak, current: MemoryPeak, tolerance: float, min_growth: int
+) -> bool:
+    growth = current.peak_memory - baseline.peak_memory
+    return growth > min_growth and current.peak_memory > baseline.peak_memory * (1 + tolerance)
+
+
+def format_growth(baseline: MemoryPeak, current: MemoryPeak, tolerance: float) -> list[str]:
+    budget = baseline.peak_memory * (1 + tolerance)
+    lines = [
+        f"Peak memory {sizeof_fmt(current.peak_memory)} exceeded the baseline "
+        f"{sizeof_fmt(baseline.peak_memory)} + {tolerance:.0%} budget of {sizeof_fmt(budget)}.",
+        "The allocation sites that grew:",
+    ]
+    for site, size in grown_sites(baseline, current):
+        lines.append(f"    +{sizeof_fmt(size)} {site}")
+    return lines
+
+
+def load_baselines(path: Path | str) -> dict[str, dict[str, Any]]:
+    path = Path(path)
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("memory-baseline", "memory budgets from a saved baseline")
+    group.addoption(
+        "--memory-baseline",
+        metavar="PATH",
+        help="A JSON file of per-test peak memory. Requires --memray.",
+    )
+    group.addoption(
+        "--memory-baseline-save",
+        action="store_true",
+        default=False,
+        help="Record the peak memory of the tests that ran into the baseline.",
+    )
+    group.addoption(
+        "--memory-tolerance",
+        metavar="PERCENT%",
+        default=f"{DEFAULT_TOLERANCE:.0%}",
+        help="The allowed growth of a test's peak memory. Default: %(default)s",
+    )
+    group.addoption(
+        "--memory-min-growth",
+        metavar="SIZE",
+        default=DEFAULT_MIN_GROWTH,
+        help="Ignore growth smaller than this, e.g. 64 KB. Default: %(default)s",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    if config.getoption("memory_baseline") and not config.getoption("memray"):
+        raise pytest.UsageError("--memory-baseline requires --memray.")
+    saving = config.getoption("memory_baseline_save")
+    baseline_path = config.getoption("memory_baseline")
+    config.stash[_baselines_key] = (
+        load_baselines(baseline_path) if baseline_path and not saving else {}
+    )
+    config.stash[_peaks_key] = {}
+    config.stash[_exceeded_key] = []
+
+
+@pytest.hookimpl(hookwrapper=True, tryfirst=True)
+def pytest_runtest_makereport(item: pytest.Item, call: pytest.CallInfo):
+    outcome = yield
+    config = item.config
+    baseline_path = config.getoption("memory_baseline")
+    report = outcome.get_result()
+    if baseline_path is None or report.when != "call" or report.outcome != "passed":
+        return
+
+    result = config.pluginmanager.get_plugin("memray_manager").results.get(item.nodeid)
+    if result is None:
+        return
+    current = read_peak(result.result_file, config.rootpath)
+    if config.getoption("memory_baseline_save"):
+        config.stash[_peaks_key][item.nodeid] = current.to_json()
+        return
+
+    baselines = config.stash[_baselines_key]
+    if item.nodeid not in baselines:
+        return
+
+    baseline = MemoryPeak.from_json(baselines[item.nodeid])
+    tolerance = parse_percent(config.getoption("memory_tolerance"))
+    min_growth = parse_memory_string(config.getoption("memory_min_growth"))
+    if exceeds_budget(baseline, current, tolerance, min_growth):
+        lines = format_growth(baseline, current, tolerance)
+        report.outcome = "failed"
+        report.longrepr = lines[0]
+        report.sections.append(("memory-baseline", "\n".join(lines[1:])))
+        config.stash[_exceeded_key].append(item.nodeid)
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    config = session.config
+    baseline_path = config.getoption("memory_baseline")
+    if baseline_path is None or not config.getoption("memory_baseline_save"):
+        return
+    baselines = load_baselines(baseline_path)
+    baselines.update(config.stash[_peaks_key])
+    Path(baseline_path).write_text(json.dumps(baselines, indent=2, sort_keys=True))
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus: int, config: pytest.Config) -> None:
+    baseline_path = config.getoption("memory_baseline")
+    if baseline_path is None:
+        return
+    terminalreporter.section("memory baseline")
+    if config.getoption("memory_baseline_save"):
+        count = len(config.stash[_peaks_key])
+        terminalreporter.write_line(f"Saved the peak memory of {count} test(s) to {baseline_path}.")
+        return
+    exceeded = config.stash[_exceeded_key]
+    if not exceeded:
+        terminalreporter.write_line("No tests exceeded their memory budget.", green=True)
+        return
+    terminalreporter.write_line(f"{len(exceeded)} test(s) exceeded their memory budget:", red=True)
+    for nodeid in exceeded:
+        terminalreporter.write_line(f"  {nodeid}", red=True)
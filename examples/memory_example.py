@@ -1,8 +1,16 @@
 # Note: This is copied from https://github.com/bloomberg/memray/blob/main/docs/tutorials/exercise_1/fibonacci.py
 
 import operator
+import sys
 from functools import reduce
 from itertools import chain
+from typing import Iterator
+
+# generate_fibonacci_hash keeps the last four digits of the sum.
+HASH_MODULUS: int = 10000
+
+# Sequences at least this long are summed with fast doubling rather than iteration.
+FAST_DOUBLING_THRESHOLD: int = 64
 
 
 def fibonacci(length):
@@ -36,12 +44,96 @@ def generate_fibonacci_hash(length_1, length_2, length_3):
     )
 
 
+def fibonacci_stream(length: int) -> Iterator[int]:
+    """
+    Yield the same values as fibonacci(length) without building a list.
+    Only the last two values are held in memory.
+    """
+    current, following = 1, 1
+    for _ in range(length):
+        yield current
+        current, following = following, current + following
+
+
+def generate_fibonacci_hash_streaming(length_1: int, length_2: int, length_3: int) -> int:
+    """
+    The same hash as generate_fibonacci_hash, summing the sequences as they are generated.
+    """
+    return (
+        reduce(
+            operator.add,
+            chain(
+                fibonacci_stream(length_1),
+                fibonacci_stream(length_2),
+                fibonacci_stream(length_3),
+            ),
+            0,
+        )
+        % HASH_MODULUS
+    )
+
+
+def fibonacci_pair_mod(n: int, modulus: int) -> tuple[int, int]:
+    """
+    Calculate (F(n), F(n + 1)) modulo modulus in O(log n) steps with fast doubling:
+        F(2k) = F(k) * (2 * F(k + 1) - F(k))
+        F(2k + 1) = F(k)^2 + F(k + 1)^2
+    Every intermediate value stays below 2 * modulus^2 in magnitude.
+    """
+    a, b = 0, 1  # F(0), F(1)
+    for bit in bin(n)[2:]:
+        a, b = (a * (2 * b - a)) % modulus, (a * a + b * b) % modulus
+        if bit == "1":
+            a, b = b, (a + b) % modulus
+    return a, b
+
+
+def fibonacci_sum_mod(length: int, modulus: int = HASH_MODULUS) -> int:
+    """
+    The sum of fibonacci(length) modulo modulus.
+
+    The sum of the first n Fibonacci numbers is F(n + 2) - 1, so long sequences
+    are summed with fast doubling. Short ones are summed term by term.
+    """
+    if length < 1:
+        return 0
+    if length < FAST_DOUBLING_THRESHOLD:
+        total, current, following = 0, 1, 1
+        for _ in range(length):
+            total = (total + current) % modulus
+            current, following = following, (current + following) % modulus
+        return total
+    return (fibonacci_pair_mod(length + 2, modulus)[0] - 1) % modulus
+
+
+def generate_fibonacci_hash_modular(length_1: int, length_2: int, length_3: int) -> int:
+    """
+    The same hash as generate_fibonacci_hash using modular arithmetic, so no value
+    ever exceeds HASH_MODULUS^2.
+    """
+    return (
+        fibonacci_sum_mod(length_1)
+        + fibonacci_sum_mod(length_2)
+        + fibonacci_sum_mod(length_3)
+    ) % HASH_MODULUS
+
+
+HASH_IMPLEMENTATIONS = {
+    "reference": generate_fibonacci_hash,
+    "streaming": generate_fibonacci_hash_streaming,
+    "modular": generate_fibonacci_hash_modular,
+}
+
+
 if __name__ == "__main__":
+    # Usage: python examples/memory_example.py [reference | streaming | modular]
+    implementation = HASH_IMPLEMENTATIONS[sys.argv[1] if len(sys.argv) > 1 else "reference"]
+
     # DO NOT CHANGE
     LENGTH_OF_SEQUENCE_1 = 33333
     LENGTH_OF_SEQUENCE_2 = 30000
     LENGTH_OF_SEQUENCE_3 = 34567
     # DO NOT CHANGE
-    generate_fibonacci_hash(
+    implementation(
         LENGTH_OF_SEQUENCE_1, LENGTH_OF_SEQUENCE_2, LENGTH_OF_SEQUENCE_3
     )
\ No newline at end of file
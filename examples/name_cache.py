@@ -0,0 +1,183 @@
+"""
+A persistent, seeded, on-disk cache for generated name data sets.
+
+Generating fake names is slow and, without a seed, every run benchmarks
+against different data. The cache stores each data set once, keyed by
+(generator, size, seed), in a compact two file format:
+    <key>.offsets.npy: An int64 array of size + 1 byte offsets into the blob.
+    <key>.blob:        The UTF-8 encoded names, each followed by a newline.
+
+Later runs memory-map both files rather than regenerating the names.
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence
+
+import numpy as np
+
+from examples.types import NameFactory
+
+CACHE_DIR_ENV_VAR: str = "BENCHMARK_CACHE_DIR"
+DEFAULT_CACHE_DIR: Path = Path(__file__).resolve().parent.parent / ".benchmark_cache"
+SEPARATOR: bytes = b"\n"
+
+
+class CachedNames(Sequence[str]):
+    """
+    A read only, memory-mapped view of a cached data set of names.
+
+    Individual names are decoded on demand. Use to_list() to decode
+    the entire data set in one pass.
+
+    Pickling a CachedNames only pickles the file paths, so it can be handed
+    to worker processes which then map the same files.
+    """
+
+    def __init__(self, offsets_path: Path, blob_path: Path) -> None:
+        self._paths = (offsets_path, blob_path)
+        self._offsets: np.ndarray = np.load(offsets_path, mmap_mode="r")
+        # np.memmap refuses to map an empty file.
+        self._blob: np.ndarray | bytes = (
+            np.memmap(blob_path, dtype=np.uint8, mode="r")
+            if blob_path.stat().st_size > 0
+            else b""
+        )
+
+    def __reduce__(self):
+        return (CachedNames, self._paths)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("CachedNames index out of range")
+        start = int(self._offsets[index])
+        stop = int(self._offsets[index + 1]) - len(SEPARATOR)
+        return bytes(self._blob[start:stop]).decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.to_list())
+
+    def to_list(self, size: int | None = None) -> list[str]:
+        """
+        Decode the first size names (or all of them) into a list.
+
+        Because every name is newline terminated this is a single
+        decode and split rather than one decode per name.
+        """
+        count = len(self) if size is None else min(size, len(self))
+        if count == 0:
+            return []
+        stop = int(self._offsets[count]) - len(SEPARATOR)
+        return bytes(self._blob[:stop]).decode("utf-8").split("\n")
+
+
+class NameCache:
+    """
+    A directory of cached name data sets.
+
+    The directory defaults to .benchmark_cache in the project root and can be
+    overridden with the BENCHMARK_CACHE_DIR environment variable.
+    """
+
+    def __init__(self, directory: Path | str | None = None) -> None:
+        if directory is None:
+            directory = os.environ.get(CACHE_DIR_ENV_VAR, DEFAULT_CACHE_DIR)
+        self.directory = Path(directory)
+
+    def paths(self, generator: str, size: int, seed: int) -> tuple[Path, Path]:
+        """
+        Returns the (offsets, blob) file paths for a data set.
+        """
+        safe_generator = re.sub(r"[^A-Za-z0-9_.-]", "_", generator)
+        key = f"{safe_generator}-{size}-{seed}"
+        return (
+            self.directory / f"{key}.offsets.npy",
+            self.directory / f"{key}.blob",
+        )
+
+    def contains(self, generator: str, size: int, seed: int) -> bool:
+        offsets_path, blob_path = self.paths(generator, size, seed)
+        return offsets_path.exists() and blob_path.exists()
+
+    def load(
+        self, generator: str, size: int, seed: int, create: NameFactory
+    ) -> CachedNames:
+        """
+        Load a data set from the cache, creating it on a miss.
+
+        Parameters
+        generator: The name of the generator. Change it whenever the generator's output changes.
+        size: The number of names in the data set.
+        seed: The seed passed to the generator.
+        create: Called as create(size, seed) when the data set is not cached.
+        """
+        if not self.contains(generator, size, seed):
+            self.store(generator, size, seed, create(size, seed))
+        return CachedNames(*self.paths(generator, size, seed))
+
+    def store(
+        self, generator: str, size: int, seed: int, names: Sequence[str]
+    ) -> None:
+        """
+        Write a data set to the cache.
+        """
+        self.store_chunks(generator, size, seed, [names])
+
+    def store_chunks(
+        self, generator: str, size: int, seed: int, chunks: Iterable[Sequence[str]]
+    ) -> None:
+        """
+        Write a data set that arrives as a series of chunks to the cache.
+
+        Only one chunk is encoded at a time, so data sets that don't fit in
+        memory as Python strings can still be cached. The files are written
+        to temporary paths and then renamed so concurrent pytest processes
+        never see a partially written data set.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        offsets_path, blob_path = self.paths(generator, size, seed)
+        suffix = f".{os.getpid()}.tmp"
+        offsets_tmp = offsets_path.with_name(offsets_path.name + suffix)
+        blob_tmp = blob_path.with_name(blob_path.name + suffix)
+
+        try:
+            offsets = np.lib.format.open_memmap(
+                offsets_tmp, mode="w+", dtype=np.int64, shape=(size + 1,)
+            )
+            offsets[0] = 0
+            count = 0
+            with open(blob_tmp, "wb") as blob:
+                for chunk in chunks:
+                    # 1. Encode the chunk and calculate where each name ends.
+                    encoded = [name.encode("utf-8") + SEPARATOR for name in chunk]
+                    if any(SEPARATOR in name[: -len(SEPARATOR)] for name in encoded):
+                        raise ValueError("Names may not contain newlines.")
+                    if count + len(encoded) > size:
+                        raise ValueError(f"Received more than {size:,} names.")
+                    ends = np.cumsum([len(name) for name in encoded], dtype=np.int64)
+                    offsets[count + 1 : count + 1 + len(encoded)] = ends + offsets[count]
+                    count += len(encoded)
+
+                    # 2. Append the chunk to the blob.
+                    blob.write(b"".join(encoded))
+
+            if count != size:
+                raise ValueError(f"Expected {size:,} names but received {count:,}.")
+            offsets.flush()
+            del offsets
+        except BaseException:
+            offsets_tmp.unlink(missing_ok=True)
+            blob_tmp.unlink(missing_ok=True)
+            raise
+
+        # 3. Publish both files.
+        os.replace(blob_tmp, blob_path)
+        os.replace(offsets_tmp, offsets_path)
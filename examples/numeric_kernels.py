@@ -0,0 +1,341 @@
+"""
+Measure the throughput and accuracy of bulk money kernels across numeric types.
+
+Every backend runs the same three kernels over the same prices, which are
+whole cents, and quantities:
+  - sum: The total of the prices.
+  - dot: The total of price * quantity.
+  - round: The total of each price's tax at 8.875%, rounded half even to the cent.
+
+The backends:
+  - float: Pure Python floats.
+  - decimal: Decimal in the default context, 28 significant digits.
+  - decimal_prec12: Decimal in a context tuned down to 12 significant digits.
+    It's no faster, and large totals get rounded.
+  - fraction: Fraction, exact and slow.
+  - fixed: Integers scaled to cents, exact with integer arithmetic.
+  - numpy_float64: Vectorized float64.
+  - numpy_int64: Vectorized int64 cents, exact until the totals overflow 2^63.
+
+measure_kernels() reports the operations per second of each kernel and its
+drift, the absolute difference from the exact result in dollars.
+
+Usage:
+    python -m examples.numeric_kernels --sizes 10000 1000000 --skip fraction
+"""
+
+import argparse
+import decimal
+import time
+import timeit
+from dataclasses import dataclass
+from decimal import Decimal
+from fractions import Fraction
+from typing import Any, Callable, Iterable, Sequence
+
+import numpy as np
+
+from examples.types import TimeInNS
+
+KERNELS: tuple[str, ...] = ("sum", "dot", "round")
+
+# The tax rate, 8.875%, as an exact ratio.
+RATE_NUMERATOR: int = 8_875
+RATE_DENOMINATOR: int = 10_000_000  # Per cent, so the result is in cents.
+CENTS: int = 100
+
+
+@dataclass
+class MoneyData:
+    """
+    Prices in whole cents and integer quantities.
+    """
+
+    cents: np.ndarray
+    quantities: np.ndarray
+
+
+def generate_money(size: int, seed: int = 0) -> MoneyData:
+    rng = np.random.default_rng(seed)
+    return MoneyData(
+        rng.integers(1, 100_000, size=size, dtype=np.int64),
+        rng.integers(1, 100, size=size, dtype=np.int64),
+    )
+
+
+def _round_half_even(numerator: int, denominator: int) -> int:
+    quotient, remainder = divmod(numerator, denominator)
+    if remainder * 2 > denominator or (remainder * 2 == denominator and quotient % 2):
+        quotient += 1
+    return quotient
+
+
+def exact_results(data: MoneyData) -> dict[str, Fraction]:
+    """
+    The exact result of every kernel in dollars, from Python integers.
+    """
+    cents = data.cents.tolist()
+    quantities = data.quantities.tolist()
+    tax = sum(_round_half_even(cent * RATE_NUMERATOR, RATE_DENOMINATOR // CENTS) for cent in cents)
+    return {
+        "sum": Fraction(sum(cents), CENTS),
+        "dot": Fraction(sum(map(int.__mul__, cents, quantities)), CENTS),
+        "round": Fraction(tax, CENTS),
+    }
+
+
+@dataclass
+class NumericBackend:
+    name: str
+    prepare: Callable[[MoneyData], Any]  # Converts the data. Not timed.
+    kernels: dict[str, Callable[[Any], Any]]
+    to_fraction: Callable[[Any], Fraction]  # Converts a kernel's result, in dollars.
+
+
+def _float_backend() -> NumericBackend:
+    rate = RATE_NUMERATOR / RATE_DENOMINATOR * CENTS
+
+    def prepare(data: MoneyData) -> tuple[list[float], list[int]]:
+        return (data.cents / CENTS).tolist(), data.quantities.tolist()
+
+    return NumericBackend(
+        "float",
+        prepare,
+        {
+            "sum": lambda data: sum(data[0]),
+            "dot": lambda data: sum(price * quantity for price, quantity in zip(*data)),
+            "round": lambda data: sum(round(price * rate, 2) for price in data[0]),
+        },
+        Fraction,
+    )
+
+
+def _decimal_backend(name: str, context: decimal.Context) -> NumericBackend:
+    rate = Decimal(RATE_NUMERATOR) / Decimal(RATE_DENOMINATOR // CENTS)
+    cent = Decimal("0.01")
+
+    def prepare(data: MoneyData) -> tuple[list[Decimal], list[Decimal]]:
+        return (
+            [Decimal(value).scaleb(-2) for value in data.cents.tolist()],
+            [Decimal(value) for value in data.quantities.tolist()],
+        )
+
+    def in_context(kernel: Callable[[Any], Decimal]) -> Callable[[Any], Decimal]:
+        def run(data: Any) -> Decimal:
+            with decimal.localcontext(context):
+                return kernel(data)
+
+        return run
+
+    return NumericBackend(
+        name,
+        prepare,
+        {
+            "sum": in_context(lambda data: sum(data[0], Decimal(0))),
+            "dot": in_context(
+                lambda data: sum((price * quantity for price, quantity in zip(*data)), Decimal(0))
+            ),
+            "round": in_context(
+                lambda data: sum(
+                    ((price * rate).quantize(cent, decimal.ROUND_HALF_EVEN) for price in data[0]),
+                    Decimal(0),
+                )
+            ),
+        },
+        Fraction,
+    )
+
+
+def _fraction_backend() -> NumericBackend:
+    rate = Fraction(RATE_NUMERATOR, RATE_DENOMINATOR // CENTS)
+
+    def prepare(data: MoneyData) -> tuple[list[Fraction], list[int]]:
+        return [Fraction(value, CENTS) for value in data.cents.tolist()], data.quantities.tolist()
+
+    return NumericBackend(
+        "fraction",
+        prepare,
+        {
+            "sum": lambda data: sum(data[0], Fraction(0)),
+            "dot": lambda data: sum(
+                (price * quantity for price, quantity in zip(*data)), Fraction(0)
+            ),
+            # round() on a Fraction rounds half to even.
+            "round": lambda data: sum((round(price * rate, 2) for price in data[0]), Fraction(0)),
+        },
+        Fraction,
+    )
+
+
+def _fixed_backend() -> NumericBackend:
+    divisor = RATE_DENOMINATOR // CENTS
+
+    def prepare(data: MoneyData) -> tuple[list[int], list[int]]:
+        return data.cents.tolist(), data.quantities.tolist()
+
+    return NumericBackend(
+        "fixed",
+        prepare,
+        {
+            "sum": lambda data: sum(data[0]),
+            "dot": lambda data: sum(map(int.__mul__, *data)),
+            "round": lambda data: sum(
+                _round_half_even(cent * RATE_NUMERATOR, divisor) for cent in data[0]
+            ),
+        },
+        lambda result: Fraction(result, CENTS),
+    )
+
+
+def _numpy_float_backend() -> NumericBackend:
+    rate = RATE_NUMERATOR / RATE_DENOMINATOR * CENTS
+
+    def prepare(data: MoneyData) -> tuple[np.ndarray, np.ndarray]:
+        return data.cents / CENTS, data.quantities.astype(np.float64)
+
+    return NumericBackend(
+        "numpy_float64",
+        prepare,
+        {
+            "sum": lambda data: data[0].sum(),
+            "dot": lambda data: data[0] @ data[1],
+            # np.round rounds half to even.
+            "round": lambda data: np.round(data[0] * rate, 2).sum(),
+        },
+        lambda result: Fraction(float(result)),
+    )
+
+
+def round_half_even(numerators: np.ndarray, denominator: int) -> np.ndarray:
+    """
+    Vectorized integer division rounded half to even.
+    """
+    quotients, remainders = np.divmod(numerators, denominator)
+    twice = remainders * 2
+    return quotients + ((twice > denominator) | ((twice == denominator) & (quotients % 2 == 1)))
+
+
+def _numpy_int_backend() -> NumericBackend:
+    divisor = RATE_DENOMINATOR // CENTS
+
+    def prepare(data: MoneyData) -> tuple[np.ndarray, np.ndarray]:
+        return data.cents, data.quantities
+
+    return NumericBackend(
+        "numpy_int64",
+        prepare,
+        {
+            "sum": lambda data: data[0].sum(),
+            "dot": lambda data: data[0] @ data[1],
+            "round": lambda data: round_half_even(data[0] * RATE_NUMERATOR, divisor).sum(),
+        },
+        lambda result: Fraction(int(result), CENTS),
+    )
+
+
+BACKENDS: dict[str, NumericBackend] = {
+    backend.name: backend
+    for backend in (
+        _float_backend(),
+        _decimal_backend("decimal", decimal.Context()),
+        _decimal_backend("decimal_prec12", decimal.Context(prec=12)),
+        _fraction_backend(),
+        _fixed_backend(),
+        _numpy_float_backend(),
+        _numpy_int_backend(),
+    )
+}
+
+
+@dataclass
+class KernelMeasurement:
+    backend: str
+    kernel: str
+    size: int
+    time: TimeInNS  # The fastest run over all the values.
+    drift: float  # The absolute error in dollars.
+
+    @property
+    def ops_per_second(self) -> float:
+        return self.size / self.time * 1e9 if self.time else float("inf")
+
+
+def drift(backend: NumericBackend, result: Any, exact: Fraction) -> float:
+    return float(abs(backend.to_fraction(result) - exact))
+
+
+def measure_kernels(
+    sizes: Iterable[int],
+    backends: Iterable[str] = BACKENDS,
+    kernels: Iterable[str] = KERNELS,
+    repeat: int = 3,
+    seed: int = 0,
+) -> list[KernelMeasurement]:
+    """
+    Measure every kernel of every backend at every size.
+
+    Parameters
+    repeat: Each kernel is run repeat times and the fastest is kept.
+    """
+    kernels = list(kernels)
+    backends = list(backends)
+    measurements: list[KernelMeasurement] = []
+    for size in sizes:
+        data = generate_money(size, seed)
+        exact = exact_results(data)
+        for name in backends:
+            backend = BACKENDS[name]
+            prepared = backend.prepare(data)
+            for kernel_name in kernels:
+                kernel = backend.kernels[kernel_name]
+                result = kernel(prepared)
+                timer = timeit.Timer(
+                    "kernel(prepared)",
+                    globals={"kernel": kernel, "prepared": prepared},
+                    timer=time.perf_counter_ns,
+                )
+                measurements.append(
+                    KernelMeasurement(
+                        name,
+                        kernel_name,
+                        size,
+                        min(timer.repeat(repeat=repeat, number=1)),
+                        drift(backend, result, exact[kernel_name]),
+                    )
+                )
+    return measurements
+
+
+def kernel_report(measurements: Sequence[KernelMeasurement]) -> str:
+    header_fmt = "{:<16} {:<8} {:>12} {:>16} {:>14}"
+    row_fmt = "{:<16} {:<8} {:>12,} {:>16,.0f} {:>14.3g}"
+    lines = [header_fmt.format("Backend", "Kernel", "Size", "Ops/Second", "Drift ($)")]
+    ordered = sorted(measurements, key=lambda m: (m.size, KERNELS.index(m.kernel)))
+    for measurement in ordered:
+        lines.append(
+            row_fmt.format(
+                measurement.backend,
+                measurement.kernel,
+                measurement.size,
+                measurement.ops_per_second,
+                measurement.drift,
+            )
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000])
+    parser.add_argument("--skip", nargs="*", choices=list(BACKENDS), default=[])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=2024)
+    args = parser.parse_args(argv)
+
+    backends = [name for name in BACKENDS if name not in args.skip]
+    measurements = measure_kernels(args.sizes, backends, repeat=args.repeat, seed=args.seed)
+    print(kernel_report(measurements))
+
+
+if __name__ == "__main__":
+    main()
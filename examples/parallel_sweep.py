@@ -0,0 +1,140 @@
+"""
+Run the list vs set membership sweep across a pool of worker processes.
+
+Each sample size is an independent task, so a sweep over many sizes can be
+spread across every core. The master data set is handed to the workers once,
+when the pool starts, as a memory-mapped CachedNames. Only its file paths
+are pickled, so no task ever ships 100k strings between processes.
+"""
+
+import multiprocessing
+import os
+import time
+import timeit
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.queues import Queue
+from typing import Sequence
+
+from examples.name_cache import CachedNames
+
+# Per process state, populated by _init_worker.
+_worker_names: CachedNames | None = None
+_worker_missing_person: str = ""
+
+
+def time_membership(
+    names: Sequence[str], missing_person: str, num_iterations: int
+) -> tuple[float, float]:
+    """
+    Measure a worst case lookup in a list and in a set of the names.
+
+    Returns
+    The average (list, set) search time in nanoseconds.
+    """
+    samples_list = list(names)
+    samples_set = set(samples_list)
+    scope = {
+        "missing_person": missing_person,
+        "samples_list": samples_list,
+        "samples_set": samples_set,
+    }
+
+    search_list_timer = timeit.Timer(
+        stmt="assert missing_person not in samples_list",
+        globals=scope,
+        timer=time.perf_counter_ns,
+    )
+    search_set_timer = timeit.Timer(
+        stmt="assert missing_person not in samples_set",
+        globals=scope,
+        timer=time.perf_counter_ns,
+    )
+
+    total_search_list_time = search_list_timer.timeit(number=num_iterations)
+    total_search_set_time = search_set_timer.timeit(number=num_iterations)
+    return (
+        total_search_list_time / num_iterations,
+        total_search_set_time / num_iterations,
+    )
+
+
+def _init_worker(
+    names: CachedNames, missing_person: str, cpu_queue: Queue | None
+) -> None:
+    global _worker_names, _worker_missing_person
+    _worker_names = names
+    _worker_missing_person = missing_person
+    if cpu_queue is not None:
+        os.sched_setaffinity(0, {cpu_queue.get()})
+
+
+def _time_size(size: int, num_iterations: int) -> tuple[float, float]:
+    return time_membership(
+        _worker_names.to_list(size), _worker_missing_person, num_iterations
+    )
+
+
+def available_cpus() -> list[int]:
+    """
+    Returns the CPUs this process is allowed to run on.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def parallel_sweep(
+    names: CachedNames,
+    sizes: Sequence[int],
+    missing_person: str,
+    num_iterations: int,
+    workers: int | None = None,
+    pin_cpus: bool = False,
+) -> list[tuple[float, float]]:
+    """
+    Time list and set membership for every sample size using a process pool.
+
+    Parameters
+    names: The master data set. Each size uses the first size names.
+    sizes: The sample sizes to benchmark. Each size is one task.
+    missing_person: A name that is not in the data set.
+    num_iterations: The number of lookups to average per size.
+    workers: The number of worker processes. Defaults to one per available CPU.
+    pin_cpus: Pin each worker to its own CPU. Only supported on Linux.
+
+    Returns
+    A list of (avg_list_search_time, avg_set_search_time) tuples in the
+    same order as sizes.
+    """
+    cpus = available_cpus()
+    workers = workers or len(cpus)
+
+    # Spawn fresh workers rather than forking the (possibly multi-threaded)
+    # parent process and inheriting its heap.
+    context = multiprocessing.get_context("spawn")
+
+    cpu_queue: Queue | None = None
+    if pin_cpus:
+        if not hasattr(os, "sched_setaffinity"):
+            raise RuntimeError("CPU pinning is not supported on this platform.")
+        if workers > len(cpus):
+            raise ValueError(
+                f"Cannot pin {workers} workers to {len(cpus)} available CPUs."
+            )
+        cpu_queue = context.Queue()
+        for cpu in cpus[:workers]:
+            cpu_queue.put(cpu)
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(names, missing_person, cpu_queue),
+    ) as executor:
+        # map() yields results in the order of sizes, regardless of
+        # which worker finishes first.
+        return list(
+            executor.map(
+                _time_size, sizes, [num_iterations] * len(sizes), chunksize=1
+            )
+        )
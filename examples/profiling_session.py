@@ -0,0 +1,717 @@
+"""
+Profile a test or script with several profilers and merge their hotspots.
+
+Each profiler answers a different question and writes its own format:
+  - cProfile: The calls, self time and cumulative time of every function.
+  - pyinstrument: The same times from sampling, without cProfile's per call overhead.
+  - scalene: How much of each function's time is in Python, native code or the system.
+  - line_profiler: The time of each line of the hottest functions.
+  - memray: The memory each function held at the run's peak.
+
+profile_target() runs the target once per profiler, each in a fresh process
+so the profilers don't measure each other, then normalizes their output into
+one row per function. Rows are matched by file and first line. Unless
+functions are named with --lines, line_profiler profiles the project functions
+with the most cProfile self time.
+
+scalene only samples the CPU. Its memory profiling replaces the allocator and
+hangs targets that trace allocations themselves, e.g. with tracemalloc, and
+memray already measures the memory.
+
+The target is a pytest node ID, a script and its arguments, or -m and a module.
+
+Usage:
+    python -m examples.profiling_session examples/memory_example.py streaming
+    python -m examples.profiling_session --profilers cprofile,memray --sort memory \\
+        --json hotspots.json tests/memory_test.py::test_fibonacci_hash_time_and_peak_memory
+"""
+
+import argparse
+import ast
+import cProfile
+import functools
+import importlib.util
+import json
+import os
+import pstats
+import re
+import subprocess
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Sequence
+
+from examples import line_profiling
+from examples.line_profiling import LineHotspot, LineProfilingSession, hotspots, resolve_target
+from examples.types import TimeInSec
+
+# In the order they run. line_profiler reads cProfile's results.
+PROFILERS: tuple[str, ...] = ("cprofile", "pyinstrument", "scalene", "line_profiler", "memray")
+SUFFIXES: dict[str, str] = {
+    "cprofile": ".prof",
+    "pyinstrument": ".pyisession",
+    "scalene": ".json",
+    "line_profiler": ".lprof",
+    "memray": ".bin",
+}
+# The metrics a report can be ranked by. Each falls back to the next when missing.
+SORT_KEYS: dict[str, tuple[str, ...]] = {
+    "self": ("self_time", "sampled_self_time"),
+    "cumulative": ("cumulative_time", "sampled_time"),
+    "sampled": ("sampled_self_time", "sampled_time"),
+    "python": ("python_time",),
+    "native": ("native_time",),
+    "memory": ("peak_memory", "peak_memory_self"),
+    "memory_self": ("peak_memory_self",),
+}
+DEFAULT_LINE_FUNCTIONS: int = 3
+DEFAULT_TOP: int = 20
+PYINSTRUMENT_INTERVAL: TimeInSec = 0.001
+
+
+@dataclass
+class FunctionCost:
+    """
+    One function's costs, as seen by each of the profilers that ran.
+    """
+
+    function: str  # The qualified name, e.g. Class.method, when the source is available.
+    filename: str
+    line: int  # The first line of the function.
+    calls: int | None = None
+    self_time: TimeInSec | None = None  # From cProfile.
+    cumulative_time: TimeInSec | None = None  # From cProfile.
+    sampled_self_time: TimeInSec | None = None  # From pyinstrument.
+    sampled_time: TimeInSec | None = None  # From pyinstrument.
+    python_time: TimeInSec | None = None  # From scalene, in the function's own lines.
+    native_time: TimeInSec | None = None  # From scalene, in native code its lines called.
+    system_time: TimeInSec | None = None  # From scalene, in the system calls its lines made.
+    peak_memory: int | None = None  # Bytes held at the peak by the function and its callees.
+    peak_memory_self: int | None = None  # Bytes held at the peak by the function itself.
+    line_hotspots: list[LineHotspot] = field(default_factory=list)
+    profilers: list[str] = field(default_factory=list)
+
+    @property
+    def key(self) -> tuple[str, int, str]:
+        return (self.filename, self.line, self.function)
+
+    def cost(self, sort: str) -> float:
+        for metric in SORT_KEYS[sort]:
+            if (value := getattr(self, metric)) is not None:
+                return value
+        return -1
+
+
+@dataclass
+class HotspotReport:
+    target: list[str]
+    profilers: list[str]
+    outputs: dict[str, str]  # The raw output of each profiler.
+    functions: list[FunctionCost]
+
+    def ranked(self, sort: str = "self") -> list[FunctionCost]:
+        return sorted(self.functions, key=lambda function: function.cost(sort), reverse=True)
+
+    def to_json(self, sort: str = "self") -> str:
+        report = asdict(self)
+        report["functions"] = [asdict(function) for function in self.ranked(sort)]
+        return json.dumps(report, indent=2)
+
+
+@functools.cache
+def _definitions(filename: str) -> tuple[tuple[int, int, str], ...]:
+    """
+    The (first line, last line, qualified name) of every function in a source file.
+    The first line includes any decorators, like a code object's co_firstlineno.
+    """
+    try:
+        tree = ast.parse(Path(filename).read_text(), filename)
+    except (OSError, SyntaxError, ValueError):
+        return ()
+    definitions: list[tuple[int, int, str]] = []
+
+    def visit(node: ast.AST, prefix: str) -> None:
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                decorators = [decorator.lineno for decorator in child.decorator_list]
+                first = min([child.lineno, *decorators])
+                definitions.append((first, child.end_lineno or first, prefix + child.name))
+                visit(child, f"{prefix}{child.name}.<locals>.")
+            elif isinstance(child, ast.ClassDef):
+                visit(child, f"{prefix}{child.name}.")
+            else:
+                visit(child, prefix)
+
+    visit(tree, "")
+    return tuple(definitions)
+
+
+def normalize(filename: str, line: int, function: str, exact: bool = True) -> tuple[str, int, str]:
+    """
+    Identify a function the same way across the profilers.
+
+    Parameters
+    line: The function's first line, or with exact=False any line in it, e.g. from memray.
+
+    Returns
+    The resolved filename, first line and qualified name.
+    """
+    if not os.path.isfile(filename):
+        return filename, line, function
+    filename = str(Path(filename).resolve())
+    enclosing = [
+        definition
+        for definition in _definitions(filename)
+        if (definition[0] == line if exact else definition[0] <= line <= definition[1])
+    ]
+    if not enclosing:
+        return filename, 1 if function == "<module>" else line, function
+    # The innermost definition starts last.
+    first, _, qualified = max(enclosing)
+    return filename, first, qualified
+
+
+def module_name(filename: str, root: Path | str) -> str | None:
+    """
+    The dotted module name of a file under the root, e.g. examples.memory_example.
+    """
+    try:
+        relative = Path(filename).resolve().relative_to(Path(root).resolve())
+    except ValueError:
+        return None
+    if (
+        relative.suffix != ".py"
+        or "site-packages" in relative.parts
+        or relative.parts[0].startswith(".")
+    ):
+        return None
+    return ".".join(relative.with_suffix("").parts)
+
+
+def _builtin_name(function: str) -> str:
+    """
+    Name a cProfile built-in like pyinstrument does, e.g. <built-in method time.sleep>
+    is sleep and <method 'append' of 'list' objects> is list.append.
+    """
+    if match := re.fullmatch(r"<built-in method (?:[\w.]+\.)?(\w+)>", function):
+        return match[1]
+    if match := re.fullmatch(r"<method '(\w+)' of '([\w.]+)' objects>", function):
+        return f"{match[2].rpartition('.')[2]}.{match[1]}"
+    return function
+
+
+def read_cprofile(path: Path | str) -> list[FunctionCost]:
+    functions: list[FunctionCost] = []
+    stats: dict[Any, Any] = pstats.Stats(str(path)).stats  # type: ignore[attr-defined]
+    for (filename, line, function), (_, calls, self_time, cumulative_time, _) in stats.items():
+        if filename == "~":
+            filename, function = "<built-in>", _builtin_name(function)
+        filename, line, function = normalize(filename, line, function)
+        functions.append(
+            FunctionCost(
+                function,
+                filename,
+                line,
+                calls=calls,
+                self_time=self_time,
+                cumulative_time=cumulative_time,
+                profilers=["cprofile"],
+            )
+        )
+    return functions
+
+
+def read_pyinstrument(path: Path | str) -> list[FunctionCost]:
+    from pyinstrument.session import Session
+
+    functions: dict[tuple[str, int, str], FunctionCost] = {}
+
+    def visit(frame: Any, active: frozenset) -> None:
+        if frame.is_synthetic:
+            return
+        name = f"{frame.class_name}.{frame.function}" if frame.class_name else frame.function
+        key = normalize(frame.file_path or "<unknown>", frame.line_no or 0, name)
+        function = functions.setdefault(
+            key,
+            FunctionCost(
+                key[2],
+                key[0],
+                key[1],
+                sampled_self_time=0.0,
+                sampled_time=0.0,
+                profilers=["pyinstrument"],
+            ),
+        )
+        function.sampled_self_time = (function.sampled_self_time or 0.0) + frame.total_self_time
+        if key not in active:
+            # Count recursive calls once.
+            function.sampled_time = (function.sampled_time or 0.0) + frame.time
+        for child in frame.children:
+            visit(child, active | {key})
+
+    root = Session.load(str(path)).root_frame()
+    if root is not None:
+        visit(root, frozenset())
+    return list(functions.values())
+
+
+def read_scalene(path: Path | str) -> list[FunctionCost]:
+    """
+    Convert scalene's shares of the elapsed time into seconds.
+    """
+    path = Path(path)
+    # scalene writes nothing, or an empty profile, when the run is too short to sample.
+    profile = json.loads(path.read_text() or "{}") if path.exists() else {}
+    elapsed: TimeInSec = profile.get("elapsed_time_sec", 0.0)
+    functions: dict[tuple[str, int, str], FunctionCost] = {}
+    for filename, file_profile in profile.get("files", {}).items():
+        for row in file_profile["functions"]:
+            # The line is the def, after any decorators.
+            key = normalize(filename, row["lineno"], row["line"], exact=False)
+            function = functions.setdefault(
+                key,
+                FunctionCost(
+                    key[2],
+                    key[0],
+                    key[1],
+                    python_time=0.0,
+                    native_time=0.0,
+                    system_time=0.0,
+                    profilers=["scalene"],
+                ),
+            )
+            function.python_time = (function.python_time or 0.0) + (
+                row["n_cpu_percent_python"] / 100 * elapsed
+            )
+            function.native_time = (function.native_time or 0.0) + (
+                row["n_cpu_percent_c"] / 100 * elapsed
+            )
+            function.system_time = (function.system_time or 0.0) + (
+                row["n_sys_percent"] / 100 * elapsed
+            )
+    return list(functions.values())
+
+
+def read_line_profile(path: Path | str) -> dict[tuple[str, int, str], list[LineHotspot]]:
+    from line_profiler.line_profiler import LineStats
+
+    stats = LineStats.from_files(path)
+    lines: dict[tuple[str, int, str], list[LineHotspot]] = {}
+    for (filename, line, function), timings in stats.timings.items():
+        key = normalize(filename, line, function)
+        single = type(stats)({(filename, line, function): timings}, stats.unit)
+        lines[key] = hotspots(single, top=None)
+    return lines
+
+
+def read_memray(path: Path | str) -> list[FunctionCost]:
+    """
+    Attribute the memory held at the high water mark to the functions on each allocation's stack.
+    """
+    import memray
+
+    functions: dict[tuple[str, int, str], FunctionCost] = {}
+    with memray.FileReader(str(path)) as reader:
+        records = list(reader.get_high_watermark_allocation_records(merge_threads=True))
+    for record in records:
+        stack = [
+            normalize(filename, line, function, exact=False)
+            for function, filename, line in record.stack_trace()
+        ]
+        for depth, key in enumerate(dict.fromkeys(stack)):
+            function = functions.setdefault(
+                key,
+                FunctionCost(
+                    key[2], key[0], key[1], peak_memory=0, peak_memory_self=0, profilers=["memray"]
+                ),
+            )
+            function.peak_memory = (function.peak_memory or 0) + record.size
+            if depth == 0:
+                function.peak_memory_self = (function.peak_memory_self or 0) + record.size
+    return list(functions.values())
+
+
+def merge(*costs: Sequence[FunctionCost]) -> list[FunctionCost]:
+    """
+    Combine the rows of several profilers, keeping every metric any of them measured.
+    """
+    merged: dict[tuple[str, int, str], FunctionCost] = {}
+    for rows in costs:
+        for row in rows:
+            if row.key not in merged:
+                merged[row.key] = FunctionCost(row.function, row.filename, row.line)
+            function = merged[row.key]
+            for metric in (
+                "calls",
+                "self_time",
+                "cumulative_time",
+                "sampled_self_time",
+                "sampled_time",
+                "python_time",
+                "native_time",
+                "system_time",
+                "peak_memory",
+                "peak_memory_self",
+            ):
+                if (value := getattr(row, metric)) is not None:
+                    setattr(function, metric, (getattr(function, metric) or 0) + value)
+            function.line_hotspots.extend(row.line_hotspots)
+            function.profilers.extend(
+                name for name in row.profilers if name not in function.profilers
+            )
+    return list(merged.values())
+
+
+def hottest_functions(functions: Sequence[FunctionCost], root: Path | str, count: int) -> list[str]:
+    """
+    The dotted names of the project functions with the most self time, for line_profiler.
+    """
+    names: list[str] = []
+    for function in sorted(functions, key=lambda function: function.cost("self"), reverse=True):
+        module = module_name(function.filename, root)
+        if module is None or "<" in function.function or function.function.startswith("test"):
+            continue
+        names.append(f"{module}.{function.function}")
+        if len(names) == count:
+            break
+    return names
+
+
+def target_kind(target: Sequence[str]) -> str:
+    """
+    Is the target a "pytest" node ID, a "script" or a "module"?
+    """
+    if not target:
+        raise ValueError("Expected a pytest node ID, a script or -m and a module to profile.")
+    if target[0] == "-m":
+        if len(target) < 2:
+            raise ValueError("Expected a module after -m.")
+        return "module"
+    path = target[0].partition("::")[0]
+    name = Path(path).name
+    if (
+        "::" in target[0]
+        or name.startswith("test_")
+        or name.endswith("_test.py")
+        or Path(path).is_dir()
+    ):
+        return "pytest"
+    if name.endswith(".py"):
+        return "script"
+    raise ValueError(
+        f"Can't tell how to run {target[0]!r}. Expected a test, a .py file or -m module."
+    )
+
+
+def target_runner(
+    target: Sequence[str],
+    pytest_arguments: Sequence[str] = (),
+    line_profiling: LineProfilingSession | None = None,
+) -> Callable[[], Any]:
+    """
+    Prepare to run the target in this process, like python or pytest would.
+    Compiling happens here, so the profilers only see the target run.
+
+    Parameters
+    pytest_arguments: Extra arguments for a pytest target.
+    line_profiling: Line profile the target functions defined in a script or module target.
+    """
+    kind = target_kind(target)
+    if kind == "pytest":
+        import pytest
+
+        arguments = [*target, "-p", "no:cacheprovider", "-q", *pytest_arguments]
+        return functools.partial(pytest.main, arguments)
+
+    package = None
+    if kind == "module":
+        spec = importlib.util.find_spec(target[1])
+        if spec is not None and spec.submodule_search_locations is not None:
+            spec = importlib.util.find_spec(f"{target[1]}.__main__")
+        if spec is None or spec.origin is None:
+            raise ValueError(f"Can't find the module {target[1]!r}.")
+        filename, argv, search_path = spec.origin, [spec.origin, *target[2:]], os.getcwd()
+        package = spec.parent
+    else:
+        filename, argv = target[0], list(target)
+        search_path = str(Path(filename).resolve().parent)
+    # Compile the code here, rather than with runpy, so line_profiler can find its functions.
+    code = compile(Path(filename).read_text(), str(Path(filename).resolve()), "exec")
+    if line_profiling is not None:
+        line_profiling.instrument_code(code)
+
+    def run() -> None:
+        main_module = ModuleType("__main__")
+        main_module.__file__ = filename
+        main_module.__package__ = package
+        saved_argv, saved_path, saved_main = sys.argv, list(sys.path), sys.modules["__main__"]
+        sys.argv, sys.modules["__main__"] = argv, main_module
+        sys.path.insert(0, search_path)
+        if line_profiling is not None:
+            line_profiling.profiler.enable_by_count()
+        try:
+            exec(code, main_module.__dict__)
+        except SystemExit:
+            pass
+        finally:
+            if line_profiling is not None:
+                line_profiling.profiler.disable_by_count()
+            sys.argv, sys.path[:], sys.modules["__main__"] = saved_argv, saved_path, saved_main
+
+    return run
+
+
+def run_profiler(
+    profiler: str, output: Path | str, target: Sequence[str], lines: Sequence[str] = ()
+) -> None:
+    """
+    Run the target under one profiler and save its raw output.
+    """
+    output = Path(output)
+    output.unlink(missing_ok=True)
+    if profiler == "cprofile":
+        run = target_runner(target)
+        profile = cProfile.Profile()
+        profile.runcall(run)
+        profile.dump_stats(output)
+    elif profiler == "pyinstrument":
+        from pyinstrument import Profiler
+
+        run = target_runner(target)
+        sampler = Profiler(interval=PYINSTRUMENT_INTERVAL)
+        sampler.start()
+        try:
+            run()
+        finally:
+            session = sampler.stop()
+        session.save(str(output))
+    elif profiler == "scalene":
+        # scalene preloads its own library, so it has to start the process.
+        kind = target_kind(target)
+        if kind == "pytest":
+            program = ["-m", "pytest", "---", *target, "-p", "no:cacheprovider", "-q"]
+        elif kind == "module":
+            program = ["-m", target[1], "---", *target[2:]]
+        else:
+            program = [target[0], "---", *target[1:]]
+        command = [sys.executable, "-m", "scalene", "run", "--cpu-only", "--outfile", str(output)]
+        command += ["--cpu-percent-threshold", "0", "--program-path", os.getcwd()]
+        subprocess.run([*command, *program], check=True)
+    elif profiler == "line_profiler":
+        if target_kind(target) == "pytest":
+            # pytest's assertion rewriter must import the test modules, so use the plugin.
+            arguments = ["-p", "examples.line_profiling", f"--line-profile-output={output}"]
+            target_runner(target, [*arguments, *(f"--line-profile={name}" for name in lines)])()
+            return
+        line_profiling = LineProfilingSession([resolve_target(name) for name in lines])
+        line_profiling.install()
+        try:
+            target_runner(target, line_profiling=line_profiling)()
+        finally:
+            line_profiling.uninstall()
+        line_profiling.profiler.dump_stats(output)
+    elif profiler == "memray":
+        import memray
+
+        run = target_runner(target)
+        with memray.Tracker(output):
+            run()
+    else:
+        raise ValueError(f"Unknown profiler {profiler}. Expected one of {PROFILERS}.")
+
+
+def spawn_profiler(
+    profiler: str, output: Path, target: Sequence[str], lines: Sequence[str] = ()
+) -> None:
+    """
+    Run the target under one profiler in a fresh process. If it fails, raise
+    a ValueError with the last line of its error output.
+    """
+    command = [sys.executable, "-m", "examples.profiling_session", "--worker", profiler]
+    command += ["--worker-output", str(output)]
+    command += [f"--lines={name}" for name in lines]
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join([os.getcwd(), *sys.path]))
+    process = subprocess.run(
+        [*command, "--", *target],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        env=environment,
+    )
+    if process.returncode != 0:
+        errors = process.stderr.strip().splitlines()
+        reason = errors[-1] if errors else f"exit status {process.returncode}"
+        raise ValueError(f"Running the target under {profiler} failed: {reason}")
+    sys.stderr.write(process.stderr)
+
+
+def _without_harness(functions: Sequence[FunctionCost]) -> list[FunctionCost]:
+    """
+    Drop the functions of the session itself, e.g. run_target.
+    """
+    harness = {str(Path(__file__).resolve()), str(Path(line_profiling.__file__).resolve())}
+    return [function for function in functions if function.filename not in harness]
+
+
+def profile_target(
+    target: Sequence[str],
+    profilers: Sequence[str] = PROFILERS,
+    directory: Path | str = "./profiling_output",
+    lines: Sequence[str] = (),
+    line_functions: int = DEFAULT_LINE_FUNCTIONS,
+) -> HotspotReport:
+    """
+    Run the target under each profiler and merge their results.
+
+    Parameters
+    target: A pytest node ID, a script and its arguments, or ["-m", module, *arguments].
+    profilers: Any of PROFILERS.
+    directory: Where to save the raw output of each profiler.
+    lines: The dotted names of the functions to line profile. By default, the
+        line_functions project functions with the most cProfile self time.
+    """
+    target_kind(target)
+    if unknown := set(profilers) - set(PROFILERS):
+        raise ValueError(f"Unknown profilers {sorted(unknown)}. Expected some of {PROFILERS}.")
+    if "line_profiler" in profilers and not lines and "cprofile" not in profilers:
+        raise ValueError("Name the functions to line profile, or also run cprofile to pick them.")
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    name = re.sub(r"\W+", "_", " ".join(target)).strip("_")[:80] or "profile"
+    outputs: dict[str, str] = {}
+    costs: list[list[FunctionCost]] = []
+    for profiler in (profiler for profiler in PROFILERS if profiler in profilers):
+        output = directory / f"{name}{SUFFIXES[profiler]}"
+        if profiler == "line_profiler":
+            lines = lines or hottest_functions(
+                _without_harness(merge(*costs)), os.getcwd(), line_functions
+            )
+            if not lines:
+                continue
+        spawn_profiler(profiler, output, target, lines if profiler == "line_profiler" else ())
+        outputs[profiler] = str(output)
+        if profiler == "cprofile":
+            costs.append(read_cprofile(output))
+        elif profiler == "pyinstrument":
+            costs.append(read_pyinstrument(output))
+        elif profiler == "scalene":
+            costs.append(read_scalene(output))
+        elif profiler == "line_profiler":
+            costs.append(
+                [
+                    FunctionCost(
+                        key[2], key[0], key[1], line_hotspots=line_hotspots, profilers=[profiler]
+                    )
+                    for key, line_hotspots in read_line_profile(output).items()
+                ]
+            )
+        else:
+            costs.append(read_memray(output))
+    return HotspotReport(list(target), list(outputs), outputs, _without_harness(merge(*costs)))
+
+
+def _format_time(value: TimeInSec | None) -> str:
+    return "-" if value is None else f"{value:,.4f}"
+
+
+def _format_bytes(value: int | None) -> str:
+    if value is None:
+        return "-"
+    for unit in ("B", "KiB", "MiB"):
+        if value < 1024:
+            return f"{value:,.0f} {unit}" if unit == "B" else f"{value:,.1f} {unit}"
+        value /= 1024  # type: ignore[assignment]
+    return f"{value:,.1f} GiB"
+
+
+def hotspot_table(report: HotspotReport, sort: str = "self", top: int | None = DEFAULT_TOP) -> str:
+    header_fmt = "{:>4} {:<56} {:>10} {:>10} {:>10} {:>10} {:>10} {:>11}  {}"
+    lines = [
+        f"Target: {' '.join(report.target)}",
+        f"Profilers: {', '.join(report.profilers)}. Ranked by {sort}.",
+        header_fmt.format(
+            "Rank",
+            "Function",
+            "Calls",
+            "Self (s)",
+            "Cum (s)",
+            "Sampled",
+            "Native",
+            "Peak Mem",
+            "Hot Line",
+        ),
+    ]
+    root = Path.cwd()
+    for rank, function in enumerate(report.ranked(sort)[:top], start=1):
+        filename = Path(function.filename)
+        location = filename.relative_to(root) if filename.is_relative_to(root) else filename.name
+        label = f"{location}:{function.line}({function.function})"
+        hottest = max(function.line_hotspots, key=lambda hotspot: hotspot.time, default=None)
+        lines.append(
+            header_fmt.format(
+                rank,
+                label if len(label) <= 56 else "..." + label[-53:],
+                "-" if function.calls is None else f"{function.calls:,}",
+                _format_time(function.self_time),
+                _format_time(function.cumulative_time),
+                _format_time(function.sampled_time),
+                _format_time(function.native_time),
+                _format_bytes(function.peak_memory),
+                "" if hottest is None else f"L{hottest.line} {hottest.share:.0%}: {hottest.source}",
+            )
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--profilers",
+        default=",".join(PROFILERS),
+        help="A comma separated list of profilers to run. Default: %(default)s",
+    )
+    parser.add_argument(
+        "--lines", action="append", default=[], help="A dotted function name to line profile."
+    )
+    parser.add_argument(
+        "--line-functions",
+        type=int,
+        default=DEFAULT_LINE_FUNCTIONS,
+        help="Without --lines, line profile this many of the hottest functions. "
+        "Default: %(default)s",
+    )
+    parser.add_argument("--sort", choices=list(SORT_KEYS), default="self")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP)
+    parser.add_argument("--output-directory", default="./profiling_output")
+    parser.add_argument("--json", help="Also save the merged report to this file.")
+    parser.add_argument("--worker", choices=PROFILERS, help=argparse.SUPPRESS)
+    parser.add_argument("--worker-output", help=argparse.SUPPRESS)
+    parser.add_argument("-m", dest="module", help="Profile a module run as a script.")
+    parser.add_argument(
+        "target", nargs=argparse.REMAINDER, help="A pytest node ID, or a script and its arguments."
+    )
+    args = parser.parse_args(argv)
+    target = args.target[1:] if args.target[:1] == ["--"] else args.target
+    if args.module:
+        target = ["-m", args.module, *target]
+
+    if args.worker:
+        run_profiler(args.worker, args.worker_output, target, args.lines)
+        return
+
+    profilers = [profiler.strip() for profiler in args.profilers.split(",") if profiler.strip()]
+    try:
+        report = profile_target(
+            target, profilers, args.output_directory, args.lines, args.line_functions
+        )
+    except ValueError as error:
+        parser.error(str(error))
+    print(hotspot_table(report, args.sort, args.top))
+    if args.json:
+        Path(args.json).write_text(report.to_json(args.sort))
+
+
+if __name__ == "__main__":
+    main()
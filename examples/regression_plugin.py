@@ -0,0 +1,202 @@
+"""
+A pytest plugin that fails the run when a benchmark is significantly slower
+than a saved baseline.
+
+Save a baseline with pytest-benchmark's own JSON output:
+    python -m pytest tests/benchmarks_test.py --benchmark-json=baseline.json
+
+Then check later runs against it:
+    python -m pytest -p examples.regression_plugin tests/benchmarks_test.py \\
+        --regression-baseline=baseline.json \\
+        --regression-tolerance="List vs Tuple Initialization=3%" \\
+        --regression-tolerance="Making Numbers=10%"
+
+A benchmark only counts as a regression when both
+  1. a Mann-Whitney U test finds its rounds are slower than the baseline's, and
+  2. the lower bound of the bootstrap confidence interval on the median's
+     slowdown exceeds the group's tolerance.
+Both work on ranks and medians, so a few noisy rounds can't fail the run.
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Mapping, Sequence
+
+import pytest
+
+from examples.ab_compare import Comparison, compare
+
+DEFAULT_TOLERANCE: float = 0.05
+DEFAULT_ALPHA: float = 0.01
+
+
+@dataclass
+class BenchmarkRegression:
+    fullname: str
+    group: str | None
+    tolerance: float
+    comparison: Comparison
+
+
+_regressions_key = pytest.StashKey[list[BenchmarkRegression]]()
+
+
+def parse_percent(value: str) -> float:
+    """
+    Parse a percentage such as "3%" or "3" into a fraction.
+    """
+    try:
+        return float(value.strip().rstrip("%")) / 100
+    except ValueError:
+        raise pytest.UsageError(f"Expected a percentage but received {value!r}.")
+
+
+def parse_tolerance(value: str) -> tuple[str, float]:
+    """
+    Parse a "GROUP=PERCENT%" option into (group, fraction).
+    """
+    group, separator, percent = value.rpartition("=")
+    if not separator or not group:
+        raise pytest.UsageError(
+            f'Expected --regression-tolerance="GROUP=PERCENT%" but received {value!r}.'
+        )
+    return group, parse_percent(percent)
+
+
+def load_baseline(path: Path | str) -> dict[str, dict[str, Any]]:
+    """
+    Load the benchmarks from a pytest-benchmark JSON report, keyed by full name.
+
+    The report must include the raw round data, which --benchmark-json always does.
+    """
+    report = json.loads(Path(path).read_text())
+    baseline: dict[str, dict[str, Any]] = {}
+    for benchmark in report.get("benchmarks", []):
+        if "data" not in benchmark["stats"]:
+            raise pytest.UsageError(
+                f"The baseline {path} has no round data for {benchmark['fullname']}. "
+                "Save it with --benchmark-json or --benchmark-save-data."
+            )
+        baseline[benchmark["fullname"]] = {
+            "group": benchmark.get("group"),
+            "data": benchmark["stats"]["data"],
+        }
+    return baseline
+
+
+def find_regressions(
+    baseline: Mapping[str, Mapping[str, Any]],
+    current: Mapping[str, tuple[str | None, Sequence[float]]],
+    tolerances: Mapping[str, float],
+    default_tolerance: float = DEFAULT_TOLERANCE,
+    alpha: float = DEFAULT_ALPHA,
+    seed: int | None = 0,
+) -> list[BenchmarkRegression]:
+    """
+    Compare each current benchmark against its baseline.
+
+    Parameters
+    baseline: Benchmarks keyed by full name, as returned by load_baseline().
+    current: (group, round timings) keyed by full name.
+    tolerances: The allowed slowdown of the median per group, as a fraction.
+
+    Returns
+    The benchmarks that are significantly slower than their group allows.
+    """
+    regressions: list[BenchmarkRegression] = []
+    for fullname, (group, data) in current.items():
+        if fullname not in baseline or len(data) < 2:
+            continue
+        tolerance = tolerances.get(group, default_tolerance)
+        comparison = compare(baseline[fullname]["data"], data, alpha=alpha, seed=seed)
+        slower = comparison.mann_whitney.z_score > 0
+        if (
+            slower
+            and comparison.mann_whitney.p_value < alpha
+            and comparison.median.ci_low > tolerance
+        ):
+            regressions.append(BenchmarkRegression(fullname, group, tolerance, comparison))
+    return regressions
+
+
+def format_report(regressions: Sequence[BenchmarkRegression]) -> list[str]:
+    lines = [f"{len(regressions)} benchmark(s) regressed against the baseline:"]
+    for regression in regressions:
+        median = regression.comparison.median
+        lines.append(
+            f"  {regression.fullname} [{regression.group}]: median "
+            f"{median.a * 1e9:,.1f} ns -> {median.b * 1e9:,.1f} ns, "
+            f"{median.change:+.1%} (CI {median.ci_low:+.1%} to {median.ci_high:+.1%}), "
+            f"tolerance {regression.tolerance:.1%}, "
+            f"p = {regression.comparison.mann_whitney.p_value:.2g}"
+        )
+    return lines
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("regression", "benchmark regression checks")
+    group.addoption(
+        "--regression-baseline",
+        metavar="PATH",
+        help="A pytest-benchmark JSON report to check the benchmarks against.",
+    )
+    group.addoption(
+        "--regression-tolerance",
+        metavar="GROUP=PERCENT%",
+        action="append",
+        default=[],
+        help="The allowed slowdown of a benchmark group's median. May be repeated.",
+    )
+    group.addoption(
+        "--regression-default-tolerance",
+        metavar="PERCENT%",
+        default=f"{DEFAULT_TOLERANCE:.0%}",
+        help="The allowed slowdown for groups without a tolerance. Default: %(default)s",
+    )
+    group.addoption(
+        "--regression-alpha",
+        type=float,
+        default=DEFAULT_ALPHA,
+        help="The significance level of the regression test. Default: %(default)s",
+    )
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    config = session.config
+    baseline_path = config.getoption("regression_baseline")
+    benchmark_session = getattr(config, "_benchmarksession", None)
+    if baseline_path is None or benchmark_session is None:
+        return
+
+    tolerances = dict(parse_tolerance(value) for value in config.getoption("regression_tolerance"))
+    default_tolerance = parse_percent(config.getoption("regression_default_tolerance"))
+    current = {
+        benchmark.fullname: (benchmark.group, benchmark.stats.data)
+        for benchmark in benchmark_session.benchmarks
+        if benchmark
+    }
+    regressions = find_regressions(
+        load_baseline(baseline_path),
+        current,
+        tolerances,
+        default_tolerance,
+        config.getoption("regression_alpha"),
+    )
+    config.stash[_regressions_key] = regressions
+    if regressions:
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus: int, config: pytest.Config) -> None:
+    regressions = config.stash.get(_regressions_key, None)
+    if regressions is None:
+        return
+    terminalreporter.section("benchmark regressions")
+    if not regressions:
+        terminalreporter.write_line("No benchmarks regressed against the baseline.", green=True)
+        return
+    for line in format_report(regressions):
+        terminalreporter.write_line(line, red=True)
+
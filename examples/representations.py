@@ -0,0 +1,276 @@
+"""
+A benchmark matrix of the ways to represent many values and many records.
+
+Containers hold count integers:
+  - list and tuple: Arrays of pointers to int objects.
+  - array: An array.array of packed 64-bit integers.
+  - numpy: A NumPy int64 array.
+
+Records hold count (name, age, score) rows, one object per row:
+  - plain_class, slots_class: A class with and without __slots__.
+  - dataclass, slots_dataclass: A dataclass with and without slots=True.
+  - named_tuple: A typing.NamedTuple.
+  - dict: A dict per record.
+
+measure_representations() records, for each representation at each count, the
+construction time, the time to access one element or record field, the time
+to iterate over every element and the bytes per element. Record rows share
+their field values with the source data, so a record's bytes are the cost of
+the representation itself.
+
+Usage:
+    python -m examples.representations --counts 10 1000 100000 10000000
+"""
+
+import argparse
+import array
+import gc
+import time
+import timeit
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, NamedTuple, Sequence
+
+import numpy as np
+
+from examples.types import TimeInNS
+
+Row = tuple[str, int, float]
+
+
+class PlainRecord:
+    def __init__(self, name: str, age: int, score: float) -> None:
+        self.name = name
+        self.age = age
+        self.score = score
+
+
+class SlotsRecord:
+    __slots__ = ("name", "age", "score")
+
+    def __init__(self, name: str, age: int, score: float) -> None:
+        self.name = name
+        self.age = age
+        self.score = score
+
+
+@dataclass
+class DataclassRecord:
+    name: str
+    age: int
+    score: float
+
+
+@dataclass(slots=True)
+class SlotsDataclassRecord:
+    name: str
+    age: int
+    score: float
+
+
+class NamedTupleRecord(NamedTuple):
+    name: str
+    age: int
+    score: float
+
+
+def container_source(count: int) -> range:
+    return range(count)
+
+
+def record_source(count: int) -> list[Row]:
+    return [(f"Person {index}", index % 100, index / 7) for index in range(count)]
+
+
+@dataclass
+class Representation:
+    name: str
+    kind: str  # "container" or "record"
+    build: Callable[[Any], Any]  # Builds the representation from its kind's source.
+    access: Callable[[Any, int], Any]  # Reads element index, or a field of record index.
+    iterate: Callable[[Any], Any]  # Visits every element or record.
+
+
+def _element(container: Any, index: int) -> Any:
+    return container[index]
+
+
+def _iterate(container: Any) -> None:
+    for _ in container:
+        pass
+
+
+def _record_type(record_type: Callable[..., Any]) -> Callable[[list[Row]], list[Any]]:
+    def build(rows: list[Row]) -> list[Any]:
+        return [record_type(*row) for row in rows]
+
+    return build
+
+
+def _attribute(records: list[Any], index: int) -> int:
+    return records[index].age
+
+
+def _sum_attributes(records: list[Any]) -> int:
+    return sum(record.age for record in records)
+
+
+def build_dicts(rows: list[Row]) -> list[dict[str, Any]]:
+    return [{"name": name, "age": age, "score": score} for name, age, score in rows]
+
+
+def _item(records: list[dict[str, Any]], index: int) -> int:
+    return records[index]["age"]
+
+
+def _sum_items(records: list[dict[str, Any]]) -> int:
+    return sum(record["age"] for record in records)
+
+
+def build_numpy(values: range) -> np.ndarray:
+    return np.fromiter(values, dtype=np.int64, count=len(values))
+
+
+# fmt: off
+REPRESENTATIONS: dict[str, Representation] = {
+    "list": Representation("list", "container", list, _element, _iterate),
+    "tuple": Representation("tuple", "container", tuple, _element, _iterate),
+    "array": Representation("array", "container", lambda values: array.array("q", values), _element, _iterate),
+    "numpy": Representation("numpy", "container", build_numpy, _element, _iterate),
+    "plain_class": Representation("plain_class", "record", _record_type(PlainRecord), _attribute, _sum_attributes),
+    "slots_class": Representation("slots_class", "record", _record_type(SlotsRecord), _attribute, _sum_attributes),
+    "dataclass": Representation("dataclass", "record", _record_type(DataclassRecord), _attribute, _sum_attributes),
+    "slots_dataclass": Representation("slots_dataclass", "record", _record_type(SlotsDataclassRecord), _attribute, _sum_attributes),
+    "named_tuple": Representation("named_tuple", "record", _record_type(NamedTupleRecord), _attribute, _sum_attributes),
+    "dict": Representation("dict", "record", build_dicts, _item, _sum_items),
+}
+# fmt: on
+
+SOURCES: dict[str, Callable[[int], Any]] = {
+    "container": container_source,
+    "record": record_source,
+}
+
+
+@dataclass
+class RepresentationMeasurement:
+    """
+    How one representation performed at one count. Times are in nanoseconds.
+    """
+
+    representation: str
+    count: int
+    build_time: float  # Per element.
+    access_time: float  # Per access.
+    iterate_time: float  # Per element.
+    bytes_per_element: float
+
+
+def bytes_per_element(representation: Representation, source: Any) -> float:
+    """
+    The memory allocated by building the representation, divided by its length.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        built = representation.build(source)
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del built
+    return (after - before) / max(len(source), 1)
+
+
+def _best_time(stmt: str, scope: dict[str, Any], repeat: int) -> TimeInNS:
+    timer = timeit.Timer(stmt, globals=scope, timer=time.perf_counter_ns)
+    return min(timer.repeat(repeat=repeat, number=1))
+
+
+def measure_representations(
+    counts: Iterable[int],
+    representations: Iterable[str] = REPRESENTATIONS,
+    accesses: int = 1_000,
+    repeat: int = 3,
+    seed: int = 0,
+) -> list[RepresentationMeasurement]:
+    """
+    Measure every representation at every count.
+
+    Parameters
+    accesses: The number of random elements or records read per repeat.
+    repeat: Everything is timed repeat times and the fastest is kept.
+    """
+    rng = np.random.default_rng(seed)
+    measurements: list[RepresentationMeasurement] = []
+    for count in counts:
+        sources = {kind: source(count) for kind, source in SOURCES.items()}
+        indices = rng.integers(0, count, size=accesses).tolist()
+        for name in representations:
+            representation = REPRESENTATIONS[name]
+            source = sources[representation.kind]
+            scope = {"representation": representation, "source": source, "indices": indices}
+
+            build_time = _best_time("representation.build(source)", scope, repeat)
+            scope["built"] = representation.build(source)
+            access_time = _best_time(
+                "for index in indices: access(built, index)",
+                scope | {"access": representation.access},
+                repeat,
+            )
+            iterate_time = _best_time("representation.iterate(built)", scope, repeat)
+            del scope["built"]
+
+            measurements.append(
+                RepresentationMeasurement(
+                    name,
+                    count,
+                    build_time / count,
+                    access_time / accesses,
+                    iterate_time / count,
+                    bytes_per_element(representation, source),
+                )
+            )
+    return measurements
+
+
+def representation_report(measurements: Sequence[RepresentationMeasurement]) -> str:
+    header_fmt = "{:<16} {:>12} {:>12} {:>12} {:>14} {:>12}"
+    row_fmt = "{:<16} {:>12,} {:>12,.1f} {:>12,.1f} {:>14,.1f} {:>12,.1f}"
+    lines = [
+        header_fmt.format(
+            "Representation", "Count", "Build (ns)", "Access (ns)", "Iterate (ns)", "Bytes"
+        )
+    ]
+    for measurement in measurements:
+        lines.append(
+            row_fmt.format(
+                measurement.representation,
+                measurement.count,
+                measurement.build_time,
+                measurement.access_time,
+                measurement.iterate_time,
+                measurement.bytes_per_element,
+            )
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 1_000, 100_000, 10_000_000])
+    parser.add_argument(
+        "--representations",
+        nargs="+",
+        choices=list(REPRESENTATIONS),
+        default=list(REPRESENTATIONS),
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    measurements = measure_representations(args.counts, args.representations, repeat=args.repeat)
+    print(representation_report(measurements))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,403 @@
+"""
+An append-only SQLite store of benchmark results.
+
+Each pytest-benchmark JSON report (created with --benchmark-json) is ingested
+as a run along with its machine, interpreter and commit metadata. Every
+benchmark's summary statistics are stored as columns and its raw per-round
+timings as a compact float64 blob. This enables querying the history of a
+benchmark across runs and detecting when a benchmark group regresses.
+
+Usage:
+    python -m examples.result_store ingest report.json
+    python -m examples.result_store history test_decimals --limit 50
+    python -m examples.result_store regressions "Numerical Initialization"
+"""
+
+import argparse
+import json
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Mapping, Sequence
+
+import numpy as np
+
+from examples.types import TimeInSec
+
+DEFAULT_STORE_PATH: Path = Path(__file__).resolve().parent.parent / "benchmark_results.db"
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ingested_at TEXT NOT NULL,
+    run_at TEXT,
+    node TEXT,
+    python_implementation TEXT,
+    python_version TEXT,
+    cpu TEXT,
+    commit_id TEXT,
+    branch TEXT,
+    dirty INTEGER,
+    machine_info TEXT NOT NULL,
+    commit_info TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS benchmarks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    name TEXT NOT NULL,
+    fullname TEXT NOT NULL,
+    group_name TEXT,
+    min REAL,
+    max REAL,
+    mean REAL,
+    median REAL,
+    stddev REAL,
+    iqr REAL,
+    ops REAL,
+    rounds INTEGER,
+    iterations INTEGER,
+    data BLOB
+);
+CREATE INDEX IF NOT EXISTS benchmarks_by_name ON benchmarks (name, run_id);
+CREATE INDEX IF NOT EXISTS benchmarks_by_fullname ON benchmarks (fullname, run_id);
+CREATE INDEX IF NOT EXISTS benchmarks_by_group ON benchmarks (group_name, run_id);
+"""
+
+
+@dataclass
+class HistoryPoint:
+    """
+    A benchmark's summary statistics for one run. Times are in seconds.
+    """
+
+    run_id: int
+    run_at: str
+    commit_id: str | None
+    min: TimeInSec
+    median: TimeInSec
+    mean: TimeInSec
+    stddev: TimeInSec
+    rounds: int
+
+
+@dataclass
+class Regression:
+    """
+    A change point after which a benchmark became slower.
+    """
+
+    name: str
+    fullname: str  # e.g. tests/benchmarks_test.py::test_decimals
+    run_id: int  # The first run after the change.
+    commit_id: str | None
+    before: TimeInSec  # The median of the per-run medians before the change.
+    after: TimeInSec  # The median of the per-run medians after the change.
+
+    @property
+    def change(self) -> float:
+        return (self.after - self.before) / self.before
+
+
+def _split_statistics(values: np.ndarray, min_segment: int) -> np.ndarray:
+    """
+    Score every split of each row of values into a left and right segment.
+
+    The score is |mean(left) - mean(right)| * sqrt(k * (n - k) / n), the
+    numerator of a two sample t statistic. values has the shape (rows, n).
+    """
+    n = values.shape[1]
+    k = np.arange(min_segment, n - min_segment + 1)
+    cumulative = np.cumsum(values, axis=1)
+    total = cumulative[:, -1:]
+    left_mean = cumulative[:, k - 1] / k
+    right_mean = (total - cumulative[:, k - 1]) / (n - k)
+    return np.abs(left_mean - right_mean) * np.sqrt(k * (n - k) / n)
+
+
+def detect_change_points(
+    values: Sequence[float],
+    min_segment: int = 3,
+    alpha: float = 0.01,
+    permutations: int = 1_000,
+    seed: int | None = 0,
+) -> list[int]:
+    """
+    Find the indices where the level of a series of measurements shifts.
+
+    Uses binary segmentation: find the split that best separates the series
+    into two segments with different means, keep it if a permutation test finds
+    it significant, then repeat on each segment. All of the permutations of a
+    segment are scored in one vectorized NumPy operation.
+
+    Returns
+    The sorted indices of the first value of each new segment.
+    """
+    series = np.asarray(values, dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    change_points: list[int] = []
+    segments = [(0, len(series))]
+
+    while segments:
+        start, stop = segments.pop()
+        segment = series[start:stop]
+        if len(segment) < 2 * min_segment:
+            continue
+
+        scores = _split_statistics(segment[np.newaxis, :], min_segment)[0]
+        best = int(np.argmax(scores))
+        shuffled = rng.permuted(np.tile(segment, (permutations, 1)), axis=1)
+        null_scores = _split_statistics(shuffled, min_segment).max(axis=1)
+        p_value = (np.count_nonzero(null_scores >= scores[best]) + 1) / (permutations + 1)
+        if p_value >= alpha:
+            continue
+
+        split = start + min_segment + best
+        change_points.append(split)
+        segments.append((start, split))
+        segments.append((split, stop))
+
+    return sorted(change_points)
+
+
+class ResultStore:
+    """
+    An append-only store of benchmark runs backed by a SQLite database.
+    """
+
+    def __init__(self, path: Path | str = DEFAULT_STORE_PATH) -> None:
+        self.path = Path(path)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def ingest(self, report: Path | str | Mapping[str, Any]) -> int:
+        """
+        Append a pytest-benchmark JSON report to the store.
+
+        Parameters
+        report: The path to a report created with --benchmark-json or the parsed report.
+
+        Returns
+        The id of the new run.
+        """
+        if not isinstance(report, Mapping):
+            report = json.loads(Path(report).read_text())
+
+        machine_info = report.get("machine_info", {})
+        commit_info = report.get("commit_info", {})
+        with self.connection:
+            cursor = self.connection.execute(
+                """
+                INSERT INTO runs (
+                    ingested_at, run_at, node, python_implementation, python_version,
+                    cpu, commit_id, branch, dirty, machine_info, commit_info
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    datetime.now(timezone.utc).isoformat(),
+                    report.get("datetime"),
+                    machine_info.get("node"),
+                    machine_info.get("python_implementation"),
+                    machine_info.get("python_version"),
+                    machine_info.get("cpu", {}).get("brand_raw"),
+                    commit_info.get("id"),
+                    commit_info.get("branch"),
+                    commit_info.get("dirty"),
+                    json.dumps(machine_info),
+                    json.dumps(commit_info),
+                ),
+            )
+            run_id = cursor.lastrowid
+            self.connection.executemany(
+                """
+                INSERT INTO benchmarks (
+                    run_id, name, fullname, group_name, min, max, mean, median,
+                    stddev, iqr, ops, rounds, iterations, data
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        run_id,
+                        benchmark["name"],
+                        benchmark["fullname"],
+                        benchmark.get("group"),
+                        stats.get("min"),
+                        stats.get("max"),
+                        stats.get("mean"),
+                        stats.get("median"),
+                        stats.get("stddev"),
+                        stats.get("iqr"),
+                        stats.get("ops"),
+                        stats.get("rounds"),
+                        stats.get("iterations"),
+                        (
+                            np.asarray(stats["data"], dtype=np.float64).tobytes()
+                            if "data" in stats
+                            else None
+                        ),
+                    )
+                    for benchmark in report.get("benchmarks", [])
+                    for stats in [benchmark["stats"]]
+                ],
+            )
+        return run_id
+
+    def fullname(self, name: str) -> str:
+        """
+        Returns the full name of a benchmark given its name (e.g. test_decimals) or full name.
+        Raises a ValueError if benchmarks in several test files share the name,
+        since their histories would otherwise be mixed together.
+        """
+        rows = self.connection.execute(
+            "SELECT DISTINCT fullname FROM benchmarks WHERE fullname = ? OR name = ?",
+            (name, name),
+        ).fetchall()
+        fullnames = sorted(row["fullname"] for row in rows)
+        if name in fullnames or not fullnames:
+            return name
+        if len(fullnames) > 1:
+            raise ValueError(
+                f"{name} is ambiguous. Use one of the full names: {', '.join(fullnames)}"
+            )
+        return fullnames[0]
+
+    def history(self, name: str, limit: int = 50) -> list[HistoryPoint]:
+        """
+        Returns a benchmark's statistics for its last limit runs, oldest first.
+
+        Parameters
+        name: The benchmark's name (e.g. test_decimals) or full name.
+        """
+        rows = self.connection.execute(
+            """
+            SELECT b.run_id, r.run_at, r.commit_id, b.min, b.median, b.mean, b.stddev, b.rounds
+            FROM benchmarks b JOIN runs r ON r.id = b.run_id
+            WHERE b.fullname = ?
+            ORDER BY b.run_id DESC
+            LIMIT ?
+            """,
+            (self.fullname(name), limit),
+        ).fetchall()
+        return [HistoryPoint(*row) for row in reversed(rows)]
+
+    def samples(self, name: str, run_id: int) -> np.ndarray:
+        """
+        Returns the raw per-round timings, in seconds, of a benchmark in a run.
+        """
+        row = self.connection.execute(
+            "SELECT data FROM benchmarks WHERE fullname = ? AND run_id = ?",
+            (self.fullname(name), run_id),
+        ).fetchone()
+        if row is None or row["data"] is None:
+            return np.empty(0, dtype=np.float64)
+        return np.frombuffer(row["data"], dtype=np.float64)
+
+    def group_members(self, group: str) -> list[tuple[str, str]]:
+        """
+        Returns the (name, full name) of every benchmark in a group.
+        """
+        rows = self.connection.execute(
+            """
+            SELECT DISTINCT name, fullname FROM benchmarks
+            WHERE group_name = ?
+            ORDER BY name, fullname
+            """,
+            (group,),
+        ).fetchall()
+        return [(row["name"], row["fullname"]) for row in rows]
+
+    def regressions(
+        self, group: str, limit: int = 50, threshold: float = 0.05, **detect_options
+    ) -> list[Regression]:
+        """
+        Find the benchmarks in a group whose median slowed down over the last limit runs.
+
+        Parameters
+        group: The pytest-benchmark group, e.g. "Numerical Initialization".
+        threshold: Ignore change points where the slowdown is smaller than this fraction.
+        detect_options: Passed to detect_change_points.
+        """
+        found: list[Regression] = []
+        for name, fullname in self.group_members(group):
+            history = self.history(fullname, limit)
+            medians = np.array([point.median for point in history])
+            bounds = [0, *detect_change_points(medians, **detect_options), len(medians)]
+            for start, split, stop in zip(bounds, bounds[1:], bounds[2:]):
+                regression = Regression(
+                    name,
+                    fullname,
+                    history[split].run_id,
+                    history[split].commit_id,
+                    float(np.median(medians[start:split])),
+                    float(np.median(medians[split:stop])),
+                )
+                if regression.change > threshold:
+                    found.append(regression)
+        return found
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH, help="The SQLite database.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest = commands.add_parser("ingest", help="Ingest pytest-benchmark JSON reports.")
+    ingest.add_argument("reports", nargs="+")
+
+    history = commands.add_parser("history", help="Show a benchmark's history.")
+    history.add_argument("name")
+    history.add_argument("--limit", type=int, default=50)
+
+    regressions = commands.add_parser("regressions", help="Detect regressions in a group.")
+    regressions.add_argument("group")
+    regressions.add_argument("--limit", type=int, default=50)
+    regressions.add_argument("--threshold", type=float, default=0.05)
+
+    args = parser.parse_args(argv)
+    with ResultStore(args.store) as store:
+        if args.command == "ingest":
+            for report in args.reports:
+                print(f"Ingested {report} as run {store.ingest(report)}.")
+        elif args.command == "history":
+            header_fmt = "{:<8} {:<34} {:<12} {:<14} {:<14} {:<8}"
+            row_fmt = "{:<8} {:<34} {:<12} {:<14,.1f} {:<14,.1f} {:<8,}"
+            print(header_fmt.format("Run", "Date", "Commit", "Min (ns)", "Median (ns)", "Rounds"))
+            try:
+                points = store.history(args.name, args.limit)
+            except ValueError as error:
+                parser.error(str(error))
+            for point in points:
+                print(
+                    row_fmt.format(
+                        point.run_id,
+                        point.run_at or "",
+                        (point.commit_id or "")[:10],
+                        point.min * 1e9,
+                        point.median * 1e9,
+                        point.rounds,
+                    )
+                )
+        elif args.command == "regressions":
+            found = store.regressions(args.group, args.limit, args.threshold)
+            if not found:
+                print(f"No regressions detected in {args.group}.")
+            for regression in found:
+                print(
+                    f"{regression.fullname} regressed by {regression.change:.1%} at run "
+                    f"{regression.run_id} ({(regression.commit_id or 'unknown')[:10]}): "
+                    f"{regression.before * 1e9:,.1f} ns -> {regression.after * 1e9:,.1f} ns"
+                )
+
+
+if __name__ == "__main__":
+    main()
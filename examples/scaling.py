@@ -0,0 +1,239 @@
+"""
+A reusable harness for benchmarking code over increasing data volumes.
+
+A sweep times a set of named callables or timeit statements at each size of
+a size schedule and keeps the full distribution of timings per size. The
+results can then be fit against common complexity classes to report how each
+benchmark scales, for example to catch an accidental O(n) lookup in CI.
+"""
+
+import time
+import timeit
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Mapping
+
+import numpy as np
+
+from examples.types import TimeInNS, TimeInSec
+
+# The complexity classes a sweep is fit against.
+COMPLEXITY_CLASSES: dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "O(1)": lambda n: np.ones_like(n),
+    "O(log n)": lambda n: np.log2(n),
+    "O(n)": lambda n: n,
+    "O(n log n)": lambda n: n * np.log2(n),
+    "O(n^2)": lambda n: n**2,
+}
+
+
+def linear_sizes(min_size: int, max_size: int, step: int) -> list[int]:
+    """
+    Sizes from min_size up to and including max_size, step apart.
+    """
+    return list(range(min_size, max_size + 1, step))
+
+
+def log_sizes(min_size: int, max_size: int, count: int) -> list[int]:
+    """
+    Up to count sizes spaced evenly on a log scale between min_size and max_size.
+
+    Log spacing gives each order of magnitude the same number of samples.
+    """
+    sizes = np.geomspace(min_size, max_size, num=count).round().astype(int)
+    return sorted(set(sizes.tolist()))
+
+
+@dataclass
+class SizeMeasurement:
+    """
+    The distribution of per-call timings for one benchmark at one size.
+    """
+
+    size: int
+    number: int  # The number of calls per sample.
+    samples: np.ndarray  # The average time per call, in nanoseconds, for each sample.
+
+    @property
+    def mean(self) -> float:
+        return float(self.samples.mean())
+
+    @property
+    def median(self) -> float:
+        return float(np.median(self.samples))
+
+    @property
+    def min(self) -> float:
+        return float(self.samples.min())
+
+    @property
+    def max(self) -> float:
+        return float(self.samples.max())
+
+    @property
+    def stdev(self) -> float:
+        return float(self.samples.std(ddof=1)) if len(self.samples) > 1 else 0.0
+
+    def percentile(self, percentile: float) -> float:
+        return float(np.percentile(self.samples, percentile))
+
+
+@dataclass
+class ComplexityFit:
+    """
+    A fit of the model time(n) = coefficient * g(n) for one complexity class.
+
+    The fit minimizes the relative error at each size so small and large
+    sizes are weighted equally.
+    """
+
+    complexity: str
+    coefficient: float
+    residuals: np.ndarray  # The relative error of the fit at each size.
+
+    @property
+    def rms_error(self) -> float:
+        """
+        The root mean square of the relative residuals. Lower is a better fit.
+        """
+        return float(np.sqrt(np.mean(self.residuals**2)))
+
+
+def fit_complexity(sizes: Iterable[int], times: Iterable[float]) -> list[ComplexityFit]:
+    """
+    Fit timings to each of the COMPLEXITY_CLASSES.
+
+    Returns
+    The fits ordered from the best (lowest RMS relative error) to the worst.
+    """
+    n = np.asarray(list(sizes), dtype=np.float64)
+    t = np.asarray(list(times), dtype=np.float64)
+    if len(n) < 2:
+        raise ValueError("At least two sizes are required to fit a complexity class.")
+
+    fits: list[ComplexityFit] = []
+    for complexity, model in COMPLEXITY_CLASSES.items():
+        # Weighted least squares of t = c * g(n) with weights 1 / t^2.
+        g = model(n) / t
+        coefficient = float(g.sum() / (g**2).sum())
+        residuals = coefficient * g - 1
+        fits.append(ComplexityFit(complexity, coefficient, residuals))
+    return sorted(fits, key=lambda fit: fit.rms_error)
+
+
+@dataclass
+class SweepResult:
+    """
+    The measurements for a single named benchmark across a sweep.
+    """
+
+    name: str
+    measurements: list[SizeMeasurement] = field(default_factory=list)
+
+    @property
+    def sizes(self) -> list[int]:
+        return [measurement.size for measurement in self.measurements]
+
+    @property
+    def minimums(self) -> list[float]:
+        return [measurement.min for measurement in self.measurements]
+
+    @property
+    def medians(self) -> list[float]:
+        return [measurement.median for measurement in self.measurements]
+
+    def fits(self, statistic: str = "min") -> list[ComplexityFit]:
+        """
+        Fit a statistic of the timings at each size to the complexity classes, best first.
+
+        The minimum is the default because it is the least affected by
+        interference from the rest of the system.
+        """
+        times = [getattr(measurement, statistic) for measurement in self.measurements]
+        return fit_complexity(self.sizes, times)
+
+    def best_fit(self, statistic: str = "min") -> ComplexityFit:
+        return self.fits(statistic)[0]
+
+
+def calibrate_number(timer: timeit.Timer, min_sample_time: TimeInSec) -> int:
+    """
+    Find the number of calls that takes at least min_sample_time.
+    The timer must report nanoseconds, i.e. use time.perf_counter_ns.
+    """
+    number = 1
+    while True:
+        elapsed: TimeInNS = timer.timeit(number)
+        if elapsed >= min_sample_time * 1e9:
+            return number
+        # Jump most of the way to the target rather than just doubling.
+        number = max(number * 2, int(number * min_sample_time * 1e9 / max(elapsed, 1)))
+
+
+def sweep[T](
+    benchmarks: Mapping[str, Callable[[T], Any] | str],
+    data_factory: Callable[[int], T],
+    sizes: Iterable[int],
+    repeat: int = 20,
+    number: int | None = None,
+    min_sample_time: TimeInSec = 0.001,
+    time_budget: TimeInSec | None = None,
+    scope: Mapping[str, Any] | None = None,
+) -> dict[str, SweepResult]:
+    """
+    Time every benchmark at every size.
+
+    Parameters
+    benchmarks: Named callables, called as fn(data), or timeit statements that
+        reference the data set as data.
+    data_factory: Builds the data set for a size.
+    sizes: The size schedule, for example from log_sizes().
+    repeat: The number of samples to record per benchmark and size.
+    number: The calls per sample. By default each benchmark is calibrated at
+        each size so that a sample takes at least min_sample_time.
+    time_budget: Adaptive mode. Once measuring a benchmark at a size takes longer
+        than time_budget the benchmark is not measured at any larger size.
+    scope: Extra globals for timeit statements.
+
+    Returns
+    A SweepResult per benchmark name.
+    """
+    results = {name: SweepResult(name) for name in benchmarks}
+    active = dict(benchmarks)
+
+    for size in sizes:
+        if not active:
+            break
+        data = data_factory(size)
+        for name, benchmark in list(active.items()):
+            globals_ = dict(scope or {})
+            globals_["data"] = data
+            if callable(benchmark):
+                globals_["_benchmark"] = benchmark
+                stmt = "_benchmark(data)"
+            else:
+                stmt = benchmark
+            timer = timeit.Timer(stmt=stmt, globals=globals_, timer=time.perf_counter_ns)
+
+            start: TimeInNS = time.perf_counter_ns()
+            calls = number or calibrate_number(timer, min_sample_time)
+            samples = np.asarray(timer.repeat(repeat=repeat, number=calls)) / calls
+            elapsed: TimeInNS = time.perf_counter_ns() - start
+
+            results[name].measurements.append(SizeMeasurement(size, calls, samples))
+            if time_budget is not None and elapsed > time_budget * 1e9:
+                del active[name]
+
+    return results
+
+
+def complexity_report(results: Mapping[str, SweepResult]) -> str:
+    """
+    Format the best complexity fit for each benchmark as a table.
+    """
+    header_fmt = "{:<25} {:<12} {:<16} {:<12}"
+    row_fmt = "{:<25} {:<12} {:<16,.4f} {:<12.2%}"
+    lines = [header_fmt.format("Benchmark", "Best Fit", "Coefficient (ns)", "RMS Error")]
+    for name, result in results.items():
+        fit = result.best_fit()
+        lines.append(row_fmt.format(name, fit.complexity, fit.coefficient, fit.rms_error))
+    return "\n".join(lines)
@@ -0,0 +1,209 @@
+"""
+A bounded memory summary of a stream of timings.
+
+Calculating percentiles with np.percentile requires holding every sample in
+memory, which isn't practical for long production captures with hundreds of
+millions of samples. A StreamingSummary ingests timings incrementally and keeps:
+  - The exact count, min, max, mean and variance (Welford's algorithm).
+  - A merging t-digest sketch for estimating quantiles.
+
+Summaries built on different workers can be combined with merge().
+"""
+
+import math
+from typing import Iterable, Sequence
+
+import numpy as np
+
+DEFAULT_COMPRESSION: int = 500
+DEFAULT_BUFFER_SIZE: int = 50_000
+
+
+class StreamingSummary:
+    """
+    Streaming statistics and quantile estimates for timings.
+
+    Memory is bounded by the compression (the number of t-digest centroids
+    is at most about compression / 2) and the buffer size.
+    Larger compression values give more accurate quantiles.
+    """
+
+    def __init__(
+        self,
+        compression: int = DEFAULT_COMPRESSION,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+    ) -> None:
+        self.compression = compression
+        self.buffer_size = buffer_size
+
+        # Exact statistics, up to date once the buffer is flushed.
+        self._count: int = 0
+        self._min: float = math.inf
+        self._max: float = -math.inf
+        self._mean: float = 0.0
+        self._m2: float = 0.0  # The sum of squared differences from the mean.
+
+        # The t-digest centroids, sorted by mean.
+        self._means = np.empty(0, dtype=np.float64)
+        self._weights = np.empty(0, dtype=np.float64)
+
+        # Values that haven't been merged into the centroids yet.
+        self._buffer: list[float] = []
+        self._buffered_arrays: list[np.ndarray] = []
+        self._buffered: int = 0
+
+    @property
+    def count(self) -> int:
+        self._flush_scalars()
+        return self._count
+
+    @property
+    def min(self) -> float:
+        self._flush_scalars()
+        return self._min
+
+    @property
+    def max(self) -> float:
+        self._flush_scalars()
+        return self._max
+
+    @property
+    def mean(self) -> float:
+        self._flush_scalars()
+        return self._mean
+
+    @property
+    def variance(self) -> float:
+        """
+        The sample variance.
+        """
+        count = self.count
+        return self._m2 / (count - 1) if count > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+    def add(self, value: float) -> None:
+        """
+        Add a single timing.
+        """
+        self._buffer.append(value)
+        if len(self._buffer) >= self.buffer_size:
+            self._flush_scalars()
+
+    def update(self, values: Iterable[float] | np.ndarray) -> None:
+        """
+        Add a batch of timings.
+        """
+        batch = np.asarray(
+            values if isinstance(values, (np.ndarray, Sequence)) else list(values),
+            dtype=np.float64,
+        ).ravel()
+        if len(batch) == 0:
+            return
+        self._ingest(batch)
+
+    def merge(self, other: "StreamingSummary") -> "StreamingSummary":
+        """
+        Combine another summary into this one, for example one built on another worker.
+        """
+        other._flush_scalars()
+        other._compress()
+        if other.count == 0:
+            return self
+        self._combine_exact(other.count, other.mean, other._m2, other.min, other.max)
+        self._stage(other._means, other._weights)
+        self._compress()
+        return self
+
+    def quantile(self, q: float | Sequence[float]) -> float | list[float]:
+        """
+        Estimate one or more quantiles, each between 0 and 1.
+        """
+        self._flush_scalars()
+        self._compress()
+        if self.count == 0:
+            raise ValueError("Cannot calculate the quantile of an empty summary.")
+
+        # Interpolate between the centroid centers, anchored at the exact min and max.
+        cumulative = np.cumsum(self._weights)
+        centers = cumulative - self._weights / 2
+        positions = np.concatenate(([0.0], centers, [cumulative[-1]]))
+        values = np.concatenate(([self.min], self._means, [self.max]))
+        targets = np.clip(np.asarray(q, dtype=np.float64), 0, 1) * self.count
+        estimates = np.interp(targets, positions, values)
+        return estimates.tolist() if np.ndim(q) else float(estimates)
+
+    def percentile(self, p: float | Sequence[float]) -> float | list[float]:
+        """
+        Estimate one or more percentiles, each between 0 and 100.
+        """
+        return self.quantile(np.asarray(p, dtype=np.float64) / 100 if np.ndim(p) else p / 100)
+
+    @property
+    def centroid_count(self) -> int:
+        self._flush_scalars()
+        self._compress()
+        return len(self._means)
+
+    def _flush_scalars(self) -> None:
+        if self._buffer:
+            batch = np.asarray(self._buffer, dtype=np.float64)
+            self._buffer = []
+            self._ingest(batch)
+
+    def _ingest(self, batch: np.ndarray) -> None:
+        batch_mean = float(batch.mean())
+        batch_m2 = float(((batch - batch_mean) ** 2).sum())
+        self._combine_exact(
+            len(batch), batch_mean, batch_m2, float(batch.min()), float(batch.max())
+        )
+        self._stage(batch, np.ones(len(batch), dtype=np.float64))
+
+    def _combine_exact(
+        self, count: int, mean: float, m2: float, minimum: float, maximum: float
+    ) -> None:
+        # Chan et al.'s parallel variant of Welford's algorithm.
+        total = self._count + count
+        delta = mean - self._mean
+        self._mean += delta * count / total
+        self._m2 += m2 + delta**2 * self._count * count / total
+        self._count = total
+        self._min = min(self._min, minimum)
+        self._max = max(self._max, maximum)
+
+    def _stage(self, means: np.ndarray, weights: np.ndarray) -> None:
+        self._buffered_arrays.append(means)
+        self._buffered_arrays.append(weights)
+        self._buffered += len(means)
+        if self._buffered >= self.buffer_size:
+            self._compress()
+
+    def _compress(self) -> None:
+        """
+        Merge the staged values into the centroids.
+
+        The sorted values are grouped so that no centroid spans more than one
+        unit of the k1 scale function, k(q) = compression / (2 pi) * asin(2q - 1).
+        That keeps centroids near the tails small, so extreme quantiles like
+        P99 remain accurate.
+        """
+        if not self._buffered_arrays:
+            return
+        means = np.concatenate([self._means, *self._buffered_arrays[0::2]])
+        weights = np.concatenate([self._weights, *self._buffered_arrays[1::2]])
+        self._buffered_arrays = []
+        self._buffered = 0
+
+        order = np.argsort(means, kind="stable")
+        means = means[order]
+        weights = weights[order]
+
+        cumulative = np.cumsum(weights)
+        q = (cumulative - weights / 2) / cumulative[-1]
+        k = np.floor(self.compression / (2 * math.pi) * np.arcsin(2 * q - 1))
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(k)) + 1))
+
+        self._weights = np.add.reduceat(weights, starts)
+        self._means = np.add.reduceat(means * weights, starts) / self._weights
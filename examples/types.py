@@ -1,7 +1,10 @@
 # Define type aliases to improve readability.
-from typing import Sequence
+from typing import Callable, Sequence
 
 
 type TimeInSec = float
 type TimeInNS = int
 type RandomNames = tuple[Sequence[str], set[str]]
+
+# A function that is called as factory(size, seed) and returns size names.
+type NameFactory = Callable[[int, int], Sequence[str]]
@@ -0,0 +1,112 @@
+"""
+A virtual clock for benchmarking code that sleeps.
+
+Code that simulates latency with time.sleep() spends nearly all of its time
+idle, so benchmark rounds take seconds and profiles are mostly sleep. While
+a VirtualClock is installed, sleep() returns immediately and instead moves the
+clock forward. The timing clocks (perf_counter, monotonic, time and their _ns
+variants) return the real time plus the total simulated sleep, so code that
+measures its own durations still sees the latency it asked for.
+
+    clock = VirtualClock()
+    with clock.install(my_module):
+        my_module.numeric_process()
+    print(clock.simulated)  # The seconds that would have been spent sleeping.
+
+install() patches the time module and any functions a module imported with
+"from time import sleep". Timers captured before installing, like
+pytest-benchmark's and timeit's default timers, keep measuring real time, so
+they measure only the CPU-bound work. asyncio.sleep() is not affected.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Callable, Iterator
+
+from examples.types import TimeInNS, TimeInSec
+
+# The real functions, captured before any clock is installed.
+_REAL_FUNCTIONS: dict[str, Callable] = {
+    name: getattr(time, name)
+    for name in (
+        "sleep",
+        "perf_counter",
+        "perf_counter_ns",
+        "monotonic",
+        "monotonic_ns",
+        "time",
+        "time_ns",
+    )
+}
+
+
+class VirtualClock:
+    """
+    Replaces sleeping with advancing a simulated offset. Safe to share between threads,
+    although sleeps on different threads then add up rather than overlap.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._offset: TimeInNS = 0
+        self.sleep_calls: int = 0
+
+    @property
+    def simulated(self) -> TimeInSec:
+        """
+        The total time slept, in seconds.
+        """
+        return self._offset / 1e9
+
+    def reset(self) -> None:
+        with self._lock:
+            self._offset = 0
+            self.sleep_calls = 0
+
+    def sleep(self, seconds: TimeInSec) -> None:
+        if seconds < 0:
+            raise ValueError("sleep length must be non-negative")
+        with self._lock:
+            self._offset += round(seconds * 1e9)
+            self.sleep_calls += 1
+
+    def perf_counter_ns(self) -> TimeInNS:
+        return _REAL_FUNCTIONS["perf_counter_ns"]() + self._offset
+
+    def perf_counter(self) -> TimeInSec:
+        return _REAL_FUNCTIONS["perf_counter"]() + self._offset / 1e9
+
+    def monotonic_ns(self) -> TimeInNS:
+        return _REAL_FUNCTIONS["monotonic_ns"]() + self._offset
+
+    def monotonic(self) -> TimeInSec:
+        return _REAL_FUNCTIONS["monotonic"]() + self._offset / 1e9
+
+    def time_ns(self) -> TimeInNS:
+        return _REAL_FUNCTIONS["time_ns"]() + self._offset
+
+    def time(self) -> TimeInSec:
+        return _REAL_FUNCTIONS["time"]() + self._offset / 1e9
+
+    @contextmanager
+    def install(self, *modules: ModuleType) -> Iterator["VirtualClock"]:
+        """
+        Replace the time module's functions, and any of them imported by modules,
+        with this clock's for the duration of the with block.
+        """
+        virtual = {
+            id(real): getattr(self, name) for name, real in _REAL_FUNCTIONS.items()
+        }
+        patched: list[tuple[ModuleType, str, Callable]] = []
+        try:
+            for module in (time, *modules):
+                for name, value in list(vars(module).items()):
+                    if id(value) in virtual:
+                        patched.append((module, name, value))
+                        setattr(module, name, virtual[id(value)])
+            yield self
+        finally:
+            for module, name, value in reversed(patched):
+                setattr(module, name, value)
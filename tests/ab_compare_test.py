@@ -0,0 +1,70 @@
+import time
+
+import numpy as np
+
+from examples.ab_compare import bootstrap_quantiles, compare, mann_whitney_u
+from examples.types import TimeInNS
+from tests.fixtures import SEED, perf_data_a, perf_data_b
+
+
+def test_compare_perf_data(perf_data_a, perf_data_b) -> None:
+    """
+    Demonstrate statistically comparing two performance distributions.
+    """
+    comparison = compare(perf_data_a, perf_data_b, seed=SEED)
+
+    # Data B is centered around 75 nanoseconds and Data A around 100.
+    assert comparison.significant
+    assert comparison.median.change < 0
+    assert comparison.median.ci_low < comparison.median.change < comparison.median.ci_high
+    assert comparison.cliffs_delta < -0.9
+
+    print("\nTest Approach: A/B Comparison of Performance Distributions")
+    print(comparison.verdict())
+    print(f"Cliff's delta: {comparison.cliffs_delta:.3f}")
+    print(f"Mann-Whitney p-value: {comparison.mann_whitney.p_value:.3g}")
+    print(f"P99 change: {comparison.p99.change:+.2%} ± {comparison.p99.margin:.2%}")
+
+
+def test_compare_identical_distributions() -> None:
+    timings = np.random.default_rng(SEED).normal(loc=100, scale=4, size=2_000)
+    comparison = compare(timings[:1_000], timings[1_000:], seed=SEED)
+    assert not comparison.significant
+    assert comparison.verdict().startswith("No significant difference")
+
+
+def test_compare_one_million_timings_quickly() -> None:
+    rng = np.random.default_rng(SEED)
+    a = rng.normal(loc=100, scale=4, size=1_000_000)
+    b = rng.normal(loc=99, scale=4, size=1_000_000)
+
+    start: TimeInNS = time.perf_counter_ns()
+    comparison = compare(a, b, seed=SEED)
+    elapsed: TimeInNS = time.perf_counter_ns() - start
+
+    assert comparison.verdict().startswith("B is faster by")
+    assert elapsed < 2e9
+    print(f"\nComparing 1M vs 1M timings took: {elapsed:,} nanoseconds")
+
+
+def test_bootstrap_matches_resampling() -> None:
+    """
+    The order statistic shortcut matches resampling the data directly.
+    """
+    rng = np.random.default_rng(SEED)
+    values = np.sort(rng.gumbel(loc=75, scale=5, size=301))
+
+    shortcut = bootstrap_quantiles(values, 0.5, 20_000, rng)
+    resampled = np.quantile(
+        rng.choice(values, size=(20_000, len(values))), 0.5, axis=1, method="inverted_cdf"
+    )
+    assert np.allclose(
+        np.percentile(shortcut, [5, 50, 95]), np.percentile(resampled, [5, 50, 95]), rtol=0.01
+    )
+
+
+def test_mann_whitney_with_ties() -> None:
+    result = mann_whitney_u(np.array([1.0, 2, 2, 3, 4]), np.array([2.0, 3, 5, 6, 7]))
+    # Tied values share their average rank, so U can be fractional.
+    assert result.u_statistic == 20.5
+    assert np.isclose(result.p_value, 0.1116, atol=1e-4)
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from examples.adaptive_timer import (
+    median_confidence_interval,
+    mser_truncation,
+    run_adaptive,
+)
+from tests.fixtures import MISSING_PERSON, SEED, random_names
+
+
+def test_mser_drops_warmup() -> None:
+    rng = np.random.default_rng(SEED)
+    warmup = np.linspace(300, 110, 50) + rng.normal(0, 2, 50)
+    steady = rng.normal(100, 2, 450)
+    dropped = mser_truncation(np.concatenate((warmup, steady)))
+    assert 40 <= dropped <= 60
+    assert mser_truncation(steady) <= 20
+
+
+def test_median_confidence_interval() -> None:
+    samples = np.random.default_rng(SEED).normal(100, 5, 10_000)
+    median, low, high = median_confidence_interval(samples)
+    assert low < median < high
+    assert (high - low) / 2 / median < 0.002
+
+    # Any confidence level is supported, not only the common ones.
+    _, low_80, high_80 = median_confidence_interval(samples, confidence=0.8)
+    _, low_999, high_999 = median_confidence_interval(samples, confidence=0.999)
+    assert low_999 < low < low_80 and high_80 < high < high_999
+    with pytest.raises(ValueError):
+        median_confidence_interval(samples, confidence=95)
+
+
+def test_cheap_and_expensive_statements(random_names) -> None:
+    """
+    Demonstrate that the runner adapts to the cost of a statement.
+    """
+    random_names_list, random_names_set = random_names
+    scope = {
+        "MISSING_PERSON": MISSING_PERSON,
+        "random_names_list": random_names_list,
+        "random_names_set": random_names_set,
+    }
+
+    set_result = run_adaptive(
+        "MISSING_PERSON not in random_names_set", globals=scope, target_precision=0.02
+    )
+    list_result = run_adaptive(
+        "MISSING_PERSON not in random_names_list", globals=scope, target_precision=0.02
+    )
+
+    # Many more set lookups fit in a sample than list lookups.
+    assert set_result.number > list_result.number
+    assert set_result.median < list_result.median
+    # The interval describes the samples returned with it.
+    for result in (set_result, list_result):
+        median, low, high = median_confidence_interval(result.samples)
+        assert (result.median, result.ci_low, result.ci_high) == (median, low, high)
+
+    print("\nTest Approach: Adaptive Precision-Targeted Runner")
+    for name, result in (("Set", set_result), ("Sequence", list_result)):
+        print(
+            f"{name} Search: {result.median:,.1f} ns ± {result.relative_precision:.2%} "
+            f"({len(result.samples)} samples of {result.number:,} calls, "
+            f"{result.warmup_samples} warmup dropped, converged={result.converged}, "
+            f"{result.elapsed:.2f} s)"
+        )
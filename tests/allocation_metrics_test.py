@@ -0,0 +1,36 @@
+import pytest
+
+from examples.allocation_metrics import measure_allocations
+
+init_values = (0, 1, 2, 3, 4, 5, 6, 7, 8, 9)
+
+
+def make_with_temporary() -> list[int]:
+    temporary = list(range(1_000))
+    return temporary[:10]
+
+
+def test_list_vs_tuple_allocations() -> None:
+    """
+    Demonstrate that copying a tuple into a tuple allocates nothing.
+    """
+    list_metrics = measure_allocations(list, init_values)
+    tuple_metrics = measure_allocations(tuple, init_values)
+
+    print("\nTest Approach: Allocations Per Call")
+    print(f"list(init_values): {list_metrics}")
+    print(f"tuple(init_values): {tuple_metrics}")
+
+    # The list object and its array of item pointers.
+    assert list_metrics.allocs_per_call == pytest.approx(2, abs=0.01)
+    assert list_metrics.alloc_bytes_per_call > 10 * 8
+    # tuple() returns the same immutable tuple.
+    assert tuple_metrics.allocs_per_call == pytest.approx(0, abs=0.01)
+    assert tuple_metrics.alloc_bytes_per_call == 0
+    assert tuple_metrics.alloc_peak_per_call == 0
+
+
+def test_peak_includes_temporaries() -> None:
+    metrics = measure_allocations(make_with_temporary, calls=100)
+    assert metrics.alloc_peak_per_call > 1_000 * 8
+    assert metrics.alloc_bytes_per_call < metrics.alloc_peak_per_call / 10
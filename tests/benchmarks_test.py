@@ -17,12 +17,17 @@ Outputs a table with the following columns:
     Ops: 1000 operations per second. Higher the better.
     Rounds: The number of times a benchmark round was ran.
     Iterations: The number of iterations per round.
+
+Each benchmark also records its allocations per call in a separate pass.
+Run with -p examples.allocation_metrics to print them as a table.
 """
 
 from decimal import Decimal
 from fractions import Fraction
 import pytest
 
+from examples.allocation_metrics import record_allocations
+
 init_values = (0, 1, 2, 3, 4, 5, 6, 7, 8, 9)
 
 
@@ -32,6 +37,7 @@ def test_lists(benchmark):
     Benchmark the performance of calling list((0, 1, 2, 3, 4, 5, 6, 7, 8, 9))
     """
     benchmark(list, init_values)
+    record_allocations(benchmark, list, init_values)
 
 
 @pytest.mark.benchmark(group="List vs Tuple Initialization", disable_gc=True)
@@ -40,19 +46,24 @@ def test_tuples(benchmark):
     Benchmark the performance of calling tuple((0, 1, 2, 3, 4, 5, 6, 7, 8, 9))
     """
     benchmark(tuple, init_values)
+    record_allocations(benchmark, tuple, init_values)
 
 @pytest.mark.benchmark(group="Numerical Initialization", disable_gc=True)
 def test_ints(benchmark):
     benchmark(int, 0.75)
+    record_allocations(benchmark, int, 0.75)
 
 @pytest.mark.benchmark(group="Numerical Initialization", disable_gc=True)
 def test_floats(benchmark):
     benchmark(float, 0.75)
+    record_allocations(benchmark, float, 0.75)
 
 @pytest.mark.benchmark(group="Numerical Initialization", disable_gc=True)
 def test_decimals(benchmark):
     benchmark(Decimal, 0.75)
+    record_allocations(benchmark, Decimal, 0.75)
 
 @pytest.mark.benchmark(group="Numerical Initialization", disable_gc=True)
 def test_fractions(benchmark):
     benchmark(Fraction, 3, 4)
+    record_allocations(benchmark, Fraction, 3, 4)
@@ -0,0 +1,71 @@
+import numpy as np
+
+from examples.compact_index import CompactNameIndex, encode_names, hash_name, hash_names
+from examples.membership import hit_queries, miss_queries
+from examples.types import RandomNames
+from tests.fixtures import MISSING_PERSON, SEED, random_names
+
+
+def test_vectorized_hash_matches_scalar_hash() -> None:
+    names = ["Ada Lovelace", "José Núñez", "Zoë Ærø", ""]
+    blob, starts, lengths = encode_names(names)
+    assert hash_names(blob, starts, lengths).tolist() == [
+        hash_name(name.encode()) for name in names
+    ]
+
+
+def test_index_drops_duplicates() -> None:
+    names = ["Zoë Ærø", "Ada Lovelace", "Zoë Ærø", "", "Ada Lovelace"]
+    index = CompactNameIndex.build(names, chunk_size=2)
+    assert len(index) == 3
+    assert [index[position] for position in range(len(index))] == ["Zoë Ærø", "Ada Lovelace", ""]
+    assert "" in index and "Zoë Ærø" in index and "Zoe Aero" not in index
+
+
+def test_index_agrees_with_set(random_names: RandomNames) -> None:
+    """
+    Demonstrate that the index, with and without a Bloom filter, answers like a set.
+    """
+    random_names_list, random_names_set = random_names
+    queries = (
+        hit_queries(random_names_list, 500, SEED)
+        + miss_queries(random_names_list, 500, SEED)
+        + [MISSING_PERSON, "", "A" * 500]
+    )
+    expected = [query in random_names_set for query in queries]
+
+    for bloom_bits_per_name in (None, 10):
+        index = CompactNameIndex.build(
+            random_names_list, chunk_size=1_000, bloom_bits_per_name=bloom_bits_per_name
+        )
+        assert len(index) == len(random_names_set)
+        assert [query in index for query in queries] == expected
+        assert index.contains_batch(queries).tolist() == expected
+
+
+def test_index_memory_maps(tmp_path, random_names: RandomNames) -> None:
+    """
+    Demonstrate saving an index and opening it without reading it into memory.
+    """
+    random_names_list, _ = random_names
+    index = CompactNameIndex.build(random_names_list, bloom_bits_per_name=10)
+    index.save(tmp_path)
+
+    mapped = CompactNameIndex.load(tmp_path)
+    assert isinstance(mapped.blob, np.memmap)
+    assert mapped.bloom_hashes == index.bloom_hashes
+    assert random_names_list[0] in mapped
+    assert MISSING_PERSON not in mapped
+    assert mapped.contains_batch(random_names_list[:100]).all()
+
+
+def test_names_may_contain_newlines() -> None:
+    index = CompactNameIndex.build(["a\nb", "c"])
+    assert len(index) == 2
+    assert [index[position] for position in range(len(index))] == ["a\nb", "c"]
+    assert "a\nb" in index and "a" not in index and "b" not in index
+
+    # A query with a newline doesn't shift the rest of the batch.
+    index = CompactNameIndex.build(["Ann", "Bob"])
+    assert "x\ny" not in index
+    assert index.contains_batch(["x\ny", "Bob", "Ann\n"]).tolist() == [False, True, False]
@@ -0,0 +1,55 @@
+import pytest
+
+from examples.concurrency import (
+    STRATEGIES,
+    compare_strategies,
+    numeric_process,
+    strategy_report,
+)
+
+# Short waits so a sweep finishes in a few seconds.
+SHORT_WAIT = (0.001, 0.002)
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_strategies_return_doubled_waits(strategy: str) -> None:
+    values = numeric_process(strategy, fan_out=25, wait_range=SHORT_WAIT)
+    assert len(values) == 25
+    assert all(2 * SHORT_WAIT[0] <= value <= 2 * SHORT_WAIT[1] for value in values)
+
+
+def test_compare_strategies() -> None:
+    """
+    Demonstrate how the wall time of each strategy scales with the fan-out.
+    """
+    measurements = compare_strategies(
+        fan_outs=(10, 100, 1_000),
+        wait_range=SHORT_WAIT,
+        repeat=3,
+        time_budget=1.0,
+    )
+    by_key = {(m.strategy, m.fan_out): m for m in measurements}
+
+    print("\nTest Approach: Concurrent Execution Strategies")
+    print(strategy_report(measurements))
+
+    # Sequential calls take at least the sum of the waits.
+    assert by_key["sequential", 100].wall_time >= 100 * SHORT_WAIT[0] * 1e9
+
+    # Waiting concurrently is faster once there is enough to wait on.
+    assert by_key["threads", 100].wall_time < by_key["sequential", 100].wall_time
+    assert by_key["asyncio", 100].wall_time < by_key["sequential", 100].wall_time
+
+    # The asyncio run of 1,000 calls waits on them all at once.
+    assert by_key["asyncio", 1_000].wall_time < 1_000 * SHORT_WAIT[0] * 1e9
+
+
+def test_time_budget_skips_larger_fan_outs() -> None:
+    measurements = compare_strategies(
+        fan_outs=(10, 100, 10_000),
+        strategies=["sequential"],
+        wait_range=SHORT_WAIT,
+        repeat=1,
+        time_budget=1.0,
+    )
+    assert [m.fan_out for m in measurements] == [10, 100]
@@ -0,0 +1,68 @@
+import sys
+
+import pytest
+
+from examples.contention import (
+    WORKLOADS,
+    contention_report,
+    default_worker_counts,
+    free_threaded_build,
+    gil_enabled,
+    interpreter_description,
+    load_measurements,
+    measure_contention,
+    run_contended,
+    save_measurements,
+    tuple_init,
+)
+
+
+def test_interpreter_detection() -> None:
+    description = interpreter_description()
+    assert description.startswith(sys.implementation.name)
+    assert ("free-threaded" in description) == free_threaded_build()
+    # A standard build always has the GIL.
+    assert free_threaded_build() or gil_enabled()
+
+
+def test_default_worker_counts() -> None:
+    counts = default_worker_counts()
+    assert counts[0] == 1
+    assert counts == sorted(set(counts))
+    assert all(count & (count - 1) == 0 for count in counts[:-1])
+
+
+@pytest.mark.parametrize("mode", ["thread", "process"])
+def test_run_contended(mode: str) -> None:
+    measurement = run_contended(tuple_init, workers=2, mode=mode, calls=1_000)
+    assert measurement.workload == "tuple_init"
+    assert measurement.calls == 2_000
+    assert 0 < measurement.p50 <= measurement.p90 <= measurement.p99
+    assert measurement.throughput > 0
+
+
+def test_unknown_mode() -> None:
+    with pytest.raises(ValueError):
+        run_contended(tuple_init, workers=1, mode="fiber")
+
+
+def test_contention_suite(tmp_path) -> None:
+    """
+    Demonstrate how throughput scales as threads contend for the interpreter.
+    """
+    measurements = measure_contention(
+        ["tuple_init", "set_search"], worker_counts=[1, 2, 4], modes=["thread"], calls=5_000
+    )
+
+    print("\nTest Approach: Threads Contending for the Interpreter")
+    print(contention_report(measurements))
+
+    assert [m.workers for m in measurements] == [1, 2, 4, 1, 2, 4]
+    assert measurements[0].efficiency == 1.0
+    if gil_enabled():
+        # The GIL runs one thread at a time, so 4 threads can't do 4x the work.
+        assert measurements[2].efficiency < 0.9
+
+    save_measurements(measurements, tmp_path / "contention.json")
+    assert load_measurements(tmp_path / "contention.json") == measurements
+    assert set(WORKLOADS) >= {m.workload for m in measurements}
@@ -1,22 +1,87 @@
 import numpy as np
 import pytest
 
+import functools
+import os
 import random
-from typing import Sequence
+from importlib.metadata import version
+from typing import TYPE_CHECKING, Iterator, Sequence
 
-from faker import Faker
+from examples.name_cache import CachedNames, NameCache
+from examples.name_generator import default_generator
 from examples.types import RandomNames, TimeInNS
+from examples.virtual_clock import VirtualClock
 
-fake = Faker()
+if TYPE_CHECKING:
+    from faker import Faker
+
+name_cache = NameCache()
 
 DATA_SET_SIZE: int = 10_000
 MISSING_PERSON: str = "John Doe"
 
+# Seed every generated data set so all runs compare against the same data.
+SEED: int = 2024
+
+# Faker's output for a given seed can change between releases.
+FAKER_GENERATOR: str = f"faker-{version('Faker')}"
+BULK_GENERATOR: str = f"bulk-{FAKER_GENERATOR}"
+
+# Set VIRTUAL_TIME=1 to skip the simulated latency in the sleeping tests.
+VIRTUAL_TIME: bool = os.environ.get("VIRTUAL_TIME", "0") not in ("", "0")
+
+
+@functools.cache
+def fake() -> "Faker":
+    """
+    The shared Faker instance, created on first use because creating it is slow.
+    """
+    from faker import Faker
+
+    return Faker()
+
 
-def create_random_names(size: int) -> RandomNames:
+def generate_fake_names(size: int, seed: int) -> list[str]:
+    """
+    Generate size fake names, one Faker.name() call at a time.
+    """
+    faker = fake()
+    faker.seed_instance(seed)
     data: list[str] = []
     for _ in range(size):
-        data.append(fake.name())
+        data.append(faker.name())
+    return data
+
+
+def cached_random_names(size: int, seed: int = SEED) -> CachedNames:
+    """
+    Load a seeded data set of fake names from the on-disk cache.
+
+    The names are only generated the first time a (size, seed) pair is requested.
+    """
+    return name_cache.load(FAKER_GENERATOR, size, seed, generate_fake_names)
+
+
+def create_random_names(size: int, seed: int = SEED) -> RandomNames:
+    data: list[str] = cached_random_names(size, seed).to_list()
+    return data, set(data)
+
+
+def create_bulk_random_names(size: int, seed: int = SEED) -> RandomNames:
+    """
+    A drop-in replacement for create_random_names for very large data sets.
+
+    The names are built in bulk from Faker's name pools rather than one
+    Faker.name() call at a time. Cold runs stream the names to disk in chunks.
+    """
+    if not name_cache.contains(BULK_GENERATOR, size, seed):
+        name_cache.store_chunks(
+            BULK_GENERATOR, size, seed, default_generator().chunks(size, seed)
+        )
+    # Build the name pools only if the data set has to be generated.
+    data: list[str] = name_cache.load(
+        BULK_GENERATOR, size, seed, lambda size, seed: default_generator().generate(size, seed)
+    ).to_list()
     return data, set(data)
 
 
@@ -42,9 +107,23 @@ def random_names() -> RandomNames:
 
 @pytest.fixture(scope="session")
 def perf_data_a() -> Sequence[TimeInNS]:
-    return np.random.default_rng().normal(loc=100, scale=4, size=200).tolist()
+    return np.random.default_rng(SEED).normal(loc=100, scale=4, size=200).tolist()
 
 
 @pytest.fixture(scope="session")
 def perf_data_b() -> Sequence[TimeInNS]:
-    return np.random.default_rng().gumbel(loc=75, scale=5, size=200).tolist()
+    return np.random.default_rng(SEED + 1).gumbel(loc=75, scale=5, size=200).tolist()
+
+
+@pytest.fixture
+def virtual_clock(request) -> Iterator[VirtualClock]:
+    """
+    A VirtualClock installed over the requesting test's module when VIRTUAL_TIME
+    is set. Otherwise the clock isn't installed and the test sleeps for real.
+    """
+    clock = VirtualClock()
+    if not VIRTUAL_TIME:
+        yield clock
+        return
+    with clock.install(request.module):
+        yield clock
@@ -0,0 +1,62 @@
+import sys
+import textwrap
+
+from examples.import_time import (
+    format_import_times,
+    import_time_report,
+    measure_import_time,
+    parse_importtime,
+    total_import_time,
+)
+from examples.lazy_import import LazyModule, lazy_import
+
+REPORTING_MODULES = ("pandas", "great_tables", "matplotlib", "faker")
+
+
+def test_parse_importtime() -> None:
+    report = textwrap.dedent(
+        """\
+        import time: self [us] | cumulative | imported package
+        import time:       120 |        120 |     _io
+        import time:       450 |        570 |   encodings
+        import time:      2300 |       2870 | json
+        Some other output.
+        """
+    )
+    records = parse_importtime(report)
+    assert [(r.module, r.self_us, r.cumulative_us, r.depth) for r in records] == [
+        ("_io", 120, 120, 2),
+        ("encodings", 450, 570, 1),
+        ("json", 2300, 2870, 0),
+    ]
+
+
+def test_lazy_import() -> None:
+    assert lazy_import("sys") is sys
+    if "colorsys" in sys.modules:
+        del sys.modules["colorsys"]
+
+    colorsys = lazy_import("colorsys")
+    assert isinstance(colorsys, LazyModule)
+    assert not colorsys.loaded
+    assert colorsys.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert colorsys.loaded
+
+
+def test_collecting_timeit_tests_skips_the_reporting_stack() -> None:
+    """
+    Demonstrate a startup benchmark. Importing the timeit tests must not import
+    the reporting libraries, which are only needed to plot or tabulate.
+    """
+    measurements = measure_import_time("tests.timeit_test", runs=3)
+
+    print("\nTest Approach: Import Time With -X importtime")
+    print(f"import tests.timeit_test: {total_import_time('tests.timeit_test', measurements) * 1e3:,.1f} ms")
+    print(format_import_times(measurements, top=10))
+
+    imported = {name.partition(".")[0] for name in measurements}
+    assert imported.isdisjoint(REPORTING_MODULES)
+
+    report = import_time_report("tests.timeit_test", measurements)
+    assert len(report["benchmarks"]) == len(measurements)
+    assert all(len(b["stats"]["data"]) <= 3 for b in report["benchmarks"])
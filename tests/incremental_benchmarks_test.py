@@ -0,0 +1,114 @@
+import json
+import subprocess
+import sys
+import textwrap
+
+from examples.incremental_benchmarks import SourceClosure, changed_components, package_version
+from examples.memory_example import generate_fibonacci_hash
+
+LENGTHS = (33, 44, 55)
+
+
+def fibonacci_benchmark() -> int:
+    return generate_fibonacci_hash(*LENGTHS)
+
+
+def test_source_closure_is_transitive() -> None:
+    closure = SourceClosure(".")
+    closure.add(fibonacci_benchmark, "fibonacci_benchmark")
+
+    assert {
+        f"source:{__name__}.fibonacci_benchmark",
+        "source:examples.memory_example.generate_fibonacci_hash",
+        # Called by generate_fibonacci_hash.
+        "source:examples.memory_example.fibonacci",
+        f"value:{__name__}.LENGTHS",
+    } <= set(closure.components)
+    # The standard library is covered by the interpreter version.
+    assert not closure.packages
+
+
+def test_third_party_code_is_identified_by_version() -> None:
+    import numpy as np
+
+    closure = SourceClosure(".")
+    closure.add(np.sum, "sum")
+    assert closure.packages == {"numpy"}
+    assert not closure.components
+    assert package_version("numpy") == f"numpy=={np.__version__}"
+
+
+def test_changed_components() -> None:
+    old = {"source:a": "1", "source:b": "2", "value:c": "3"}
+    new = {"source:a": "1", "source:b": "4", "value:d": "5"}
+    assert changed_components(old, new) == ["source:b", "value:c", "value:d"]
+
+
+def run_pytest(directory) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "pytest",
+            "-p",
+            "examples.incremental_benchmarks",
+            "-p",
+            "no:cacheprovider",
+            "--benchmark-max-time=0.01",
+            "--benchmark-json=report.json",
+            "--incremental-cache=incremental.json",
+        ],
+        cwd=directory,
+        env={"PYTHONPATH": ":".join([str(directory), *sys.path])},
+        capture_output=True,
+        text=True,
+    )
+
+
+def test_plugin_reruns_only_changed_benchmarks(tmp_path) -> None:
+    """
+    Run the benchmarks twice, changing a constant used by one of them in between.
+    """
+    # 1. Create a helper module and benchmarks that call it.
+    (tmp_path / "helpers.py").write_text("SIZE = 100\n\ndef total():\n    return sum(range(SIZE))\n")
+    (tmp_path / "bench_test.py").write_text(
+        textwrap.dedent(
+            """
+            import pytest
+
+            from helpers import total
+
+            @pytest.mark.benchmark(group="Helpers")
+            def test_total(benchmark):
+                benchmark(total)
+
+            @pytest.mark.benchmark(group="Sorting")
+            def test_sorting(benchmark):
+                benchmark(sorted, (3, 1, 2))
+            """
+        )
+    )
+
+    # 2. The first run has nothing cached.
+    process = run_pytest(tmp_path)
+    assert process.returncode == 0, process.stdout
+    assert "Reused 0 cached result(s) and ran 2 benchmark(s)" in process.stdout
+    first = json.loads((tmp_path / "report.json").read_text())["benchmarks"]
+
+    # 3. Change the helper's constant. Only test_total depends on it.
+    (tmp_path / "helpers.py").write_text("SIZE = 200\n\ndef total():\n    return sum(range(SIZE))\n")
+    process = run_pytest(tmp_path)
+    assert process.returncode == 0, process.stdout
+    assert "Reused 1 cached result(s) and ran 1 benchmark(s)" in process.stdout
+    assert "changed: value:helpers.SIZE" in process.stdout
+
+    # 4. The report still covers both benchmarks, test_sorting with its cached rounds.
+    second = {
+        benchmark["name"]: benchmark
+        for benchmark in json.loads((tmp_path / "report.json").read_text())["benchmarks"]
+    }
+    assert set(second) == {"test_total", "test_sorting"}
+    assert second["test_total"]["extra_info"]["incremental"] == {"reused": False}
+    assert second["test_sorting"]["extra_info"]["incremental"]["reused"]
+    cached_sorting = next(benchmark for benchmark in first if benchmark["name"] == "test_sorting")
+    assert second["test_sorting"]["stats"]["data"] == cached_sorting["stats"]["data"]
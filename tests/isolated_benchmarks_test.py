@@ -0,0 +1,122 @@
+import gc
+import json
+import os
+import subprocess
+import sys
+import textwrap
+import time
+
+from examples.isolated_benchmarks import (
+    WorkerTask,
+    check_environment,
+    run_isolated,
+    run_worker,
+    worker_environment,
+)
+from examples.parallel_sweep import available_cpus
+
+
+def make_task(rounds: int = 10, gc_policy: str = "disabled") -> WorkerTask:
+    return WorkerTask(
+        sorted,
+        ((3, 1, 2),),
+        {},
+        iterations=100,
+        rounds=rounds,
+        warmup_rounds=2,
+        gc_policy=gc_policy,
+        timer=time.perf_counter,
+    )
+
+
+def test_environment_check() -> None:
+    noise = check_environment()
+    assert noise.cpus == len(available_cpus())
+    assert noise.noisy == bool(noise.warnings)
+    if noise.governors and set(noise.governors) != {"performance"}:
+        assert noise.noisy
+
+
+def test_worker_restores_gc() -> None:
+    assert gc.isenabled()
+    result = run_worker(make_task(gc_policy="collect"))
+    assert len(result.durations) == 10
+    assert all(duration > 0 for duration in result.durations)
+    assert gc.isenabled()
+
+
+def test_worker_environment_is_controlled(tmp_path) -> None:
+    environment = worker_environment(tmp_path)
+    assert environment["PYTHONHASHSEED"] == "0"
+    assert environment["PYTHONPATH"].startswith(str(tmp_path))
+    assert set(environment) - {"PYTHONHASHSEED", "PYTHONDONTWRITEBYTECODE", "PYTHONPATH"} <= {
+        "PATH", "HOME", "LANG", "TMPDIR", "TEMP", "TMP", "SYSTEMROOT", "VIRTUAL_ENV"
+    }
+
+
+def test_rounds_run_in_fresh_processes() -> None:
+    """
+    Demonstrate splitting a benchmark's rounds across fresh, pinned worker processes.
+    """
+    cpus = available_cpus()[:1] if hasattr(os, "sched_setaffinity") else []
+    results = run_isolated(make_task(rounds=9), workers=3, root=os.getcwd(), cpus=cpus)
+
+    assert len(results) == 3
+    assert sum(len(result.durations) for result in results) == 9
+    assert len({result.pid for result in results}) == 3
+    assert os.getpid() not in {result.pid for result in results}
+    assert all(result.hash_seed == "0" for result in results)
+    if cpus:
+        assert all(result.cpus == cpus for result in results)
+
+
+def test_plugin_reports_worker_rounds(tmp_path) -> None:
+    """
+    Run pytest with the plugin and check the workers' rounds reach the JSON report.
+    """
+    (tmp_path / "bench_test.py").write_text(
+        textwrap.dedent(
+            """
+            import pytest
+
+            @pytest.mark.benchmark(group="Sorting")
+            def test_sorting(benchmark):
+                assert benchmark(sorted, (3, 1, 2)) == [1, 2, 3]
+
+            @pytest.mark.benchmark(group="Sorting")
+            def test_lambda(benchmark):
+                benchmark(lambda: sorted((3, 1, 2)))
+            """
+        )
+    )
+    process = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "pytest",
+            "-p",
+            "examples.isolated_benchmarks",
+            "-p",
+            "no:cacheprovider",
+            "--benchmark-max-time=0.01",
+            "--benchmark-json=report.json",
+            "--isolated-workers=2",
+        ],
+        cwd=tmp_path,
+        env={"PYTHONPATH": ":".join(sys.path)},
+        capture_output=True,
+        text=True,
+    )
+    assert process.returncode == 0, process.stdout
+    assert "isolated benchmarks" in process.stdout
+    assert "can't run in a worker process" in process.stdout
+
+    benchmarks = {
+        benchmark["name"]: benchmark
+        for benchmark in json.loads((tmp_path / "report.json").read_text())["benchmarks"]
+    }
+    isolated = benchmarks["test_sorting"]["extra_info"]["isolated"]
+    assert isolated["workers"] == 2
+    assert isolated["gc"] == "enabled"
+    assert "load_average" in isolated["environment"]
+    assert benchmarks["test_lambda"]["extra_info"]["isolated"] is False
@@ -0,0 +1,122 @@
+import importlib
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+from line_profiler.line_profiler import LineStats
+
+from examples.line_profiling import (
+    LineProfilingSession,
+    hotspot_report,
+    hotspots,
+    parse_names,
+    resolve_target,
+)
+
+MODULE_SOURCE = """
+def total(values):
+    result = 0
+    for value in values:
+        result += value * value
+    return result
+
+
+class Squares:
+    @staticmethod
+    def of(values):
+        return [value * value for value in values]
+
+
+def untouched(values):
+    return sum(values)
+"""
+
+
+def test_parse_names() -> None:
+    assert parse_names(["a.b, c.d", "", "a.b"]) == ["a.b", "c.d"]
+
+
+def test_resolve_target() -> None:
+    target = resolve_target("examples.memory_example.fibonacci")
+    assert target.module == "examples.memory_example"
+    assert target.attributes == ["fibonacci"]
+    assert target.filename.name == "memory_example.py"
+
+    method = resolve_target("examples.contention.ContentionMeasurement.throughput")
+    assert method.attributes == ["ContentionMeasurement", "throughput"]
+
+    with pytest.raises(pytest.UsageError):
+        resolve_target("no_such_package.function")
+
+
+def test_functions_are_instrumented_on_import(tmp_path, monkeypatch) -> None:
+    """
+    Demonstrate line profiling functions in a module without decorating them.
+    """
+    # 1. Name the functions before their module has been imported.
+    (tmp_path / "squares_module.py").write_text(MODULE_SOURCE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    session = LineProfilingSession(
+        [resolve_target("squares_module.total"), resolve_target("squares_module.Squares.of")]
+    )
+    session.install()
+    try:
+        module = importlib.import_module("squares_module")
+    finally:
+        session.uninstall()
+        sys.modules.pop("squares_module", None)
+
+    # 2. Every call accumulates in the one profiler.
+    values = list(range(100))
+    for _ in range(3):
+        assert module.total(values) == sum(value * value for value in values)
+        assert module.Squares.of(values)[-1] == 99 * 99
+    assert module.untouched(values) == sum(values)
+    assert all(target.instrumented for target in session.targets)
+
+    # 3. Rank the lines by their time.
+    lines = hotspots(session.profiler.get_stats(), top=None)
+    print("\nTest Approach: Line Profiling by Name")
+    print(hotspot_report(lines))
+
+    assert {hotspot.function for hotspot in lines} == {"total", "Squares.of"}
+    assert [hotspot.time for hotspot in lines] == sorted((hotspot.time for hotspot in lines), reverse=True)
+    loop = next(hotspot for hotspot in lines if hotspot.source == "result += value * value")
+    assert loop.hits == 300
+
+
+def test_plugin_saves_one_profile(tmp_path) -> None:
+    """
+    Run pytest with the function named in the environment and check the .lprof covers every call.
+    """
+    (tmp_path / "squares_module.py").write_text(MODULE_SOURCE)
+    (tmp_path / "squares_test.py").write_text(
+        textwrap.dedent(
+            """
+            from squares_module import total
+
+            def test_total():
+                for _ in range(5):
+                    total(range(10))
+            """
+        )
+    )
+    process = subprocess.run(
+        [sys.executable, "-m", "pytest", "-p", "examples.line_profiling", "-p", "no:cacheprovider"],
+        cwd=tmp_path,
+        env={
+            "PYTHONPATH": ":".join([str(tmp_path), *sys.path]),
+            "LINE_PROFILE_FUNCTIONS": "squares_module.total",
+            "PATH": os.environ.get("PATH", ""),
+        },
+        capture_output=True,
+        text=True,
+    )
+    assert process.returncode == 0, process.stdout
+    assert "line profile" in process.stdout
+
+    stats = LineStats.from_files(tmp_path / "pytest.lprof")
+    lines = {hotspot.source: hotspot for hotspot in hotspots(stats, top=None)}
+    assert lines["result += value * value"].hits == 50
@@ -0,0 +1,78 @@
+import sys
+
+import pytest
+
+from examples.membership import (
+    STRUCTURES,
+    hit_queries,
+    measure_membership,
+    membership_report,
+    miss_queries,
+)
+from tests.fixtures import MISSING_PERSON, SEED, create_random_names, random_names
+from examples.types import RandomNames
+
+
+@pytest.mark.parametrize("name", STRUCTURES)
+def test_structures_agree_with_set(random_names: RandomNames, name: str) -> None:
+    random_names_list, random_names_set = random_names
+    structure = STRUCTURES[name]
+    built = structure.build(random_names_list)
+
+    queries = (
+        hit_queries(random_names_list, 200, SEED)
+        + miss_queries(random_names_list, 200, SEED)
+        + [MISSING_PERSON, "", "A" * 500]
+    )
+    expected = [query in random_names_set for query in queries]
+    assert [structure.contains(built, query) for query in queries] == expected
+    assert structure.contains_batch(built, queries).tolist() == expected
+
+
+@pytest.mark.parametrize("name", STRUCTURES)
+def test_empty_structures_contain_nothing(name: str) -> None:
+    structure = STRUCTURES[name]
+    built = structure.build([])
+    assert not structure.contains(built, MISSING_PERSON)
+    assert structure.contains_batch(built, [MISSING_PERSON, ""]).tolist() == [False, False]
+
+
+@pytest.mark.parametrize("name", STRUCTURES)
+@pytest.mark.benchmark(group="Membership Miss", disable_gc=True)
+def test_benchmark_miss(benchmark, random_names: RandomNames, name: str) -> None:
+    structure = STRUCTURES[name]
+    built = structure.build(random_names[0])
+    assert not benchmark(structure.contains, built, MISSING_PERSON)
+
+
+@pytest.mark.parametrize("name", STRUCTURES)
+@pytest.mark.benchmark(group="Membership Hit", disable_gc=True)
+def test_benchmark_hit(benchmark, random_names: RandomNames, name: str) -> None:
+    structure = STRUCTURES[name]
+    built = structure.build(random_names[0])
+    assert benchmark(structure.contains, built, random_names[0][len(random_names[0]) // 2])
+
+
+def test_membership_suite() -> None:
+    """
+    Demonstrate comparing build time, memory and lookup latency across structures.
+    """
+    names, _ = create_random_names(100_000)
+    measurements = measure_membership(
+        names, sizes=[1_000, 10_000, 100_000], batch=100_000, repeat=3, seed=SEED
+    )
+
+    print("\nTest Approach: Membership Structures")
+    print(membership_report(measurements))
+
+    by_key = {(m.structure, m.size): m for m in measurements}
+    assert len(measurements) == 3 * len(STRUCTURES)
+    # The memory excludes the str objects the structures share, so a sorted list
+    # costs one pointer per name, a fraction of a set's hash table.
+    assert by_key["bisect", 100_000].memory < by_key["set", 100_000].memory / 2
+    # The sorted array of bytes copies the names, yet is far more compact than a
+    # hash table together with the str objects it keeps alive.
+    set_with_str_objects = by_key["set", 100_000].memory + sum(map(sys.getsizeof, set(names)))
+    assert by_key["searchsorted", 100_000].memory < set_with_str_objects / 2
+    # Vectorized batch lookups amortize NumPy's per call overhead.
+    assert by_key["searchsorted", 100_000].batch_time < by_key["searchsorted", 100_000].miss_time
@@ -0,0 +1,91 @@
+import json
+import subprocess
+import sys
+import textwrap
+from collections import Counter
+
+from examples.memory_baseline_plugin import (
+    MemoryPeak,
+    exceeds_budget,
+    format_growth,
+    grown_sites,
+)
+
+
+def test_budget_and_grown_sites() -> None:
+    baseline = MemoryPeak(
+        8_000_000, Counter({"wasteful_func:memory_test.py:14": 8_000_000})
+    )
+    current = MemoryPeak(
+        24_000_000,
+        Counter(
+            {
+                "wasteful_func:memory_test.py:14": 8_000_000,
+                "wasteful_func:memory_test.py:15": 16_000_000,
+            }
+        ),
+    )
+    assert exceeds_budget(baseline, current, tolerance=0.1, min_growth=65_536)
+    assert not exceeds_budget(baseline, current, tolerance=2.0, min_growth=65_536)
+    assert not exceeds_budget(baseline, baseline, tolerance=0.0, min_growth=0)
+    assert grown_sites(baseline, current) == [("wasteful_func:memory_test.py:15", 16_000_000)]
+    assert "+15.3MiB wasteful_func:memory_test.py:15" in "\n".join(
+        format_growth(baseline, current, 0.1)
+    )
+
+
+def test_plugin_fails_when_memory_grows(tmp_path) -> None:
+    """
+    Record a baseline, then double a temporary allocation and check against it.
+    """
+    (tmp_path / "allocation_test.py").write_text(
+        textwrap.dedent(
+            """
+            import os
+
+            def wasteful_func():
+                a = [0] * int(1e6)
+                b = [0] * int(float(os.environ["TEMPORARY_SIZE"]))
+                del b
+                return a
+
+            def test_array_allocation():
+                assert len(wasteful_func()) == 1e6
+            """
+        )
+    )
+    baseline = tmp_path / "memory_baseline.json"
+
+    def run_pytest(temporary_size: str, *args: str) -> subprocess.CompletedProcess:
+        return subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "pytest",
+                "--memray",
+                "-p",
+                "examples.memory_baseline_plugin",
+                "-p",
+                "no:cacheprovider",
+                f"--memory-baseline={baseline}",
+                *args,
+            ],
+            cwd=tmp_path,
+            env={"TEMPORARY_SIZE": temporary_size, "PYTHONPATH": ":".join(sys.path)},
+            capture_output=True,
+            text=True,
+        )
+
+    saved = run_pytest("1e6", "--memory-baseline-save")
+    assert saved.returncode == 0, saved.stdout
+    peaks = json.loads(baseline.read_text())
+    assert list(peaks) == ["allocation_test.py::test_array_allocation"]
+
+    unchanged = run_pytest("1e6")
+    assert unchanged.returncode == 0, unchanged.stdout
+    assert "No tests exceeded their memory budget." in unchanged.stdout
+
+    grown = run_pytest("2e6")
+    assert grown.returncode == 1, grown.stdout
+    assert "1 test(s) exceeded their memory budget" in grown.stdout
+    assert "allocation_test.py:6" in grown.stdout
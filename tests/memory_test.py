@@ -1,5 +1,15 @@
 import pytest
 
+import time
+import tracemalloc
+
+from examples.memory_example import HASH_IMPLEMENTATIONS, generate_fibonacci_hash
+from examples.types import TimeInNS
+
+# The sequence lengths used by examples/memory_example.py.
+FIBONACCI_LENGTHS: tuple[int, int, int] = (33333, 30000, 34567)
+
+
 def wasteful_func():
     a = [0] * int(1e6)
     b = [0] * int(2e6)
@@ -14,4 +24,57 @@ def test_array_allocation() -> None:
     See the profile_memory make target.
     """
     large_list = wasteful_func()
-    assert len(large_list) == 1e6
\ No newline at end of file
+    assert len(large_list) == 1e6
+
+
+@pytest.mark.parametrize("implementation", ["streaming", "modular"])
+def test_fibonacci_hashes_match_the_reference(implementation: str) -> None:
+    hash_func = HASH_IMPLEMENTATIONS[implementation]
+    for lengths in [(0, 0, 0), (1, 2, 3), (-1, 5, 63), (64, 65, 200), (1000, 1, 999)]:
+        assert hash_func(*lengths) == generate_fibonacci_hash(*lengths)
+    assert hash_func(*FIBONACCI_LENGTHS) == generate_fibonacci_hash(*FIBONACCI_LENGTHS)
+
+
+@pytest.mark.limit_memory("1 MB")
+@pytest.mark.parametrize("implementation", ["streaming", "modular"])
+def test_fibonacci_hash_memory_limit(implementation: str) -> None:
+    """
+    Fails under pytest --memray if the implementation materializes the sequences.
+    """
+    HASH_IMPLEMENTATIONS[implementation](*FIBONACCI_LENGTHS)
+
+
+def test_fibonacci_hash_time_and_peak_memory() -> None:
+    """
+    Demonstrate comparing the time and peak memory of each hash implementation.
+    """
+    results: dict[str, tuple[TimeInNS, int]] = {}
+    for name, hash_func in HASH_IMPLEMENTATIONS.items():
+        # 1. Time the implementation without tracing allocations.
+        start: TimeInNS = time.perf_counter_ns()
+        hash_func(*FIBONACCI_LENGTHS)
+        elapsed: TimeInNS = time.perf_counter_ns() - start
+
+        # 2. Measure the peak memory in a separate traced run.
+        tracemalloc.start()
+        hash_func(*FIBONACCI_LENGTHS)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[name] = (elapsed, peak)
+
+    print("\nTest Approach: Fibonacci Hash Implementations")
+    print("{:<12} {:>14} {:>18}".format("", "Time (ms)", "Peak Memory (KB)"))
+    for name, (elapsed, peak) in results.items():
+        print(f"{name:<12} {elapsed / 1e6:>14,.3f} {peak / 1024:>18,.1f}")
+
+    reference_peak = results["reference"][1]
+    assert results["streaming"][1] < reference_peak / 100
+    assert results["modular"][1] < reference_peak / 1000
+    assert results["modular"][0] < results["reference"][0]
+
+
+@pytest.mark.parametrize("implementation", HASH_IMPLEMENTATIONS)
+@pytest.mark.benchmark(group="Fibonacci Hash")
+def test_benchmark_fibonacci_hash(benchmark, implementation: str) -> None:
+    result = benchmark(HASH_IMPLEMENTATIONS[implementation], *FIBONACCI_LENGTHS)
+    assert result == 4657
@@ -0,0 +1,71 @@
+import time
+
+from examples.name_cache import CachedNames, NameCache
+from examples.types import TimeInNS
+from tests.fixtures import generate_fake_names
+
+
+def test_cache_round_trip(tmp_path) -> None:
+    """
+    Demonstrate that names, including non-ASCII names, survive the cache.
+    """
+    names = ["Ada Lovelace", "José Núñez", "Zoë Ærø", ""]
+    cache = NameCache(tmp_path)
+    cache.store("manual", len(names), 0, names)
+
+    cached = cache.load("manual", len(names), 0, create=None)
+    assert isinstance(cached, CachedNames)
+    assert len(cached) == len(names)
+    assert cached.to_list() == names
+    assert cached.to_list(2) == names[:2]
+    assert cached[1] == "José Núñez"
+    assert cached[-2] == "Zoë Ærø"
+    assert cached[1:3] == names[1:3]
+
+
+def test_cache_only_generates_once(tmp_path) -> None:
+    """
+    Demonstrate that a warm cache skips the generator and returns the same data.
+    """
+    calls: list[tuple[int, int]] = []
+
+    def generator(size: int, seed: int) -> list[str]:
+        calls.append((size, seed))
+        return generate_fake_names(size, seed)
+
+    cache = NameCache(tmp_path)
+
+    cold_start: TimeInNS = time.perf_counter_ns()
+    cold = cache.load("faker", 5_000, 7, generator).to_list()
+    cold_time: TimeInNS = time.perf_counter_ns() - cold_start
+
+    warm_start: TimeInNS = time.perf_counter_ns()
+    warm = cache.load("faker", 5_000, 7, generator).to_list()
+    warm_time: TimeInNS = time.perf_counter_ns() - warm_start
+
+    assert calls == [(5_000, 7)]
+    assert cold == warm
+
+    print("\nTest Approach: Seeded On-Disk Name Cache")
+    print(f"Cold load took: {cold_time:,} nanoseconds")
+    print(f"Warm load took: {warm_time:,} nanoseconds")
+
+
+def test_seeded_generation_is_repeatable() -> None:
+    assert generate_fake_names(100, 1) == generate_fake_names(100, 1)
+    assert generate_fake_names(100, 1) != generate_fake_names(100, 2)
+
+
+def test_cache_chunked_store(tmp_path) -> None:
+    """
+    Demonstrate caching a data set that arrives in chunks.
+    """
+    chunks = [["Ann Lee", "Bob Ray"], [], ["Cy Young"]]
+    cache = NameCache(tmp_path)
+    cache.store_chunks("chunks", 3, 0, chunks)
+    assert cache.load("chunks", 3, 0, create=None).to_list() == [
+        "Ann Lee",
+        "Bob Ray",
+        "Cy Young",
+    ]
+    assert list(tmp_path.glob("*.tmp")) == []
@@ -0,0 +1,57 @@
+import time
+
+from examples.name_generator import (
+    BulkNameGenerator,
+    create_random_names,
+    stream_random_names,
+)
+from examples.types import TimeInNS
+from tests.fixtures import generate_fake_names
+
+
+def test_bulk_names_are_drop_in() -> None:
+    """
+    Demonstrate that the bulk generator returns the same shape as the fixtures.
+    """
+    names_seq, names_set = create_random_names(1_000, seed=3)
+    assert len(names_seq) == 1_000
+    assert set(names_seq) == names_set
+    assert all(isinstance(name, str) and " " in name for name in names_seq)
+
+
+def test_chunking_does_not_change_the_names() -> None:
+    generator = BulkNameGenerator()
+    expected = generator.generate(2_500, seed=11)
+
+    chunks = list(generator.chunks(2_500, seed=11, chunk_size=1_000))
+    assert [len(chunk) for chunk in chunks] == [1_000, 1_000, 500]
+    assert [name for chunk in chunks for name in chunk] == expected
+    assert generator.generate(2_500, seed=12) != expected
+
+
+def test_streaming_names() -> None:
+    streamed = sum(len(chunk) for chunk in stream_random_names(10_500, chunk_size=1_000))
+    assert streamed == 10_500
+
+
+def test_bulk_vs_faker_loop() -> None:
+    """
+    Compare the bulk generator against calling Faker.name() in a loop.
+    """
+    size = 20_000
+    generator = BulkNameGenerator()
+
+    loop_start: TimeInNS = time.perf_counter_ns()
+    generate_fake_names(size, seed=1)
+    loop_time: TimeInNS = time.perf_counter_ns() - loop_start
+
+    bulk_start: TimeInNS = time.perf_counter_ns()
+    generator.generate(size, seed=1)
+    bulk_time: TimeInNS = time.perf_counter_ns() - bulk_start
+
+    assert bulk_time < loop_time
+
+    print("\nTest Approach: Bulk Name Generation vs Faker.name() Loop")
+    print(f"Faker loop took: {loop_time:,} nanoseconds")
+    print(f"Bulk generator took: {bulk_time:,} nanoseconds")
+    print(f"Speed up: {loop_time / bulk_time:,.1f}x")
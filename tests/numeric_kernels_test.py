@@ -0,0 +1,79 @@
+"""
+A throughput benchmark of bulk money kernels across numeric types. Each
+benchmark records its drift from the exact result, in dollars, in extra_info.
+
+Set NUMERIC_KERNEL_SIZE to change the number of values, 10,000 by default.
+"""
+
+import os
+
+import pytest
+
+from examples.numeric_kernels import (
+    BACKENDS,
+    KERNELS,
+    drift,
+    exact_results,
+    generate_money,
+    kernel_report,
+    measure_kernels,
+)
+from tests.fixtures import SEED
+
+NUMERIC_KERNEL_SIZE: int = int(os.environ.get("NUMERIC_KERNEL_SIZE", "10000"))
+EXACT_BACKENDS: tuple[str, ...] = ("decimal", "fraction", "fixed", "numpy_int64")
+
+
+@pytest.fixture(scope="module")
+def money():
+    data = generate_money(NUMERIC_KERNEL_SIZE, SEED)
+    return data, exact_results(data)
+
+
+@pytest.mark.parametrize("kernel", KERNELS)
+@pytest.mark.parametrize("name", BACKENDS)
+@pytest.mark.benchmark(disable_gc=True, max_time=0.1)
+def test_benchmark_kernel(benchmark, money, name: str, kernel: str) -> None:
+    data, exact = money
+    backend = BACKENDS[name]
+    prepared = backend.prepare(data)
+    benchmark.group = f"Numeric Kernel: {kernel}"
+    result = benchmark(backend.kernels[kernel], prepared)
+    benchmark.extra_info["drift"] = drift(backend, result, exact[kernel])
+    benchmark.extra_info["ops_per_second"] = (
+        NUMERIC_KERNEL_SIZE / benchmark.stats.stats.min if benchmark.stats else None
+    )
+
+
+def test_round_half_even() -> None:
+    fixed = BACKENDS["fixed"]
+    numpy_int = BACKENDS["numpy_int64"]
+    # Prices whose tax lands exactly on half a cent: 35.5, 106.5, 177.5 and 248.5 cents.
+    data = generate_money(4, SEED)
+    data.cents[:] = [400, 1_200, 2_000, 2_800]
+    assert fixed.kernels["round"](fixed.prepare(data)) == 36 + 106 + 178 + 248
+    assert numpy_int.kernels["round"](numpy_int.prepare(data)) == 36 + 106 + 178 + 248
+    assert exact_results(data)["round"] * 100 == 36 + 106 + 178 + 248
+
+
+def test_numeric_kernel_suite() -> None:
+    """
+    Demonstrate the cost of exactness: the exact backends never drift, the floats do.
+    """
+    measurements = measure_kernels([1_000, 10_000], repeat=3, seed=SEED)
+
+    print("\nTest Approach: Bulk Numeric Kernels")
+    print(kernel_report(measurements))
+
+    by_key = {(m.backend, m.kernel, m.size): m for m in measurements}
+    assert len(measurements) == 2 * len(BACKENDS) * len(KERNELS)
+    for name in EXACT_BACKENDS:
+        for kernel in KERNELS:
+            assert by_key[name, kernel, 10_000].drift == 0
+    # Rounding the binary approximation of a half cent goes the wrong way.
+    assert by_key["float", "round", 10_000].drift > 0
+    # Vectorized integers are exact and faster than any pure Python backend.
+    assert (
+        by_key["numpy_int64", "sum", 10_000].ops_per_second
+        > by_key["fixed", "sum", 10_000].ops_per_second
+    )
@@ -0,0 +1,53 @@
+import os
+import time
+
+import pytest
+
+from examples.parallel_sweep import available_cpus, parallel_sweep, time_membership
+from examples.types import TimeInNS
+from tests.fixtures import MISSING_PERSON, cached_random_names
+
+
+def test_parallel_sweep_matches_size_order() -> None:
+    """
+    Demonstrate running a list vs set sweep on a process pool.
+
+    The results come back in the order of the sample sizes.
+    """
+    names = cached_random_names(10_000)
+    sizes = [8_000, 100, 4_000, 2_000]
+
+    start: TimeInNS = time.perf_counter_ns()
+    results = parallel_sweep(names, sizes, MISSING_PERSON, num_iterations=50, workers=2)
+    elapsed: TimeInNS = time.perf_counter_ns() - start
+
+    assert len(results) == len(sizes)
+    avg_list_times = [result[0] for result in results]
+    # The list search is linear, so each result is matched to its size when the
+    # 8,000 name search is many times slower than the 100 name one. Sizes only 2x
+    # apart are too close to order reliably with 50 iterations.
+    list_time_by_size = dict(zip(sizes, avg_list_times))
+    assert list_time_by_size[8_000] > 5 * list_time_by_size[100]
+    assert all(avg_set < avg_list for avg_list, avg_set in results)
+
+    print("\nTest Approach: Parallel Sweep With a Process Pool")
+    print(f"Sweep over {len(sizes)} sizes took: {elapsed:,} nanoseconds")
+
+
+@pytest.mark.skipif(
+    not hasattr(os, "sched_setaffinity"), reason="CPU pinning requires Linux."
+)
+def test_parallel_sweep_with_pinned_cpus() -> None:
+    names = cached_random_names(10_000)
+    workers = min(2, len(available_cpus()))
+    results = parallel_sweep(
+        names, [100, 200], MISSING_PERSON, 10, workers=workers, pin_cpus=True
+    )
+    assert len(results) == 2
+
+
+def test_time_membership() -> None:
+    avg_list_time, avg_set_time = time_membership(
+        cached_random_names(10_000).to_list(), MISSING_PERSON, 100
+    )
+    assert avg_set_time < avg_list_time
@@ -6,7 +6,11 @@ from pstats import SortKey, Stats
 from random import uniform
 from time import sleep
 
+from examples.concurrency import STRATEGIES
+from examples.concurrency import numeric_process as concurrent_numeric_process
 from examples.types import TimeInSec
+from examples.virtual_clock import VirtualClock
+from tests.fixtures import virtual_clock
 
 
 def numeric_process() -> None:
@@ -27,9 +31,20 @@ def perform_calculation() -> None:
     return wait_time
 
 
-def test_profile_make_numbers() -> None:
+def report_simulated_latency(benchmark, clock: VirtualClock) -> None:
+    """
+    Record the sleeping skipped by the virtual clock alongside the benchmark's timings.
+    """
+    if clock.sleep_calls:
+        benchmark.extra_info["simulated_sleep_calls"] = clock.sleep_calls
+        benchmark.extra_info["simulated_sleep_per_call"] = clock.simulated / clock.sleep_calls
+
+
+def test_profile_make_numbers(virtual_clock: VirtualClock) -> None:
     """
     Demonstrate manually profiling a function with cProfile.
+
+    Run with VIRTUAL_TIME=1 to profile only the CPU-bound work.
     """
     with Profile() as profile:
         numeric_process()
@@ -37,10 +52,25 @@ def test_profile_make_numbers() -> None:
 
 
 @pytest.mark.benchmark(group="Making Numbers", disable_gc=True)
-def test_benchmark_make_numbers(benchmark) -> None:
+def test_benchmark_make_numbers(benchmark, virtual_clock: VirtualClock) -> None:
     """
     Demonstrate using pytest-benchmark with cProfile.
 
     Note: See the Makefile target "profile_benchmark"
     """
     benchmark(numeric_process)
+    report_simulated_latency(benchmark, virtual_clock)
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+@pytest.mark.benchmark(group="Making Numbers Concurrently", disable_gc=True)
+def test_benchmark_make_numbers_concurrently(
+    benchmark, virtual_clock: VirtualClock, strategy: str
+) -> None:
+    """
+    Demonstrate benchmarking the same I/O-bound process with each execution strategy.
+
+    Note: Use the Makefile target "compare_concurrency" for the scaling sweep.
+    """
+    benchmark(concurrent_numeric_process, strategy)
+    report_simulated_latency(benchmark, virtual_clock)
@@ -3,6 +3,8 @@ from time import sleep
 from line_profiler import profile
 
 from examples.types import TimeInSec
+from examples.virtual_clock import VirtualClock
+from tests.fixtures import virtual_clock
 
 
 # @profile
@@ -29,5 +31,5 @@ def perform_calculation() -> None:
 
 
 class TestWithLineProfiler:
-    def test_line_profiler(self) -> None:
+    def test_line_profiler(self, virtual_clock: VirtualClock) -> None:
         numeric_process()
@@ -0,0 +1,143 @@
+import json
+import textwrap
+
+import pytest
+
+from examples.profiling_session import (
+    _builtin_name,
+    hotspot_table,
+    normalize,
+    profile_target,
+    target_kind,
+)
+
+MEMORY_EXAMPLE = "examples/memory_example.py"
+
+
+def test_target_kind() -> None:
+    assert target_kind(["tests/memory_test.py::test_array_allocation"]) == "pytest"
+    assert target_kind(["tests/memory_test.py"]) == "pytest"
+    assert target_kind([MEMORY_EXAMPLE, "streaming"]) == "script"
+    assert target_kind(["-m", "examples.hello"]) == "module"
+    with pytest.raises(ValueError):
+        target_kind(["README.md"])
+
+
+def test_functions_are_identified_the_same_way() -> None:
+    # cProfile, pyinstrument and line_profiler report a function's first line.
+    filename, line, function = normalize(MEMORY_EXAMPLE, 16, "fibonacci")
+    assert filename.endswith(MEMORY_EXAMPLE) and (line, function) == (16, "fibonacci")
+    # memray reports the line that allocated.
+    assert normalize(MEMORY_EXAMPLE, 28, "fibonacci", exact=False) == (filename, 16, "fibonacci")
+    # cProfile names built-ins differently than pyinstrument.
+    assert _builtin_name("<built-in method time.sleep>") == "sleep"
+    assert _builtin_name("<method 'append' of 'list' objects>") == "list.append"
+
+
+def test_profile_script(tmp_path) -> None:
+    """
+    Demonstrate merging every profiler's view of a script into one table.
+    """
+    # 1. Run examples/memory_example.py under each profiler.
+    report = profile_target([MEMORY_EXAMPLE, "reference"], directory=tmp_path, line_functions=1)
+
+    print("\nTest Approach: One Hotspot Table from Five Profilers")
+    print(hotspot_table(report, top=10))
+
+    # 2. fibonacci is the hottest function in every profiler's view.
+    assert report.profilers == ["cprofile", "pyinstrument", "scalene", "line_profiler", "memray"]
+    fibonacci = report.ranked("self")[0]
+    assert fibonacci.function == "fibonacci"
+    assert fibonacci.calls == 3
+    assert fibonacci.self_time > 0 and fibonacci.sampled_time > 0
+    assert fibonacci.python_time + fibonacci.native_time > 0
+    assert max(fibonacci.line_hotspots, key=lambda hotspot: hotspot.time).source == (
+        "output.append(output[i] + output[i + 1])"
+    )
+    # It holds three lists of ~30,000 large integers at the peak.
+    assert fibonacci.peak_memory > 50 * 1024 * 1024
+    assert report.ranked("memory_self")[0].function == "fibonacci"
+
+    # 3. The merged table can be exported.
+    exported = json.loads(report.to_json())
+    assert exported["functions"][0]["function"] == "fibonacci"
+    assert exported["outputs"]["memray"].endswith(".bin")
+
+
+def test_profile_test_with_named_lines(tmp_path, monkeypatch) -> None:
+    (tmp_path / "squares_module.py").write_text(
+        textwrap.dedent(
+            """
+            def total(values):
+                result = 0
+                for value in values:
+                    result += value * value
+                return result
+            """
+        )
+    )
+    (tmp_path / "squares_test.py").write_text(
+        textwrap.dedent(
+            """
+            from squares_module import total
+
+            def test_total():
+                for _ in range(100):
+                    total(range(1_000))
+            """
+        )
+    )
+    monkeypatch.chdir(tmp_path)
+    report = profile_target(
+        ["squares_test.py::test_total"],
+        profilers=["cprofile", "line_profiler"],
+        directory=tmp_path,
+        lines=["squares_module.total"],
+    )
+
+    total = next(function for function in report.functions if function.function == "total")
+    assert total.calls == 100
+    assert total.profilers == ["cprofile", "line_profiler"]
+    lines = {hotspot.source: hotspot for hotspot in total.line_hotspots}
+    assert lines["result += value * value"].hits == 100_000
+
+
+def test_line_profile_script_method_calling_super(tmp_path, monkeypatch) -> None:
+    (tmp_path / "shapes.py").write_text(
+        textwrap.dedent(
+            """
+            class Shape:
+                def area(self):
+                    return 0
+
+            class Square(Shape):
+                def __init__(self, side):
+                    self.side = side
+
+                def area(self):
+                    base = super().area()
+                    return base + self.side * self.side
+
+            if __name__ == "__main__":
+                print(sum(Square(side).area() for side in range(1_000)))
+            """
+        )
+    )
+    monkeypatch.chdir(tmp_path)
+    report = profile_target(
+        ["shapes.py"],
+        profilers=["line_profiler"],
+        directory=tmp_path,
+        lines=["shapes.Square.area"],
+    )
+
+    area = next(function for function in report.functions if function.function == "Square.area")
+    lines = {hotspot.source: hotspot for hotspot in area.line_hotspots}
+    assert lines["base = super().area()"].hits == 1_000
+
+    # A failing worker is reported as an error rather than a traceback.
+    (tmp_path / "broken.py").write_text('raise RuntimeError("broken target")\n')
+    with pytest.raises(ValueError, match="RuntimeError: broken target"):
+        profile_target(
+            ["broken.py"], profilers=["line_profiler"], directory=tmp_path, lines=["broken.f"]
+        )
@@ -0,0 +1,90 @@
+import subprocess
+import sys
+import textwrap
+
+import numpy as np
+
+from examples.regression_plugin import find_regressions, format_report, parse_tolerance
+from tests.fixtures import SEED
+
+
+def make_rounds(median: float, size: int = 500, seed: int = SEED) -> list[float]:
+    rng = np.random.default_rng(seed)
+    return (median * rng.lognormal(mean=0, sigma=0.05, size=size)).tolist()
+
+
+def test_regressions_respect_group_tolerances() -> None:
+    """
+    Demonstrate gating benchmarks on a statistically significant slowdown.
+    """
+    baseline = {
+        "lists": {"group": "List vs Tuple Initialization", "data": make_rounds(100e-9)},
+        "numbers": {"group": "Making Numbers", "data": make_rounds(0.75)},
+    }
+    current = {
+        # 6% slower but the group only allows 3%.
+        "lists": ("List vs Tuple Initialization", make_rounds(106e-9, seed=SEED + 1)),
+        # 6% slower but the group allows 10%.
+        "numbers": ("Making Numbers", make_rounds(0.795, seed=SEED + 1)),
+    }
+    tolerances = dict(
+        [
+            parse_tolerance("List vs Tuple Initialization=3%"),
+            parse_tolerance("Making Numbers=10%"),
+        ]
+    )
+
+    regressions = find_regressions(baseline, current, tolerances)
+    assert [regression.fullname for regression in regressions] == ["lists"]
+
+    print("\nTest Approach: Statistically Gated Regression Check")
+    print("\n".join(format_report(regressions)))
+
+
+def test_noisy_rounds_do_not_fail() -> None:
+    """
+    A handful of very slow rounds doesn't move the ranks or the median.
+    """
+    baseline = {"lists": {"group": "Lists", "data": make_rounds(100e-9)}}
+    noisy = make_rounds(100e-9, seed=SEED + 1)
+    noisy[:10] = [10e-6] * 10
+    assert find_regressions(baseline, {"lists": ("Lists", noisy)}, {}) == []
+
+
+def test_plugin_fails_the_run(tmp_path) -> None:
+    """
+    Run pytest with the plugin against a baseline of a much faster benchmark.
+    """
+    (tmp_path / "bench_test.py").write_text(
+        textwrap.dedent(
+            """
+            import os
+            import time
+
+            import pytest
+
+            @pytest.mark.benchmark(group="Sleepy")
+            def test_sleepy(benchmark):
+                benchmark(time.sleep, float(os.environ["SLEEP"]))
+            """
+        )
+    )
+    options = ["--benchmark-min-rounds=15", "--benchmark-max-time=0.01", "-p", "no:cacheprovider"]
+
+    def run_pytest(sleep: str, *args: str) -> subprocess.CompletedProcess:
+        return subprocess.run(
+            [sys.executable, "-m", "pytest", "-p", "examples.regression_plugin", *options, *args],
+            cwd=tmp_path,
+            env={"SLEEP": sleep, "PYTHONPATH": ":".join(sys.path)},
+            capture_output=True,
+            text=True,
+        )
+
+    saved = run_pytest("0.001", "--benchmark-json=baseline.json")
+    assert saved.returncode == 0, saved.stdout
+
+    checked = run_pytest(
+        "0.003", "--regression-baseline=baseline.json", "--regression-tolerance=Sleepy=10%"
+    )
+    assert checked.returncode == 1
+    assert "1 benchmark(s) regressed against the baseline" in checked.stdout
@@ -0,0 +1,97 @@
+"""
+A parametrized benchmark matrix of container and record representations.
+Each benchmark records its representation's bytes per element in extra_info.
+
+Every benchmark is capped at 0.1 seconds of rounds to keep the matrix quick.
+Set REPRESENTATION_COUNTS, e.g. REPRESENTATION_COUNTS=10,1000000,10000000,
+to benchmark other element counts.
+"""
+
+import os
+
+import pytest
+
+from examples.representations import (
+    REPRESENTATIONS,
+    SOURCES,
+    bytes_per_element,
+    measure_representations,
+    representation_report,
+)
+from tests.fixtures import SEED
+
+COUNTS: list[int] = [
+    int(count) for count in os.environ.get("REPRESENTATION_COUNTS", "10,10000").split(",")
+]
+
+
+@pytest.fixture(scope="module", params=COUNTS, ids=lambda count: f"{count:,}")
+def sources(request) -> tuple[int, dict]:
+    return request.param, {kind: source(request.param) for kind, source in SOURCES.items()}
+
+
+@pytest.mark.parametrize("name", REPRESENTATIONS)
+def test_representations_agree(name: str) -> None:
+    representation = REPRESENTATIONS[name]
+    source = SOURCES[representation.kind](100)
+    built = representation.build(source)
+    assert len(built) == 100
+    expected = 42 if representation.kind == "container" else source[42][1]
+    assert representation.access(built, 42) == expected
+
+
+@pytest.mark.parametrize("name", REPRESENTATIONS)
+@pytest.mark.benchmark(disable_gc=True, max_time=0.1)
+def test_benchmark_construction(benchmark, sources, name: str) -> None:
+    count, data = sources
+    representation = REPRESENTATIONS[name]
+    source = data[representation.kind]
+    benchmark.group = f"Construction: {count:,} Elements"
+    benchmark.extra_info["bytes_per_element"] = bytes_per_element(representation, source)
+    benchmark(representation.build, source)
+
+
+@pytest.mark.parametrize("name", REPRESENTATIONS)
+@pytest.mark.benchmark(disable_gc=True, max_time=0.1)
+def test_benchmark_access(benchmark, sources, name: str) -> None:
+    count, data = sources
+    representation = REPRESENTATIONS[name]
+    built = representation.build(data[representation.kind])
+    benchmark.group = f"Access: {count:,} Elements"
+    benchmark(representation.access, built, count // 2)
+
+
+@pytest.mark.parametrize("name", REPRESENTATIONS)
+@pytest.mark.benchmark(disable_gc=True, max_time=0.1)
+def test_benchmark_iteration(benchmark, sources, name: str) -> None:
+    count, data = sources
+    representation = REPRESENTATIONS[name]
+    built = representation.build(data[representation.kind])
+    benchmark.group = f"Iteration: {count:,} Elements"
+    benchmark(representation.iterate, built)
+
+
+def test_representation_suite() -> None:
+    """
+    Demonstrate comparing construction, access, iteration and memory across representations.
+    """
+    measurements = measure_representations([10, 1_000, 100_000], repeat=3, seed=SEED)
+
+    print("\nTest Approach: Container and Record Representations")
+    print(representation_report(measurements))
+
+    by_key = {(m.representation, m.count): m for m in measurements}
+    assert len(measurements) == 3 * len(REPRESENTATIONS)
+    # Packed arrays don't need an int object per element.
+    assert by_key["array", 100_000].bytes_per_element < by_key["list", 100_000].bytes_per_element
+    assert by_key["numpy", 100_000].bytes_per_element < by_key["list", 100_000].bytes_per_element
+    # __slots__ drops the per instance __dict__.
+    assert (
+        by_key["slots_class", 100_000].bytes_per_element
+        < by_key["plain_class", 100_000].bytes_per_element
+    )
+    assert (
+        by_key["slots_dataclass", 100_000].bytes_per_element
+        < by_key["dataclass", 100_000].bytes_per_element
+    )
+    assert by_key["dict", 100_000].bytes_per_element > by_key["slots_class", 100_000].bytes_per_element
@@ -0,0 +1,110 @@
+import time
+
+import numpy as np
+import pytest
+
+from examples.result_store import ResultStore, detect_change_points
+from examples.types import TimeInNS
+from tests.fixtures import SEED
+
+GROUP = "Numerical Initialization"
+
+
+def make_report(
+    run: int,
+    medians: dict[str, float],
+    rng: np.random.Generator,
+    module: str = "tests/benchmarks_test.py",
+) -> dict:
+    """
+    Build a report in the same shape as pytest-benchmark's --benchmark-json output.
+    """
+    benchmarks = []
+    for name, median in medians.items():
+        data = rng.normal(loc=median, scale=median * 0.01, size=100)
+        benchmarks.append(
+            {
+                "group": GROUP,
+                "name": name,
+                "fullname": f"{module}::{name}",
+                "stats": {
+                    "min": data.min(),
+                    "max": data.max(),
+                    "mean": data.mean(),
+                    "median": float(np.median(data)),
+                    "stddev": data.std(),
+                    "iqr": 0.0,
+                    "ops": 1 / data.mean(),
+                    "rounds": len(data),
+                    "iterations": 1,
+                    "data": data.tolist(),
+                },
+            }
+        )
+    return {
+        "machine_info": {"node": "bench-01", "python_version": "3.12.5", "cpu": {}},
+        "commit_info": {"id": f"{run:040x}", "branch": "main", "dirty": False},
+        "datetime": f"2024-10-{run % 28 + 1:02d}T00:00:00",
+        "benchmarks": benchmarks,
+    }
+
+
+def test_history_and_regression_detection(tmp_path) -> None:
+    """
+    Demonstrate storing benchmark runs and detecting when a group regresses.
+    """
+    rng = np.random.default_rng(SEED)
+    with ResultStore(tmp_path / "results.db") as store:
+        # test_decimals becomes 20% slower from the 41st run onwards.
+        for run in range(60):
+            decimals = 1.2e-6 if run < 40 else 1.44e-6
+            store.ingest(make_report(run, {"test_ints": 1.5e-7, "test_decimals": decimals}, rng))
+
+        start: TimeInNS = time.perf_counter_ns()
+        history = store.history("test_decimals", limit=50)
+        elapsed: TimeInNS = time.perf_counter_ns() - start
+
+        assert len(history) == 50
+        assert history[-1].run_id == 60
+        assert len(store.samples("test_decimals", history[-1].run_id)) == 100
+
+        regressions = store.regressions(GROUP, limit=50)
+        assert [regression.name for regression in regressions] == ["test_decimals"]
+        assert regressions[0].fullname == "tests/benchmarks_test.py::test_decimals"
+        assert regressions[0].run_id == 41
+        assert 0.15 < regressions[0].change < 0.25
+
+    print("\nTest Approach: Historical Result Store")
+    print(f"Querying 50 runs took: {elapsed:,} nanoseconds")
+    print(f"test_decimals regressed by {regressions[0].change:.1%} at run {regressions[0].run_id}")
+
+
+def test_same_named_benchmarks_are_kept_apart(tmp_path) -> None:
+    rng = np.random.default_rng(SEED)
+    with ResultStore(tmp_path / "results.db") as store:
+        # Only the test_ints in other_test.py becomes slower.
+        for run in range(30):
+            store.ingest(make_report(run, {"test_ints": 1.5e-7}, rng))
+            other = 1.5e-7 if run < 20 else 3e-7
+            store.ingest(make_report(run, {"test_ints": other}, rng, module="tests/other_test.py"))
+
+        with pytest.raises(ValueError, match="ambiguous"):
+            store.history("test_ints")
+        history = store.history("tests/benchmarks_test.py::test_ints", limit=10)
+        assert len(history) == 10
+        assert all(point.median < 2e-7 for point in history)
+        assert len(store.samples("tests/other_test.py::test_ints", history[-1].run_id + 1)) == 100
+
+        regressions = store.regressions(GROUP, limit=60)
+        assert [regression.fullname for regression in regressions] == [
+            "tests/other_test.py::test_ints"
+        ]
+
+
+def test_detect_change_points() -> None:
+    rng = np.random.default_rng(SEED)
+    series = np.concatenate(
+        (rng.normal(10, 0.2, 20), rng.normal(12, 0.2, 15), rng.normal(9, 0.2, 15))
+    )
+    assert detect_change_points(series) == [20, 35]
+    assert detect_change_points(rng.normal(10, 0.2, 50)) == []
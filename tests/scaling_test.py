@@ -0,0 +1,67 @@
+from examples.scaling import (
+    complexity_report,
+    fit_complexity,
+    linear_sizes,
+    log_sizes,
+    sweep,
+)
+from tests.fixtures import MISSING_PERSON, create_random_names
+
+
+def test_complexity_of_list_vs_set_search() -> None:
+    """
+    Demonstrate using a scaling sweep to detect how a lookup scales.
+
+    Searching a list for a missing name is linear while searching a set
+    is constant, regardless of the data volume.
+    """
+    master_samples_list, _ = create_random_names(100_000)
+
+    def data_factory(size: int) -> tuple[list[str], set[str]]:
+        samples_list = master_samples_list[:size]
+        return samples_list, set(samples_list)
+
+    results = sweep(
+        benchmarks={
+            "In List": "MISSING_PERSON not in data[0]",
+            "In Set": lambda data: MISSING_PERSON not in data[1],
+        },
+        data_factory=data_factory,
+        sizes=log_sizes(1_000, 100_000, 8),
+        repeat=7,
+        scope={"MISSING_PERSON": MISSING_PERSON},
+    )
+
+    print("\nTest Approach: Scaling Sweep With Complexity Fitting")
+    print(complexity_report(results))
+
+    assert results["In List"].best_fit().complexity == "O(n)"
+    assert results["In Set"].best_fit().complexity == "O(1)"
+    assert all(len(m.samples) == 7 for m in results["In List"].measurements)
+
+
+def test_adaptive_sweep_stops_at_time_budget() -> None:
+    calls: list[int] = []
+
+    def data_factory(size: int) -> int:
+        calls.append(size)
+        return size
+
+    results = sweep(
+        {"Sum": lambda size: sum(range(size))},
+        data_factory,
+        sizes=[10, 100, 1_000_000, 10_000_000],
+        repeat=3,
+        number=1,
+        time_budget=0.001,
+    )
+    assert results["Sum"].sizes == [10, 100, 1_000_000]
+    assert calls == [10, 100, 1_000_000]
+
+
+def test_fit_complexity_on_exact_models() -> None:
+    sizes = log_sizes(10, 1_000_000, 12)
+    assert fit_complexity(sizes, [5.0] * len(sizes))[0].complexity == "O(1)"
+    assert fit_complexity(sizes, [3.0 * n for n in sizes])[0].complexity == "O(n)"
+    assert fit_complexity(sizes, [n * n for n in sizes])[0].complexity == "O(n^2)"
+    assert linear_sizes(100, 300, 100) == [100, 200, 300]
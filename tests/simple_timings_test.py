@@ -1,5 +1,8 @@
+import sys
 import time
 
+from examples.compact_index import CompactNameIndex
+from examples.spans import SpanRecorder
 from examples.types import RandomNames, TimeInNS, TimeInSec
 from tests.fixtures import MISSING_PERSON, random_names
 
@@ -91,3 +94,64 @@ def test_process_time(random_names: RandomNames) -> None:
     print(f"Sequence Search took: {seq_search_time:,} nanoseconds")
     print(f"Set Search took: {set_search_time:,} nanoseconds")
     print(f"Set Search saved {abs(set_search_time - seq_search_time):,} nanoseconds.")
+
+
+def test_spans(random_names: RandomNames) -> None:
+    """
+    Demonstrate measuring with named spans instead of pairs of clock reads.
+    The recorder subtracts the calibrated cost of reading the clock.
+    """
+    # 1. Unpack the random names for readability.
+    random_names_list, random_names_set = random_names
+
+    # 2. Measure worst case scenario lookups in the list and the set.
+    recorder = SpanRecorder(clock="perf_counter")
+    with recorder.span("Sequence Search"):
+        assert MISSING_PERSON not in random_names_list
+
+    with recorder.span("Set Search"):
+        assert MISSING_PERSON not in random_names_set
+
+    # 3. Assert our intuition that the set search is faster than the list search.
+    durations = {name: duration for name, _, duration, _ in recorder.records()}
+    assert durations["Set Search"] < durations["Sequence Search"]
+
+    # 4. Write the results to STDOUT.
+    print("\nTest Approach: Named Spans with a SpanRecorder")
+    print(f"Clock overhead subtracted: {recorder.overhead:,} nanoseconds")
+    for name, duration in durations.items():
+        print(f"{name} took: {duration:,} nanoseconds")
+
+
+def test_compact_index(random_names: RandomNames) -> None:
+    """
+    Demonstrate trading a little lookup speed for a much smaller footprint.
+    A CompactNameIndex packs the names into NumPy arrays instead of str objects.
+    """
+    # 1. Unpack the random names and index them.
+    random_names_list, random_names_set = random_names
+    index = CompactNameIndex.build(random_names_list, bloom_bits_per_name=10)
+
+    # 2. Measure worst case scenario lookups in the list, the set and the index.
+    recorder = SpanRecorder(clock="perf_counter")
+    with recorder.span("Sequence Search"):
+        assert MISSING_PERSON not in random_names_list
+
+    with recorder.span("Set Search"):
+        assert MISSING_PERSON not in random_names_set
+
+    with recorder.span("Compact Index Search"):
+        assert MISSING_PERSON not in index
+
+    # 3. Measure the footprints. The set owns its str objects, the index owns its arrays.
+    set_bytes = sys.getsizeof(random_names_set) + sum(map(sys.getsizeof, random_names_set))
+    durations = {name: duration for name, _, duration, _ in recorder.records()}
+    assert index.nbytes < set_bytes
+    assert durations["Compact Index Search"] < durations["Sequence Search"]
+
+    # 4. Write the results to STDOUT.
+    print("\nTest Approach: A Compact Index vs a Set")
+    for name, duration in durations.items():
+        print(f"{name} took: {duration:,} nanoseconds")
+    print(f"Set footprint: {set_bytes:,} bytes")
+    print(f"Compact Index footprint: {index.nbytes:,} bytes")
@@ -0,0 +1,82 @@
+import json
+import time
+
+from examples.spans import SpanRecorder
+from examples.types import TimeInNS
+
+
+def test_nested_spans_and_decorator() -> None:
+    recorder = SpanRecorder()
+
+    @recorder.timed()
+    def work() -> int:
+        return sum(range(1_000))
+
+    with recorder.span("outer"):
+        for _ in range(3):
+            with recorder.span("inner"):
+                work()
+
+    records = recorder.records()
+    assert [(name, depth) for name, _, _, depth in records] == [
+        ("test_nested_spans_and_decorator.<locals>.work", 2),
+        ("inner", 1),
+    ] * 3 + [("outer", 0)]
+
+    durations = {name: duration for name, _, duration, _ in records}
+    assert durations["outer"] >= durations["inner"] >= 0
+
+
+def test_recursive_spans() -> None:
+    recorder = SpanRecorder(calibrate=False)
+
+    @recorder.timed("fib")
+    def fib(n: int) -> int:
+        return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+    fib(10)
+    assert recorder.summaries()["fib"].count == 177
+
+
+def test_ring_buffer_folds_into_summaries(tmp_path) -> None:
+    recorder = SpanRecorder(capacity=100, clock="process_time")
+    span = recorder.span("tick")
+    for _ in range(1_050):
+        with span:
+            pass
+
+    # 10 full buffers were folded and 50 spans are still buffered.
+    assert len(recorder.records()) == 50
+    assert recorder.summaries()["tick"].count == 1_050
+    assert recorder.records() == []
+
+    recorder.export(tmp_path / "spans.json")
+    report = json.loads((tmp_path / "spans.json").read_text())
+    assert report["clock"] == "process_time"
+    assert report["spans"][0]["name"] == "tick"
+
+
+def test_span_overhead() -> None:
+    """
+    Measure the cost of recording a span.
+    """
+    recorder = SpanRecorder()
+    span = recorder.span("empty")
+    rounds = 20_000
+
+    # The fastest of several repeats, so a scheduler hiccup doesn't count.
+    costs: list[float] = []
+    for _ in range(5):
+        start: TimeInNS = time.perf_counter_ns()
+        for _ in range(rounds):
+            with span:
+                pass
+        costs.append((time.perf_counter_ns() - start) / rounds)
+    cost = min(costs)
+
+    print("\nTest Approach: Span Instrumentation Overhead")
+    print(f"Calibrated clock overhead: {recorder.overhead:,} nanoseconds")
+    print(f"Cost per span: {cost:,.1f} nanoseconds")
+
+    # A span costs about ten clock reads. Allow plenty of room for slow machines.
+    assert cost < 40 * max(recorder.overhead, 25)
@@ -0,0 +1,65 @@
+import time
+
+import numpy as np
+
+from examples.streaming_summary import StreamingSummary
+from examples.types import TimeInNS
+
+
+def test_streaming_summary_matches_exact_statistics() -> None:
+    """
+    Demonstrate summarizing a large stream of timings in bounded memory.
+    """
+    rng = np.random.default_rng(7)
+    timings = rng.gumbel(loc=75, scale=5, size=2_000_000)
+
+    start: TimeInNS = time.perf_counter_ns()
+    summary = StreamingSummary()
+    for batch in np.array_split(timings, 100):
+        summary.update(batch)
+    elapsed: TimeInNS = time.perf_counter_ns() - start
+
+    # The count, min, max, mean and variance are exact.
+    assert summary.count == len(timings)
+    assert summary.min == timings.min()
+    assert summary.max == timings.max()
+    assert np.isclose(summary.mean, timings.mean())
+    assert np.isclose(summary.variance, timings.var(ddof=1))
+
+    # The quantiles are estimates from a bounded number of centroids.
+    percentiles = [1, 25, 50, 75, 99]
+    estimated = np.array(summary.percentile(percentiles))
+    exact = np.percentile(timings, percentiles)
+    assert np.allclose(estimated, exact, rtol=0.005)
+    assert summary.centroid_count <= summary.compression
+
+    print("\nTest Approach: Streaming Summary of 2M Timings")
+    print(f"Ingesting took: {elapsed:,} nanoseconds")
+    print(f"Centroids retained: {summary.centroid_count}")
+
+
+def test_merging_summaries_across_workers() -> None:
+    rng = np.random.default_rng(8)
+    timings = rng.normal(loc=100, scale=4, size=60_000)
+
+    workers = [StreamingSummary() for _ in range(3)]
+    for worker, batch in zip(workers, np.array_split(timings, 3)):
+        for value in batch:
+            worker.add(value)
+
+    merged = StreamingSummary()
+    for worker in workers:
+        merged.merge(worker)
+
+    assert merged.count == len(timings)
+    assert merged.min == timings.min() and merged.max == timings.max()
+    assert np.isclose(merged.stdev, timings.std(ddof=1))
+    assert np.isclose(merged.percentile(50), np.median(timings), rtol=0.001)
+
+
+def test_statistics_include_buffered_values() -> None:
+    summary = StreamingSummary()
+    for value in (1.0, 3.0, 5.0):
+        summary.add(value)
+    assert (summary.count, summary.min, summary.max, summary.mean) == (3, 1.0, 5.0, 3.0)
+    assert summary.variance == 4.0 and summary.stdev == 2.0
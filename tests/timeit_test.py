@@ -1,22 +1,35 @@
+import os
 import time
 import timeit
 from typing import Sequence
 
-import pandas as pd
-from great_tables import GT, md, html
-import numpy as np
-import matplotlib.pyplot as plt
+from examples.lazy_import import lazy_import
 
 from tests.fixtures import (
     MISSING_PERSON,
+    SEED,
+    cached_random_names,
     create_random_names,
     random_names,
     perf_data_a,
     perf_data_b,
 )
 
+from examples.ab_compare import compare
+from examples.parallel_sweep import parallel_sweep
+from examples.streaming_summary import StreamingSummary
 from examples.types import RandomNames, TimeInNS, TimeInSec
 
+# The reporting libraries are only imported by the tests that plot or tabulate.
+pd = lazy_import("pandas")
+gt = lazy_import("great_tables")
+plt = lazy_import("matplotlib.pyplot")
+
+# Set SWEEP_WORKERS to run test_visualize_timeit_results on a process pool.
+# Set SWEEP_PIN_CPUS=1 to also pin each worker to its own CPU.
+SWEEP_WORKERS: int = int(os.environ.get("SWEEP_WORKERS", "1"))
+SWEEP_PIN_CPUS: bool = os.environ.get("SWEEP_PIN_CPUS", "0") == "1"
+
 
 def test_default_timeit(random_names: RandomNames) -> None:
     """
@@ -128,39 +141,52 @@ def test_visualize_timeit_results() -> None:
     benchmark_results: list[tuple[float, float]] = []
     samples_range = range(min_samples, max_samples, increment_size)
 
-    for size in samples_range:
-        print(f"Running benchmark on sample size {size:,}.", end="\r")
-        # Get the Sample Set
-        samples_list = master_samples_list[:size]
-        samples_set = set(samples_list)
-
-        # Build the scope for the benchmark.
-        scope = dict(globals())
-        scope.update(locals())
-
-        # Construct the Timers
-        search_list_timer = timeit.Timer(
-            stmt="assert MISSING_PERSON not in samples_list",
-            globals=scope,
-            timer=time.perf_counter_ns,
+    if SWEEP_WORKERS > 1:
+        # Spread the sample sizes across a pool of worker processes.
+        # The workers memory-map the cached master data set.
+        print(f"Running the sweep on {SWEEP_WORKERS} worker processes.")
+        benchmark_results = parallel_sweep(
+            cached_random_names(max_samples),
+            samples_range,
+            MISSING_PERSON,
+            num_iterations,
+            workers=SWEEP_WORKERS,
+            pin_cpus=SWEEP_PIN_CPUS,
         )
-
-        search_set_timer = timeit.Timer(
-            stmt="assert MISSING_PERSON not in samples_set",
-            globals=scope,
-            timer=time.perf_counter_ns,
-        )
-
-        # Run the code multiple times.
-        # fmt: off
-        total_search_list_time: TimeInNS = search_list_timer.timeit(number=num_iterations)
-        total_search_set_time:  TimeInNS = search_set_timer.timeit(number=num_iterations)
-        # fmt: on
-
-        # Calculate the average time each code snippet took in nanoseconds.
-        avg_list_search_time: float = total_search_list_time / num_iterations
-        avg_set_search_time: float = total_search_set_time / num_iterations
-        benchmark_results.append((avg_list_search_time, avg_set_search_time))
+    else:
+        for size in samples_range:
+            print(f"Running benchmark on sample size {size:,}.", end="\r")
+            # Get the Sample Set
+            samples_list = master_samples_list[:size]
+            samples_set = set(samples_list)
+
+            # Build the scope for the benchmark.
+            scope = dict(globals())
+            scope.update(locals())
+
+            # Construct the Timers
+            search_list_timer = timeit.Timer(
+                stmt="assert MISSING_PERSON not in samples_list",
+                globals=scope,
+                timer=time.perf_counter_ns,
+            )
+
+            search_set_timer = timeit.Timer(
+                stmt="assert MISSING_PERSON not in samples_set",
+                globals=scope,
+                timer=time.perf_counter_ns,
+            )
+
+            # Run the code multiple times.
+            # fmt: off
+            total_search_list_time: TimeInNS = search_list_timer.timeit(number=num_iterations)
+            total_search_set_time:  TimeInNS = search_set_timer.timeit(number=num_iterations)
+            # fmt: on
+
+            # Calculate the average time each code snippet took in nanoseconds.
+            avg_list_search_time: float = total_search_list_time / num_iterations
+            avg_set_search_time: float = total_search_set_time / num_iterations
+            benchmark_results.append((avg_list_search_time, avg_set_search_time))
 
     # 4. Tabulate the Results
     header_fmt = "{:<15} {:<22} {:<15}"
@@ -225,56 +251,71 @@ def test_visualizing_distributions_with_boxplot(
     for box, color in zip(bplot["boxes"], colors):
         box.set_facecolor(color)
 
+    # 4. Title the plot with the statistical verdict rather than leaving
+    #    the reader to judge the difference by eye.
+    comparison = compare(perf_data_a, perf_data_b, seed=SEED)
+    plt.title(comparison.verdict())
+
     plt.show()
 
 
-def test_tabulating_distributions(
-    perf_data_a: Sequence[TimeInNS], perf_data_b: Sequence[TimeInNS]
-) -> None:
+def summary_stats(summary: StreamingSummary) -> list[float]:
     """
-    Demonstrate how to create a table that compares the percentiles of multiple benchmarks.
+    Returns the rows of the distribution table for a summary.
     """
-    # 1. Calculate the percentiles to display.
-    # Get the percentiles you want to display
-    percentiles = [25, 50, 75, 99]
-    a_percentiles: list[float] = np.percentile(perf_data_a, percentiles).tolist()
-    b_percentiles: list[float] = np.percentile(perf_data_b, percentiles).tolist()
-
-    # 2. Enrich the data by calculating the sample size, min, max, and interquartile (IQR).
+    percentiles: list[float] = summary.percentile([25, 50, 75, 99])
     # fmt: off
-    a_stats = [
-        len(perf_data_a),                      # Count
-        min(a_percentiles),                    # Minimum
-        *a_percentiles,                        # P25, P50, P75, P99
-        max(a_percentiles),                    # Maximum
-        a_percentiles[2] - a_percentiles[0],   # Interquartile (IQR) = P75 - P25 
+    return [
+        summary.count,                         # Count
+        summary.min,                           # Minimum
+        *percentiles,                          # P25, P50, P75, P99
+        summary.max,                           # Maximum
+        percentiles[2] - percentiles[0],       # Interquartile (IQR) = P75 - P25
+        summary.mean,                          # Mean
+        summary.stdev,                         # Standard Deviation
     ]
     # fmt: on
 
-    b_stats = [
-        len(perf_data_b),
-        min(b_percentiles),
-        *b_percentiles,
-        max(b_percentiles),
-        b_percentiles[2] - b_percentiles[0],
-    ]
 
-    # 3. Build a dataframe with Pandas by specifying the columns.
+def test_tabulating_distributions(
+    perf_data_a: Sequence[TimeInNS], perf_data_b: Sequence[TimeInNS]
+) -> None:
+    """
+    Demonstrate how to create a table that compares the percentiles of multiple benchmarks.
+    """
+    # 1. Summarize the timings. A StreamingSummary ingests timings incrementally in
+    #    bounded memory, so the same approach works for unbounded streams of samples.
+    a_summary = StreamingSummary()
+    a_summary.update(perf_data_a)
+    b_summary = StreamingSummary()
+    b_summary.update(perf_data_b)
+
+    # 2. Calculate the statistics to display. The count, min, max, mean and standard
+    #    deviation are exact. The percentiles are estimated.
+    stat_names = ["Count", "Min", "P25", "P50", "P75", "P99", "Max", "IQR", "Mean", "StdDev"]
+    a_stats = summary_stats(a_summary)
+    b_stats = summary_stats(b_summary)
+
+    # 3. Statistically compare the two distributions.
+    comparison = compare(perf_data_a, perf_data_b, seed=SEED)
+
+    # 4. Build a dataframe with Pandas by specifying the columns.
     data = {
-        "Stats": ["Count", "Min", "P25", "P50", "P75", "P99", "Max", "IQR"],
+        "Stats": stat_names,
         "Data A": a_stats,
         "Data B": b_stats,
     }
     dataframe = pd.DataFrame(data)
 
-    # 4. Create and stylize the table.
+    # 5. Create and stylize the table.
     table = (
-        GT(data=dataframe, rowname_col="Stats")
+        gt.GT(data=dataframe, rowname_col="Stats")
         .tab_header(title="Performance Data", subtitle="Data A vs Data B")
         .tab_source_note("UOM: Nanoseconds")
+        .tab_source_note(comparison.verdict())
         .tab_stubhead(label="Percentiles")
         .fmt_integer(columns=["Data A", "Data B"])
     )
 
-    # 5. Display the table.
+    # 6. Display the table.
     table.show()
@@ -0,0 +1,55 @@
+import sys
+import time
+
+import pytest
+
+import examples.concurrency as concurrency
+from examples.virtual_clock import VirtualClock
+from examples.types import TimeInNS
+from tests import profile_with_line_profiler_test
+
+
+def test_sleep_advances_the_clocks_instantly() -> None:
+    clock = VirtualClock()
+    real_sleep = time.sleep
+    with clock.install():
+        assert time.sleep is not real_sleep
+        start: TimeInNS = time.perf_counter_ns()
+        time.sleep(5)
+        elapsed: TimeInNS = time.perf_counter_ns() - start
+    assert time.sleep is real_sleep
+
+    # The code sees the 5 seconds it slept for.
+    assert 5e9 <= elapsed < 6e9
+    assert clock.simulated == 5
+    assert clock.sleep_calls == 1
+
+
+def test_patches_functions_imported_from_time() -> None:
+    """
+    Demonstrate running the line profiler's numeric process without sleeping.
+    """
+    module = sys.modules[profile_with_line_profiler_test.__name__]
+    clock = VirtualClock()
+    real_start: TimeInNS = time.perf_counter_ns()
+    with clock.install(module):
+        values = module.numeric_process()
+    real_elapsed: TimeInNS = time.perf_counter_ns() - real_start
+    assert module.sleep is time.sleep
+
+    print("\nTest Approach: Virtual Clock")
+    print(
+        f"Real Time: {real_elapsed / 1e6:,.3f} ms, "
+        f"Simulated Latency: {clock.simulated * 1e3:,.1f} ms in {clock.sleep_calls} sleeps"
+    )
+    assert clock.sleep_calls == 10
+    assert clock.simulated == pytest.approx(sum(values) / 2)
+    assert real_elapsed < 0.05e9
+
+
+def test_threads_share_the_clock() -> None:
+    clock = VirtualClock()
+    with clock.install():
+        values = concurrency.numeric_process("threads", fan_out=100)
+    assert clock.sleep_calls == 100
+    assert clock.simulated == pytest.approx(sum(values) / 2)